@@ -5,23 +5,289 @@ with beautiful UI, animations, and dynamic styling based on weather conditions.
 """
 
 import os
+import time
+import atexit
+import hashlib
+import json
 import logging
-from flask import Flask, render_template, request, jsonify
-from weather_fetcher import WeatherFetcher
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from weather_fetcher import DEFAULT_BASE_URL, DEFAULT_ICON_URL, WeatherFetcher
+from city_index import CityIndex
+from refresh_scheduler import RefreshScheduler
+from persistent_cache import PersistentWeatherCache
+from weather_stream import WeatherBroadcaster
+from icon_store import DEFAULT_ICON_DIR, IconStore, is_icon_code
+from circuit_breaker import CircuitBreaker
+from compression import ResponseCompressor
+from json_provider import FastJSONProvider
+from static_assets import StaticAssets
+from quota import QuotaGovernor
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, FAST_BUCKETS, FetcherMetrics, MetricsRegistry, register_cache_metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+
+# gzip/brotli for JSON, HTML and text responses above WEATHER_COMPRESS_MIN_SIZE
+# bytes (-1 disables it), and hashed, precompressed CSS/JS under /assets once
+# built with "python main.py build-assets"
+COMPRESS_MIN_SIZE = int(os.getenv("WEATHER_COMPRESS_MIN_SIZE", "500"))
+response_compressor = ResponseCompressor(app, min_size=COMPRESS_MIN_SIZE) if COMPRESS_MIN_SIZE >= 0 else None
+static_assets = StaticAssets(app)
 
 # Get API key from environment variable
 api_key = os.getenv("OPENWEATHERMAP_API_KEY", "c52f8db36617881e6605e191bf2b5d06")
 if not api_key:
     logger.warning("No OpenWeatherMap API key found! Please set the OPENWEATHERMAP_API_KEY environment variable.")
 
-# Initialize WeatherFetcher
-weather_fetcher = WeatherFetcher(api_key)
+# Local city index (OpenWeatherMap city.list.json[.gz] format) used to resolve
+# names to city IDs and to serve autocomplete suggestions. Defaults to the
+# bundled list of major cities.
+city_list_path = os.getenv(
+    "OPENWEATHERMAP_CITY_LIST",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.json")
+)
+SUGGEST_MAX_RESULTS = int(os.getenv("WEATHER_SUGGEST_MAX_RESULTS", "10"))
+
+def load_city_index(path):
+    """Build the city index, logging its build time and memory footprint"""
+    if not path:
+        return None
+    try:
+        started = time.perf_counter()
+        index = CityIndex.load(path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        logger.error(f"Could not load city list {path}: {str(e)}")
+        return None
+
+    logger.info(
+        f"Built city index from {path}: {len(index)} cities in {elapsed_ms:.1f} ms, "
+        f"~{index.memory_footprint() / 1024:.0f} KiB"
+    )
+    return index
+
+city_index = load_city_index(city_list_path)
+
+# In-process metrics exposed at /metrics in the Prometheus text format
+metrics_registry = MetricsRegistry()
+http_requests = metrics_registry.counter(
+    'weather_http_requests_total', 'HTTP requests by route, method and status', ('route', 'method', 'status')
+)
+http_latency = metrics_registry.histogram(
+    'weather_http_request_seconds', 'Time to build HTTP responses by route', ('route',)
+)
+serialize_seconds = metrics_registry.histogram(
+    'weather_serialize_seconds', 'Time spent encoding weather responses', (), FAST_BUCKETS
+)
+
+# Optional on-disk cache tier shared by all workers on this host, so restarts
+# don't start cold
+CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+cache_db_path = os.getenv("WEATHER_CACHE_DB")
+persistent_cache = PersistentWeatherCache(cache_db_path, ttl=CACHE_TTL) if cache_db_path else None
+
+# Fail fast while OpenWeatherMap keeps failing, instead of making every
+# request wait out a timeout; probe again after WEATHER_BREAKER_OPEN_SECONDS
+fetcher_metrics = FetcherMetrics(metrics_registry)
+circuit_breaker = CircuitBreaker(
+    failure_rate=float(os.getenv("WEATHER_BREAKER_FAILURE_RATE", "0.5")),
+    window_size=int(os.getenv("WEATHER_BREAKER_WINDOW", "20")),
+    min_calls=int(os.getenv("WEATHER_BREAKER_MIN_CALLS", "10")),
+    open_seconds=float(os.getenv("WEATHER_BREAKER_OPEN_SECONDS", "30")),
+    name="openweathermap",
+    on_state_change=fetcher_metrics.circuit_changed
+)
+fetcher_metrics.circuit_state.set(0)
+
+# Meter upstream calls per API key so peaks are queued or shed here instead
+# of turning into 429s. OPENWEATHERMAP_API_KEYS lists a pool of keys to rotate
+# across; WEATHER_QUOTA_STATE shares the budget between workers on this host.
+api_keys = [key.strip() for key in os.getenv("OPENWEATHERMAP_API_KEYS", "").split(",") if key.strip()] or [api_key]
+QUOTA_PER_MINUTE = float(os.getenv("WEATHER_QUOTA_PER_MINUTE", "60"))
+quota_governor = None
+if api_key and QUOTA_PER_MINUTE > 0:
+    quota_governor = QuotaGovernor(
+        api_keys,
+        calls_per_minute=QUOTA_PER_MINUTE,
+        calls_per_day=int(os.getenv("WEATHER_QUOTA_PER_DAY", "0")),
+        state_path=os.getenv("WEATHER_QUOTA_STATE") or None,
+        max_wait=float(os.getenv("WEATHER_QUOTA_MAX_WAIT", "2"))
+    )
+    metrics_registry.callback(
+        'weather_quota_available', 'Upstream calls left in the current budget across all API keys',
+        quota_governor.available
+    )
+    metrics_registry.callback(
+        'weather_quota_granted_total', 'Upstream calls granted by the quota governor in this worker',
+        lambda: quota_governor.granted, 'counter'
+    )
+    metrics_registry.callback(
+        'weather_quota_waited_total', 'Upstream calls that had to wait for quota in this worker',
+        lambda: quota_governor.waits, 'counter'
+    )
+    metrics_registry.callback(
+        'weather_quota_shed_total', 'Lookups refused because the upstream quota was exhausted',
+        lambda: quota_governor.shed, 'counter'
+    )
+
+# Append-only log of every observation fetched, for /history (off unless a
+# directory is configured; numpy is only loaded when it is on)
+history_dir = os.getenv("WEATHER_HISTORY_DIR")
+HISTORY_MAX_DAYS = float(os.getenv("WEATHER_HISTORY_MAX_DAYS", "31"))
+observation_store = None
+if history_dir:
+    from observation_store import ObservationStore
+    observation_store = ObservationStore(
+        history_dir,
+        flush_rows=int(os.getenv("WEATHER_HISTORY_FLUSH_ROWS", "1000")),
+        flush_interval=float(os.getenv("WEATHER_HISTORY_FLUSH_INTERVAL", "5")),
+        retention_days=int(os.getenv("WEATHER_HISTORY_RETENTION_DAYS", "0"))
+    )
+    atexit.register(observation_store.close)
+    metrics_registry.callback(
+        'weather_observations_recorded_total', 'Observations handed to the observation store',
+        lambda: observation_store.recorded, 'counter'
+    )
+    metrics_registry.callback(
+        'weather_observations_written_total', 'Observations written to disk by the observation store',
+        lambda: observation_store.written, 'counter'
+    )
+
+# Initialize WeatherFetcher with an in-process response cache
+weather_fetcher = WeatherFetcher(
+    api_key,
+    cache_ttl=CACHE_TTL,
+    cache_max_entries=int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "1024")),
+    cache_max_stale=float(os.getenv("WEATHER_CACHE_MAX_STALE", "300")),
+    pool_size=int(os.getenv("WEATHER_HTTP_POOL_SIZE", "10")),
+    connect_timeout=float(os.getenv("WEATHER_HTTP_CONNECT_TIMEOUT", "3.05")),
+    read_timeout=float(os.getenv("WEATHER_HTTP_READ_TIMEOUT", "10")),
+    max_retries=int(os.getenv("WEATHER_HTTP_MAX_RETRIES", "2")),
+    city_index=city_index,
+    persistent_cache=persistent_cache,
+    base_url=os.getenv("OPENWEATHERMAP_BASE_URL", DEFAULT_BASE_URL),
+    icon_url=os.getenv("OPENWEATHERMAP_ICON_URL", DEFAULT_ICON_URL),
+    metrics=fetcher_metrics,
+    not_found_ttl=float(os.getenv("WEATHER_NOT_FOUND_TTL", "300")),
+    circuit_breaker=circuit_breaker,
+    stale_if_error=float(os.getenv("WEATHER_STALE_IF_ERROR", "86400")),
+    quota=quota_governor,
+    recorder=observation_store
+)
+register_cache_metrics(metrics_registry, 'weather_cache', weather_fetcher.cache.stats)
+register_cache_metrics(metrics_registry, 'weather_forecast_cache', weather_fetcher.forecast_cache.stats)
+register_cache_metrics(metrics_registry, 'weather_not_found_cache', weather_fetcher.not_found_cache.stats)
+metrics_registry.callback(
+    'weather_single_flight_shared_total', 'Lookups that joined an in-flight upstream request instead of making their own',
+    lambda: weather_fetcher.single_flight.shared, 'counter'
+)
+
+# Weather icons are fetched from upstream once, then served locally from
+# memory and disk under /icons
+icon_store = IconStore(weather_fetcher, os.getenv("WEATHER_ICON_DIR", DEFAULT_ICON_DIR))
+ICON_MAX_AGE = 365 * 24 * 3600
+
+# Background refresh-ahead for the most requested cities (0 disables it)
+refresh_scheduler = None
+PREFETCH_TOP_K = int(os.getenv("WEATHER_PREFETCH_TOP_K", "20"))
+if api_key and PREFETCH_TOP_K > 0:
+    refresh_scheduler = RefreshScheduler(
+        weather_fetcher,
+        top_k=PREFETCH_TOP_K,
+        lead_time=float(os.getenv("WEATHER_PREFETCH_LEAD_TIME", "60")),
+        calls_per_minute=int(os.getenv("WEATHER_PREFETCH_BUDGET", "30"))
+    )
+    refresh_scheduler.start()
+
+# Shared fan-out for /weather/stream: each watched city is polled once per
+# interval no matter how many clients subscribe to it
+STREAM_MAX_CITIES = int(os.getenv("WEATHER_STREAM_MAX_CITIES", "20"))
+STREAM_HEARTBEAT = float(os.getenv("WEATHER_STREAM_HEARTBEAT", "15"))
+weather_broadcaster = WeatherBroadcaster(
+    weather_fetcher,
+    poll_interval=float(os.getenv("WEATHER_STREAM_POLL_INTERVAL", "30"))
+)
+
+# Bounded worker pool used to resolve batch requests concurrently
+BATCH_MAX_SIZE = int(os.getenv("WEATHER_BATCH_MAX_SIZE", "50"))
+BATCH_DEADLINE = float(os.getenv("WEATHER_BATCH_DEADLINE", "10"))
+batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WEATHER_BATCH_WORKERS", "8")),
+    thread_name_prefix="weather-batch"
+)
+
+if response_compressor is not None:
+    metrics_registry.callback(
+        'weather_compression_bytes_in_total', 'Response bytes before compression',
+        lambda: response_compressor.bytes_in, 'counter'
+    )
+    metrics_registry.callback(
+        'weather_compression_bytes_out_total', 'Response bytes after compression',
+        lambda: response_compressor.bytes_out, 'counter'
+    )
+
+metrics_registry.callback(
+    'weather_stream_subscribers', 'Open /weather/stream subscriptions', weather_broadcaster.subscriber_count
+)
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started, for the latency histogram"""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record how long its response took to build
+
+    Streaming responses are timed up to the first byte, not to the end of
+    the stream.
+    """
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    started = g.get('request_started')
+    if started is not None:
+        http_latency.observe(time.perf_counter() - started, route)
+    http_requests.inc(route, request.method, str(response.status_code))
+    return response
+
+def weather_to_dict(weather_data):
+    """Convert a WeatherData object to the JSON shape returned by the API"""
+    return {'success': True, **weather_data.to_dict()}
+
+def weather_response(weather_data):
+    """Build a /weather JSON response from the WeatherData's memoized encoding
+
+    Cached WeatherData objects are shared across requests, so this avoids
+    rebuilding and re-encoding a dict for every hit.
+    """
+    started = time.perf_counter()
+    body = b'{"success":true,' + weather_data.to_json_bytes()[1:]
+    serialize_seconds.observe(time.perf_counter() - started)
+    return Response(body, mimetype='application/json')
+
+def add_cache_headers(response, weather_data, expires_in):
+    """Make a weather response cacheable by browsers, CDNs and proxies
+
+    Args:
+        response: Response whose body is the encoded weather_data
+        weather_data: WeatherData the response was built from
+        expires_in: Seconds until the server-side cache entry expires, or None
+    """
+    if weather_data.stale:
+        # Served only because upstream is down; don't let anyone keep it
+        expires_in = 0
+    elif expires_in is None:
+        # Not cached server-side; fall back to the data age
+        expires_in = CACHE_TTL - (time.time() - weather_data.observed_at)
+
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    response.last_modified = weather_data.observed_at
+    response.cache_control.public = True
+    response.cache_control.max_age = max(0, int(expires_in))
 
 @app.route('/')
 def index():
@@ -30,54 +296,341 @@ def index():
         logger.warning("Serving app without API key - searches will fail")
     return render_template('index.html')
 
-@app.route('/weather', methods=['POST'])
-def get_weather():
-    """API endpoint to get weather data"""
+def missing_api_key_response():
+    """Response sent by every weather route when no API key is configured"""
+    return jsonify({
+        'success': False,
+        'error': 'OpenWeatherMap API key is not configured. Please set the OPENWEATHERMAP_API_KEY environment variable.'
+    })
+
+def read_weather_city():
+    """Validate a /weather request
+
+    Shared with the ASGI entry point (asgi_app.py) so both answer identically.
+
+    Returns:
+        (city, None), or (None, error response) if the request can't be served
+    """
     if not api_key:
-        return jsonify({
-            'success': False,
-            'error': 'OpenWeatherMap API key is not configured. Please set the OPENWEATHERMAP_API_KEY environment variable.'
-        })
+        return None, missing_api_key_response()
         
-    city = request.form.get('city', '').strip()
+    source = request.args if request.method == 'GET' else request.form
+    city = source.get('city', '').strip()
     
     if not city:
-        return jsonify({
+        return None, jsonify({
             'success': False,
             'error': 'Please enter a city name'
         })
+    return city, None
+
+def weather_success_response(city, weather_data):
+    """Build the /weather response for a successful lookup"""
+    if refresh_scheduler is not None:
+        refresh_scheduler.record(city)
+    
+    logger.info(f"Successfully retrieved weather data for {city}")
+    response = weather_response(weather_data)
+    if request.method == 'GET':
+        add_cache_headers(response, weather_data, weather_fetcher.expires_in(city))
+        response.make_conditional(request)
+    return response
+
+def weather_error_response(error):
+    """Build the /weather response for a failed lookup"""
+    logger.error(f"Error fetching weather data: {str(error)}")
+    return jsonify({
+        'success': False,
+        'error': f"Could not retrieve weather data: {str(error)}"
+    })
+
+@app.route('/weather', methods=['GET', 'POST'])
+def get_weather():
+    """API endpoint to get weather data
+
+    POST takes the city from the form body. GET takes it from the query string
+    (/weather?city=London) and is cacheable: it carries a strong ETag and a
+    Cache-Control max-age matching the remaining life of the cached data, and
+    answers If-None-Match revalidations with 304 Not Modified.
+    """
+    city, error_response = read_weather_city()
+    if error_response is not None:
+        return error_response
     
     try:
         logger.info(f"Fetching weather data for city: {city}")
         
         # Get weather data
         weather_data = weather_fetcher.get_current_weather(city)
+        return weather_success_response(city, weather_data)
         
-        # Convert to dictionary for JSON response
-        result = {
+    except Exception as e:
+        return weather_error_response(e)
+
+@app.route('/weather/stream')
+def stream_weather():
+    """Server-Sent Events stream of weather updates
+
+    Subscribes to the comma-separated cities in the query string
+    (/weather/stream?cities=London,Paris) and sends a "weather" event with the
+    same JSON as /weather, plus a "query" field naming the city, whenever a
+    city's data changes. Comment lines are sent as heartbeats to keep the
+    connection open through proxies.
+    """
+    if not api_key:
+        return missing_api_key_response()
+
+    cities = list(dict.fromkeys(
+        city.strip() for city in request.args.get('cities', '').split(',') if city.strip()
+    ))
+
+    if not cities:
+        return jsonify({
+            'success': False,
+            'error': 'Please enter at least one city name'
+        })
+
+    if len(cities) > STREAM_MAX_CITIES:
+        return jsonify({
+            'success': False,
+            'error': f"Too many cities in one stream (maximum is {STREAM_MAX_CITIES})"
+        })
+
+    subscription = weather_broadcaster.subscribe(cities)
+    logger.info(f"Stream opened for {', '.join(cities)}")
+
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                update = subscription.get(timeout=STREAM_HEARTBEAT)
+                if update is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                city, payload = update
+                data = '{"query":' + json.dumps(city) + ',' + payload.decode('utf-8')[1:]
+                yield f"event: weather\ndata: {data}\n\n"
+        finally:
+            weather_broadcaster.unsubscribe(subscription)
+            logger.info(f"Stream closed for {', '.join(cities)}")
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/icons/<code>.png')
+def get_icon(code):
+    """Serve a weather icon from the local icon store
+
+    Icon codes never change their image, so responses may be cached forever.
+    """
+    if not is_icon_code(code):
+        return Response('Unknown icon', status=404, mimetype='text/plain')
+
+    try:
+        png = icon_store.get_bytes(code)
+    except Exception as e:
+        logger.error(f"Error fetching icon {code}: {str(e)}")
+        return Response('Icon unavailable', status=502, mimetype='text/plain')
+
+    response = Response(png, mimetype='image/png')
+    response.set_etag(hashlib.blake2b(png, digest_size=16).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = ICON_MAX_AGE
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
+
+@app.route('/metrics')
+def metrics():
+    """Expose request, upstream, cache and error metrics for Prometheus to scrape"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/cities/suggest')
+def suggest_cities():
+    """API endpoint to suggest city names for a typed prefix"""
+    prefix = request.args.get('prefix', '').strip()
+    limit = min(request.args.get('limit', SUGGEST_MAX_RESULTS, type=int), SUGGEST_MAX_RESULTS)
+
+    if not prefix or city_index is None:
+        return jsonify({
             'success': True,
-            'city': weather_data.city,
-            'country': weather_data.country,
-            'temperature': weather_data.temperature,
-            'feels_like': weather_data.feels_like,
-            'description': weather_data.description.capitalize(),
-            'humidity': weather_data.humidity,
-            'pressure': weather_data.pressure,
-            'wind_speed': weather_data.wind_speed,
-            'icon': weather_data.icon,
-            'last_updated': weather_data.last_updated
+            'suggestions': []
+        })
+
+    suggestions = [
+        {
+            'id': city.id,
+            'name': city.name,
+            'country': city.country,
+            'population': city.population
         }
-        
-        logger.info(f"Successfully retrieved weather data for {city}")
-        return jsonify(result)
-        
-    except Exception as e:
-        logger.error(f"Error fetching weather data: {str(e)}")
+        for city in city_index.suggest(prefix, limit)
+    ]
+    return jsonify({
+        'success': True,
+        'suggestions': suggestions
+    })
+
+@app.route('/history')
+def get_history():
+    """API endpoint to get the recorded observations of a city over a time range
+
+    Takes city ("City" or "City,CC") and optional start and end Unix
+    timestamps (default: the last 24 hours). Observations are returned
+    oldest first as one list per field.
+    """
+    if observation_store is None:
+        return jsonify({
+            'success': False,
+            'error': 'Observation history is not enabled. Please set the WEATHER_HISTORY_DIR environment variable.'
+        })
+
+    city = request.args.get('city', '').strip()
+    if not city:
         return jsonify({
             'success': False,
-            'error': f"Could not retrieve weather data: {str(e)}"
+            'error': 'Please enter a city name'
         })
 
+    end = request.args.get('end', type=float)
+    if end is None:
+        end = time.time()
+    start = request.args.get('start', type=float)
+    if start is None:
+        start = end - 86400
+
+    if start >= end:
+        return jsonify({
+            'success': False,
+            'error': 'The start of the time range must be before its end'
+        })
+
+    if end - start > HISTORY_MAX_DAYS * 86400:
+        return jsonify({
+            'success': False,
+            'error': f"Time range too long (maximum is {HISTORY_MAX_DAYS:g} days)"
+        })
+
+    history = observation_store.history(city, start, end)
+    observations = {
+        name: (values.astype('float64').round(2) if values.dtype.kind == 'f' else values).tolist()
+        for name, values in history.items()
+    }
+    return jsonify({
+        'success': True,
+        'city': city,
+        'start': start,
+        'end': end,
+        'count': len(observations['observed_at']),
+        'observations': observations
+    })
+
+def read_batch_cities():
+    """Validate a /weather/batch request
+
+    Returns:
+        (cities, None) with blanks and duplicates dropped, or (None, error
+        response) if the request can't be served
+    """
+    if not api_key:
+        return None, missing_api_key_response()
+
+    payload = request.get_json(silent=True) or {}
+    cities = payload.get('cities') if isinstance(payload, dict) else None
+
+    if not isinstance(cities, list) or not all(isinstance(city, str) for city in cities):
+        return None, jsonify({
+            'success': False,
+            'error': 'Please provide a JSON body with a list of city names in "cities"'
+        })
+
+    # Drop blanks and duplicates while keeping request order
+    cities = list(dict.fromkeys(city.strip() for city in cities if city.strip()))
+
+    if not cities:
+        return None, jsonify({
+            'success': False,
+            'error': 'Please enter at least one city name'
+        })
+
+    if len(cities) > BATCH_MAX_SIZE:
+        return None, jsonify({
+            'success': False,
+            'error': f"Too many cities in one request (maximum is {BATCH_MAX_SIZE})"
+        })
+
+    logger.info(f"Fetching weather data for a batch of {len(cities)} cities")
+    return cities, None
+
+def batch_response(cities, outcomes):
+    """Build the /weather/batch response
+
+    Args:
+        cities: Cities in request order
+        outcomes: City -> WeatherData or the exception its lookup raised;
+            cities missing from it timed out
+    """
+    results = {}
+    timed_out = 0
+    for city in cities:
+        if city not in outcomes:
+            timed_out += 1
+            results[city] = {
+                'success': False,
+                'error': 'Timed out while retrieving weather data'
+            }
+        elif isinstance(outcomes[city], Exception):
+            results[city] = {
+                'success': False,
+                'error': f"Could not retrieve weather data: {str(outcomes[city])}"
+            }
+        else:
+            results[city] = weather_to_dict(outcomes[city])
+
+    if timed_out:
+        logger.warning(f"Batch deadline expired with {timed_out} of {len(cities)} cities unfinished")
+
+    return jsonify({
+        'success': True,
+        'complete': not timed_out,
+        'results': results
+    })
+
+@app.route('/weather/batch', methods=['POST'])
+def get_weather_batch():
+    """API endpoint to get weather data for many cities in one request
+
+    Expects a JSON body of the form {"cities": ["London", "Paris", ...]} and
+    returns a result entry per city, so one bad city doesn't fail the batch.
+    Cities that have not finished when the deadline expires are reported as
+    timed out. Lookups still queued then are cancelled, but ones already
+    running can't be interrupted: they finish in the background (within the
+    upstream timeouts and capped retries), still filling the cache, and keep
+    their batch worker until then.
+    """
+    cities, error_response = read_batch_cities()
+    if error_response is not None:
+        return error_response
+
+    futures = {
+        batch_executor.submit(weather_fetcher.get_current_weather, city): city
+        for city in cities
+    }
+    done, not_done = wait(futures, timeout=BATCH_DEADLINE)
+
+    outcomes = {}
+    for future, city in futures.items():
+        if future in not_done:
+            future.cancel()
+            continue
+        try:
+            outcomes[city] = future.result()
+        except Exception as e:
+            outcomes[city] = e
+
+    return batch_response(cities, outcomes)
+
 if __name__ == '__main__':
     logger.info("Starting Weather App server...")
     logger.info(f"API Key configured: {'Yes' if api_key else 'No'}")
@@ -0,0 +1,252 @@
+"""
+ASGI App Module
+This module contains the ASGI entry point for the web app. The weather lookups are served
+on the event loop with AsyncWeatherFetcher; every other route runs the Flask app in a
+thread pool, so all routes answer exactly as they do under a WSGI server.
+
+Run it with any ASGI server, e.g.
+    uvicorn asgi_app:application --workers 4
+"""
+
+import asyncio
+import io
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from flask import Response
+
+import app as flask_module
+from async_weather_fetcher import AsyncWeatherFetcher
+
+logger = logging.getLogger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+flask_app = flask_module.app
+
+# Upstream lookups in flight at once across all native requests
+ASGI_MAX_CONCURRENCY = int(os.getenv("WEATHER_ASGI_MAX_CONCURRENCY", "1000"))
+# Threads running the routes that stay on Flask; each open /weather/stream holds one
+ASGI_WSGI_THREADS = int(os.getenv("WEATHER_ASGI_WSGI_THREADS", "32"))
+
+# Shares the Flask app's cache, city index, circuit breaker, quota and metrics
+async_fetcher = AsyncWeatherFetcher.from_fetcher(flask_module.weather_fetcher, max_concurrency=ASGI_MAX_CONCURRENCY)
+wsgi_executor = ThreadPoolExecutor(max_workers=ASGI_WSGI_THREADS, thread_name_prefix="asgi-wsgi")
+
+
+async def get_weather() -> Response:
+    """/weather on the event loop; same validation and responses as app.get_weather"""
+    city, error_response = flask_module.read_weather_city()
+    if error_response is not None:
+        return error_response
+
+    try:
+        logger.info(f"Fetching weather data for city: {city}")
+        weather_data = await async_fetcher.get_current_weather(city)
+        return flask_module.weather_success_response(city, weather_data)
+
+    except Exception as e:
+        return flask_module.weather_error_response(e)
+
+
+async def get_weather_batch() -> Response:
+    """/weather/batch on the event loop; same validation and responses as app.get_weather_batch"""
+    cities, error_response = flask_module.read_batch_cities()
+    if error_response is not None:
+        return error_response
+
+    tasks = {asyncio.ensure_future(async_fetcher.get_current_weather(city)): city for city in cities}
+    done, not_done = await asyncio.wait(tasks, timeout=flask_module.BATCH_DEADLINE)
+
+    # The shared upstream request keeps running and still fills the cache
+    for task in not_done:
+        task.cancel()
+
+    outcomes = {}
+    for task in done:
+        try:
+            outcomes[tasks[task]] = task.result()
+        except Exception as e:
+            outcomes[tasks[task]] = e
+
+    return flask_module.batch_response(cities, outcomes)
+
+
+# (method, path) -> view served natively; everything else goes to Flask
+NATIVE_ROUTES: Dict[tuple, Callable[[], Awaitable[Response]]] = {
+    ("GET", "/weather"): get_weather,
+    ("POST", "/weather"): get_weather,
+    ("POST", "/weather/batch"): get_weather_batch,
+}
+
+
+async def application(scope: Scope, receive: Receive, send: Send) -> None:
+    """ASGI 3 entry point"""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        raise Exception(f"Unsupported ASGI scope type: {scope['type']}")
+
+    body = await read_body(receive)
+    if body is None:
+        return  # client went away before sending the whole request
+
+    environ = build_environ(scope, body)
+    view = NATIVE_ROUTES.get((environ["REQUEST_METHOD"], environ["PATH_INFO"]))
+    if view is not None:
+        await serve_native(view, environ, send)
+    else:
+        await serve_wsgi(environ, receive, send)
+
+
+async def lifespan(receive: Receive, send: Send) -> None:
+    """Handle server startup and shutdown"""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await async_fetcher.aclose()
+            wsgi_executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def read_body(receive: Receive) -> Optional[bytes]:
+    """Read the whole request body, or return None if the client disconnects"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def build_environ(scope: Scope, body: bytes) -> Dict[str, Any]:
+    """Build a WSGI environ for an ASGI HTTP request"""
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        key = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if key == "CONTENT_LENGTH":
+            continue
+        if key != "CONTENT_TYPE":
+            key = f"HTTP_{key}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def serve_native(view: Callable[[], Awaitable[Response]], environ: Dict[str, Any], send: Send) -> None:
+    """Run an async view inside a Flask request context and send its response
+
+    The app's before/after request hooks (metrics, compression) run as usual.
+    """
+    with flask_app.request_context(environ):
+        try:
+            response = flask_app.preprocess_request()
+            if response is None:
+                response = await view()
+            response = flask_app.finalize_request(response)
+        except Exception as e:
+            response = flask_app.handle_exception(e)
+
+        headers = response.get_wsgi_headers(environ)
+        body = b"".join(response.get_app_iter(environ))
+
+    await send({
+        "type": "http.response.start",
+        "status": response.status_code,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def serve_wsgi(environ: Dict[str, Any], receive: Receive, send: Send) -> None:
+    """Run the Flask app for one request on a worker thread, streaming its body
+
+    The whole WSGI call, iteration included, stays on one thread, since
+    streamed responses keep the request context in thread-local state.
+    Each chunk is handed to the event loop and the thread waits until it
+    is sent, so a slow client slows the stream down instead of buffering it.
+    """
+    loop = asyncio.get_running_loop()
+    disconnected = threading.Event()
+    start: Dict[str, Any] = {}
+
+    def start_response(status: str, headers: list, exc_info: Any = None) -> Callable[[bytes], None]:
+        start["message"] = {
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        }
+        return forward_chunk
+
+    def forward(message: Dict[str, Any]) -> None:
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+    def forward_chunk(chunk: bytes) -> None:
+        if "sent" not in start:
+            forward(start["message"])
+            start["sent"] = True
+        forward({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    def run() -> None:
+        iterable = flask_app(environ, start_response)
+        try:
+            for chunk in iterable:
+                if disconnected.is_set():
+                    return
+                if chunk:
+                    forward_chunk(chunk)
+            if "sent" not in start:
+                forward(start["message"])
+            forward({"type": "http.response.body", "body": b""})
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    async def watch_disconnect() -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await loop.run_in_executor(wsgi_executor, run)
+    finally:
+        watcher.cancel()
@@ -0,0 +1,342 @@
+"""
+Async Weather Fetcher Module
+This module contains the AsyncWeatherFetcher class, an asyncio-native counterpart to
+WeatherFetcher for polling many cities from a single event loop.
+"""
+
+import asyncio
+import dataclasses
+from typing import Any, Dict, Iterable, Optional, Tuple, Union, TYPE_CHECKING
+
+import httpx
+
+from weather_data import WeatherData
+from weather_cache import WeatherCache, normalize_city
+from weather_fetcher import (
+    DEFAULT_BASE_URL, MAX_RETRY_DELAY, RETRY_STATUSES, TRANSIENT_ERRORS, WeatherFetcher, classify_error, retry_after
+)
+from city_index import CityIndex
+from circuit_breaker import CircuitBreaker
+from metrics import FetcherMetrics
+from quota import QuotaGovernor
+
+if TYPE_CHECKING:
+    from observation_store import ObservationStore
+
+
+class AsyncWeatherFetcher:
+    """Class to handle non-blocking API calls to fetch weather data"""
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 100,
+        cache_ttl: float = 600.0,
+        cache_max_entries: int = 1024,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        base_url: str = DEFAULT_BASE_URL,
+        cache: Optional[WeatherCache] = None,
+        city_index: Optional[CityIndex] = None,
+        not_found_cache: Optional[WeatherCache] = None,
+        last_good_cache: Optional[WeatherCache] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        quota: Optional[QuotaGovernor] = None,
+        metrics: Optional[FetcherMetrics] = None,
+        recorder: Optional["ObservationStore"] = None
+    ):
+        """Initialize the AsyncWeatherFetcher
+
+        Args:
+            api_key: OpenWeatherMap API key
+            max_concurrency: Maximum number of upstream requests in flight at once
+            cache_ttl: Seconds a cached lookup stays fresh (0 disables caching)
+            cache_max_entries: Maximum number of cities kept in the cache
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send a response
+            max_retries: Retries on 429/5xx responses (0 disables retrying);
+                no single wait exceeds MAX_RETRY_DELAY seconds
+            backoff_factor: Exponential backoff factor between retries; a
+                Retry-After header from the server takes precedence
+            base_url: Root of the OpenWeatherMap data API
+            cache: Response cache to use instead of a private one (cache_ttl
+                and cache_max_entries are then ignored)
+            city_index: Optional local city index used to resolve names to
+                OpenWeatherMap city IDs
+            not_found_cache: Optional cache of recent "city not found" errors
+            last_good_cache: Optional cache of last good readings, served
+                marked stale when upstream is unavailable
+            circuit_breaker: Optional breaker that makes lookups fail fast
+                while upstream keeps failing
+            quota: Optional governor metering calls per API key
+            metrics: Optional hooks recording upstream latency and errors
+            recorder: Optional observation store every reading fetched from
+                upstream is appended to
+        """
+        self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=max_retries)
+        )
+        self._cache = cache if cache is not None else WeatherCache(ttl=cache_ttl, max_entries=cache_max_entries)
+        self._city_index = city_index
+        self._not_found = not_found_cache
+        self._last_good = last_good_cache
+        self._circuit_breaker = circuit_breaker
+        self._quota = quota
+        self._metrics = metrics
+        self._recorder = recorder
+        self._in_flight: Dict[str, "asyncio.Future[WeatherData]"] = {}
+
+    @classmethod
+    def from_fetcher(cls, weather_fetcher: WeatherFetcher, max_concurrency: int = 1000) -> "AsyncWeatherFetcher":
+        """Create an async fetcher sharing a WeatherFetcher's settings and state
+
+        Both then use one response cache, city index, negative cache, set of
+        last good readings, circuit breaker, quota, metrics and observation
+        recorder, so sync and async code in one process see the same data
+        and limits.
+
+        Args:
+            weather_fetcher: Fetcher to share with
+            max_concurrency: Maximum number of upstream requests in flight at once
+
+        Returns:
+            The new AsyncWeatherFetcher
+        """
+        connect_timeout, read_timeout = weather_fetcher._timeout
+        _, max_retries, backoff_factor = weather_fetcher._session_options
+        return cls(
+            weather_fetcher._api_key,
+            max_concurrency=max_concurrency,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            base_url=weather_fetcher._base_url,
+            cache=weather_fetcher.cache,
+            city_index=weather_fetcher.city_index,
+            not_found_cache=weather_fetcher.not_found_cache,
+            last_good_cache=weather_fetcher.last_good_cache,
+            circuit_breaker=weather_fetcher.circuit_breaker,
+            quota=weather_fetcher.quota,
+            metrics=weather_fetcher.metrics,
+            recorder=weather_fetcher.recorder
+        )
+
+    @property
+    def cache(self) -> WeatherCache:
+        """Response cache shared by all lookups on this fetcher"""
+        return self._cache
+
+    async def __aenter__(self) -> "AsyncWeatherFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self._client.aclose()
+
+    async def get_current_weather(self, city: str) -> WeatherData:
+        """Get current weather data for a city
+
+        Args:
+            city: City name to search for, optionally as "City,CC"
+
+        Returns:
+            WeatherData object containing weather information
+
+        Raises:
+            Exception: If city not found or API error occurs
+        """
+        if not self._api_key:
+            raise Exception("API key is not set. Please set the OPENWEATHERMAP_API_KEY environment variable.")
+
+        cache_key, query, label = self._locate(city)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Names upstream just said don't exist are answered locally
+        if self._not_found is not None:
+            not_found = self._not_found.get(cache_key)
+            if not_found is not None:
+                raise Exception(not_found)
+
+        # Concurrent lookups of the same city share one upstream request
+        future = self._in_flight.get(cache_key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_and_store(query, label, cache_key))
+            self._in_flight[cache_key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        try:
+            return await asyncio.shield(future)
+        except Exception as e:
+            stale = self._last_good_for(cache_key, e)
+            if stale is None:
+                raise
+            return stale
+
+    def _locate(self, city: str) -> Tuple[str, Dict[str, Any], str]:
+        """Map a city name to its cache key, upstream query and error label"""
+        city_id = self._city_index.resolve(city) if self._city_index is not None else None
+        if city_id is not None:
+            return f"id:{city_id}", {"id": city_id}, city
+        return normalize_city(city), {"q": city}, city
+
+    def _last_good_for(self, cache_key: str, error: Exception) -> Optional[WeatherData]:
+        """Return the last good reading, marked stale, if error means upstream is down"""
+        if self._last_good is None or classify_error(error) not in TRANSIENT_ERRORS:
+            return None
+        last_good = self._last_good.get(cache_key)
+        if last_good is None:
+            return None
+        if self._metrics is not None:
+            self._metrics.stale_served.inc()
+        return dataclasses.replace(last_good, stale=True)
+
+    async def get_many(self, cities: Iterable[str]) -> Dict[str, Union[WeatherData, Exception]]:
+        """Get current weather for many cities concurrently
+
+        Upstream concurrency is bounded by max_concurrency; a failing city does
+        not affect the others.
+
+        Args:
+            cities: City names to search for
+
+        Returns:
+            Mapping of each requested city to its WeatherData, or to the
+            exception raised while fetching it
+        """
+        cities = list(dict.fromkeys(cities))
+        results = await asyncio.gather(
+            *(self.get_current_weather(city) for city in cities),
+            return_exceptions=True
+        )
+        return dict(zip(cities, results))
+
+    async def _fetch_and_store(self, query: Dict[str, Any], label: str, cache_key: str) -> WeatherData:
+        """Fetch current weather and store it in the cache under cache_key"""
+        try:
+            weather_data = await self._fetch_current_weather(query, label)
+        except Exception as e:
+            if self._not_found is not None and classify_error(e) == "not_found":
+                self._not_found.set(cache_key, str(e))
+            raise
+
+        self._cache.set(cache_key, weather_data)
+        if self._last_good is not None:
+            self._last_good.set(cache_key, weather_data)
+        if self._recorder is not None:
+            self._recorder.record(weather_data)
+        return weather_data
+
+    async def _fetch_current_weather(self, query: Dict[str, Any], label: str) -> WeatherData:
+        """Fetch and parse current weather for a location, bypassing the cache
+
+        Args:
+            query: Location query parameters (q or id)
+            label: Human readable location used in error messages
+
+        Returns:
+            WeatherData object containing weather information
+        """
+        try:
+            url = f"{self._base_url}/weather"
+            params = {
+                **query,
+                "appid": self._api_key,
+                "units": "metric"  # Use metric units (Celsius)
+            }
+
+            response = await self._guarded_get(url, params)
+
+            WeatherFetcher._check_status(response.status_code, response.reason_phrase, label)
+            return WeatherFetcher._parse_weather_data(response.json())
+
+        except httpx.HTTPError as e:
+            raise self._failed(f"Network error: {str(e)}")
+        except Exception as e:
+            raise self._failed(f"Error fetching weather data: {str(e)}")
+
+    def _failed(self, message: str) -> Exception:
+        """Build the exception for a failed lookup, counting it by category"""
+        error = Exception(message)
+        if self._metrics is not None:
+            self._metrics.error(classify_error(error))
+        return error
+
+    async def _guarded_get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET url through the circuit breaker and quota, retrying with capped backoff
+
+        As in WeatherFetcher._upstream_get, every attempt takes its own
+        token, and with a quota a 429 rests the key and retries on another
+        one. Nothing here blocks the event loop: waiting for a token sleeps
+        on it, and quota state file updates run in a worker thread.
+        """
+        quota = self._quota
+        breaker = self._circuit_breaker
+        response = None
+        for attempt in range(self._max_retries + 1):
+            # Check the breaker first, so an open one fails fast instead of
+            # waiting for a token it would hand back
+            if breaker is not None and not breaker.allow():
+                if response is not None:
+                    return response
+                raise Exception(f"Upstream unavailable: circuit open, retrying in {breaker.retry_in():.1f}s")
+
+            api_key = None
+            if quota is not None:
+                try:
+                    api_key = await quota.acquire_async()
+                except Exception:
+                    if breaker is not None:
+                        breaker.cancel()
+                    if response is not None:
+                        return response
+                    raise
+                params = {**params, "appid": api_key}
+
+            response = await self._send(url, params, breaker)
+            if api_key is not None and response.status_code == 429:
+                await asyncio.to_thread(quota.throttled, api_key, retry_after(response.headers))
+            if response.status_code not in RETRY_STATUSES or attempt == self._max_retries:
+                return response
+            if response.status_code != 429 or quota is None:
+                await asyncio.sleep(self._retry_delay(response, attempt))
+        return response
+
+    async def _send(self, url: str, params: Dict[str, Any], breaker: Optional[CircuitBreaker]) -> httpx.Response:
+        """Make one upstream request, recording its outcome in the metrics and the breaker"""
+        metrics = self._metrics
+        started = metrics.upstream_started() if metrics is not None else 0.0
+        status = None
+        try:
+            async with self._semaphore:
+                response = await self._client.get(url, params=params)
+            status = response.status_code
+            return response
+        finally:
+            if metrics is not None:
+                metrics.upstream_finished("weather", started, status)
+            if breaker is not None:
+                if status is None or status == 429 or status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After or exponential backoff, capped"""
+        return min(retry_after(response.headers, self._backoff_factor * (2 ** attempt)), MAX_RETRY_DELAY)
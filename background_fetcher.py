@@ -0,0 +1,122 @@
+"""
+Background Fetcher Module
+This module contains the BackgroundFetcher class that runs lookups for a UI on a bounded
+worker pool and hands the results back through a queue, dropping superseded ones.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one background lookup
+
+    Attributes:
+        key: Slot the lookup was submitted under (e.g. "search" or a city key)
+        generation: Submission number for the key; only the latest is delivered
+        city: City name that was looked up
+        value: Return value of the lookup function, if it succeeded
+        error: Error message, if it failed
+    """
+    key: str
+    generation: int
+    city: str
+    value: Any = None
+    error: Optional[str] = None
+
+
+class BackgroundFetcher:
+    """Class to run UI lookups on a bounded pool without racing each other
+
+    Every submit() for a key bumps that key's generation. Lookups that have
+    not started yet are cancelled, ones that are running finish but their
+    results are discarded, so a slow earlier request can never overwrite a
+    newer one. Results are collected on a thread-safe queue that the UI
+    thread drains on its own schedule.
+    """
+
+    def __init__(self, fn: Callable[[str], Any], max_workers: int = 4):
+        """Initialize the BackgroundFetcher
+
+        Args:
+            fn: Function run on a worker thread for each city
+            max_workers: Maximum lookups running at once
+        """
+        self._fn = fn
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather-ui")
+        self._results: "queue.Queue[FetchResult]" = queue.Queue()
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, key: str, city: str) -> int:
+        """Look up a city in the background, superseding any earlier lookup for key
+
+        Args:
+            key: Slot the result belongs to
+            city: City name to look up
+
+        Returns:
+            Generation number of this submission
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._futures[key] = self._executor.submit(self._run, key, generation, city)
+        return generation
+
+    def cancel(self, key: str) -> None:
+        """Drop any pending or running lookup for key"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_current(self, key: str, generation: int) -> bool:
+        """Return True if generation is still the latest submission for key"""
+        return self._generations.get(key) == generation
+
+    def _run(self, key: str, generation: int, city: str) -> None:
+        """Worker: run the lookup unless it was superseded while queued"""
+        if not self.is_current(key, generation):
+            return
+        try:
+            result = FetchResult(key, generation, city, value=self._fn(city))
+        except Exception as e:
+            result = FetchResult(key, generation, city, error=str(e))
+        self._results.put(result)
+
+    def drain(self, limit: int = 50) -> List[FetchResult]:
+        """Return up to limit finished results, skipping superseded ones
+
+        Never blocks; meant to be called on a fixed tick from the UI thread.
+        """
+        results = []
+        while len(results) < limit:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if not self.is_current(result.key, result.generation):
+                self.dropped += 1
+                continue
+            results.append(result)
+        return results
+
+    def pending(self) -> int:
+        """Return the number of submitted lookups that have not finished"""
+        with self._lock:
+            return sum(1 for future in self._futures.values() if not future.done())
+
+    def shutdown(self) -> None:
+        """Stop accepting work and cancel lookups that have not started"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
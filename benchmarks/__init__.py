@@ -0,0 +1,5 @@
+"""
+Benchmarks Package
+Standalone benchmark scripts for the Weather App. Run them from the repository root,
+e.g. python -m benchmarks.bench_weather_data
+"""
@@ -0,0 +1,151 @@
+"""
+WeatherData Benchmark
+Compares memory and throughput of the slotted, frozen WeatherData against the plain
+@dataclass it replaced.
+
+Usage:
+    python -m benchmarks.bench_weather_data [--count 100000] [--json]
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from weather_data import WeatherData
+
+
+@dataclass
+class LegacyWeatherData:
+    """The original plain dataclass, kept here as the baseline"""
+    city: str
+    country: str
+    temperature: int
+    feels_like: int
+    description: str
+    humidity: int
+    pressure: int
+    wind_speed: float
+    icon: str
+    last_updated: str
+
+
+SAMPLE_PAYLOAD = {
+    "name": "London",
+    "sys": {"country": "GB"},
+    "main": {"temp": 11.6, "feels_like": 10.2, "humidity": 81, "pressure": 1012},
+    "weather": [{"description": "light rain", "icon": "10d"}],
+    "wind": {"speed": 4.1},
+    "dt": 1700000000
+}
+
+
+def parse_legacy(data: Dict[str, Any]) -> LegacyWeatherData:
+    """Parse a payload the way WeatherFetcher used to"""
+    weather = data.get("weather", [{}])[0]
+    return LegacyWeatherData(
+        city=data.get("name", "Unknown"),
+        country=data.get("sys", {}).get("country", "Unknown"),
+        temperature=round(data.get("main", {}).get("temp", 0)),
+        feels_like=round(data.get("main", {}).get("feels_like", 0)),
+        description=weather.get("description", "Unknown"),
+        humidity=data.get("main", {}).get("humidity", 0),
+        pressure=data.get("main", {}).get("pressure", 0),
+        wind_speed=data.get("wind", {}).get("speed", 0),
+        icon=weather.get("icon", "01d"),
+        last_updated=datetime.datetime.now().strftime("%H:%M:%S")
+    )
+
+
+def legacy_response(weather_data: LegacyWeatherData) -> bytes:
+    """Build a response body the way app.py used to: a fresh dict per request"""
+    result = {
+        'success': True,
+        'city': weather_data.city,
+        'country': weather_data.country,
+        'temperature': weather_data.temperature,
+        'feels_like': weather_data.feels_like,
+        'description': weather_data.description.capitalize(),
+        'humidity': weather_data.humidity,
+        'pressure': weather_data.pressure,
+        'wind_speed': weather_data.wind_speed,
+        'icon': weather_data.icon,
+        'last_updated': weather_data.last_updated
+    }
+    return json.dumps(result).encode("utf-8")
+
+
+def slotted_response(weather_data: WeatherData) -> bytes:
+    """Build a response body the way app.py does now"""
+    return b'{"success":true,' + weather_data.to_json_bytes()[1:]
+
+
+def bytes_per_instance(factory: Callable[[int], Any], count: int) -> float:
+    """Measure average traced allocation per instance for count instances"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds one pointer per instance
+    size = after - before - 8 * len(instances)
+    del instances
+    return size / count
+
+
+def ops_per_second(fn: Callable[[], Any], count: int) -> float:
+    """Time count calls of fn and return calls per second"""
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - started)
+
+
+def run(count: int) -> Dict[str, Dict[str, float]]:
+    """Run all measurements and return them keyed by implementation"""
+    # Share field values so only the per-instance overhead is measured
+    legacy = parse_legacy(SAMPLE_PAYLOAD)
+    slotted = WeatherData.from_api_payload(SAMPLE_PAYLOAD)
+    legacy_fields = [getattr(legacy, name) for name in LegacyWeatherData.__dataclass_fields__]
+    slotted_fields = slotted.to_dict()
+
+    return {
+        "legacy_dataclass": {
+            "bytes_per_instance": bytes_per_instance(lambda i: LegacyWeatherData(*legacy_fields), count),
+            "parse_per_second": ops_per_second(lambda: parse_legacy(SAMPLE_PAYLOAD), count),
+            "response_per_second": ops_per_second(lambda: legacy_response(legacy), count),
+        },
+        "slotted_weather_data": {
+            "bytes_per_instance": bytes_per_instance(lambda i: WeatherData(**slotted_fields), count),
+            "parse_per_second": ops_per_second(lambda: WeatherData.from_api_payload(SAMPLE_PAYLOAD), count),
+            "response_per_second": ops_per_second(lambda: slotted_response(slotted), count),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="instances/iterations per measurement")
+    parser.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.count)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'':24}{'bytes/instance':>16}{'parse/s':>14}{'response/s':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:24}{result['bytes_per_instance']:>16.0f}"
+            f"{result['parse_per_second']:>14.0f}{result['response_per_second']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+"""
+Pipeline Benchmarks
+Measures the fetch, parse and serve pipeline against the local OpenWeatherMap stub
+server and writes the results as JSON, optionally comparing them with a previous run.
+
+Scenarios:
+    parse            WeatherFetcher._parse_weather_data and forecast parsing, per second
+    fetch_single     sequential uncached get_current_weather calls
+    fetch_cached     repeated get_current_weather calls served from the cache
+    fetch_concurrent uncached get_current_weather calls from a thread pool
+    fetch_icon       sequential get_icon downloads over the pooled session
+    app_weather      concurrent GET /weather requests against app.py end to end
+    compression      bytes on the wire and CPU per response for app.py routes by Content-Encoding,
+                     static asset sizes, and JSON provider throughput
+    startup          fresh-interpreter import time of each entry point, from -X importtime,
+                     checked against STARTUP_BUDGETS_MS and STARTUP_FORBIDDEN
+
+Usage:
+    python -m benchmarks.run_benchmarks [--output results.json] [--baseline previous.json]
+
+Exits non-zero if a regression against the baseline is found or an entry point is over
+its startup budget.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.stub_server import StubServer, forecast_payload, weather_payload
+from weather_fetcher import WeatherFetcher
+
+# Metrics where a higher value is better; for every other compared metric lower is better
+HIGHER_IS_BETTER = ("per_s",)
+COMPARED_SUFFIXES = ("per_s", "p50_ms", "p95_ms", "p99_ms", "cpu_us")
+
+# Import time ceiling per entry point module, in milliseconds of -X importtime
+# cumulative time (interpreter startup itself is reported separately). These sit
+# at about twice the usual measurement so machine noise never fails a run; they
+# catch gross mistakes, while --baseline compares import_p50_ms run to run.
+STARTUP_BUDGETS_MS = {
+    "weather_fetcher": 150,
+    "refresh_cli": 150,
+    "icon_store": 150,
+    "app": 500,
+    "weather_app": 1000,
+}
+
+# Heavy packages an entry point must not pull in at import time
+GUI_PACKAGES = ("tkinter", "customtkinter", "PIL")
+STARTUP_FORBIDDEN = {
+    "weather_fetcher": GUI_PACKAGES + ("requests", "urllib3", "numpy"),
+    "refresh_cli": GUI_PACKAGES + ("numpy",),
+    "icon_store": GUI_PACKAGES + ("requests", "numpy"),
+    "app": GUI_PACKAGES + ("requests", "numpy"),
+    "weather_app": ("requests", "numpy"),
+}
+
+# Cities per POST /weather/batch in the compression scenario
+BATCH_CITIES = 20
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time: self [us] | cumulative | <indented name>"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """Summarize per-call latencies (seconds) measured over elapsed seconds"""
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "calls": len(values),
+        "errors": errors,
+        "requests_per_s": round(len(values) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+    }
+
+
+def timed_calls(fn: Callable[[int], Any], count: int, workers: int = 1) -> Dict[str, float]:
+    """Call fn(i) for i in range(count) on workers threads, timing each call"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def call(i: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        failed = False
+        try:
+            fn(i)
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors += failed
+
+    started = time.perf_counter()
+    if workers == 1:
+        for i in range(count):
+            call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(call, range(count)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def ops_per_second(fn: Callable[[], Any], count: int) -> float:
+    """Time count calls of fn and return calls per second"""
+    started = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return round(count / (time.perf_counter() - started), 1)
+
+
+def bench_parse(count: int) -> Dict[str, float]:
+    """Microbenchmark response parsing without any I/O"""
+    weather = weather_payload("London", 1)
+    results = {
+        "weather_parse_per_s": ops_per_second(lambda: WeatherFetcher._parse_weather_data(weather), count),
+        "weather_json_decode_parse_per_s": ops_per_second(
+            lambda: WeatherFetcher._parse_weather_data(json.loads(json.dumps(weather))), count
+        ),
+    }
+    try:
+        from weather_forecast import ForecastSeries
+    except ImportError:
+        return results
+
+    forecast = forecast_payload("London", 1)
+    results["forecast_parse_per_s"] = ops_per_second(lambda: ForecastSeries.from_api_payload(forecast), max(1, count // 10))
+    return results
+
+
+def make_fetcher(stub: StubServer, workers: int, cache_ttl: float) -> WeatherFetcher:
+    """Build a fetcher pointed at the stub server"""
+    return WeatherFetcher(
+        "bench",
+        cache_ttl=cache_ttl,
+        cache_max_entries=100000,
+        pool_size=workers,
+        max_retries=0,
+        base_url=stub.base_url,
+        icon_url=stub.icon_url
+    )
+
+
+def bench_fetch_single(stub: StubServer, count: int) -> Dict[str, float]:
+    """Sequential uncached lookups: one upstream round trip each"""
+    fetcher = make_fetcher(stub, 1, cache_ttl=0)
+    try:
+        return timed_calls(lambda i: fetcher.get_current_weather(f"City{i}"), count)
+    finally:
+        fetcher.close()
+
+
+def bench_fetch_cached(stub: StubServer, count: int) -> Dict[str, float]:
+    """Repeated lookups of a small set of cities, almost all cache hits"""
+    fetcher = make_fetcher(stub, 1, cache_ttl=600)
+    try:
+        return timed_calls(lambda i: fetcher.get_current_weather(f"City{i % 10}"), count)
+    finally:
+        fetcher.close()
+
+
+def bench_fetch_concurrent(stub: StubServer, count: int, workers: int) -> Dict[str, float]:
+    """Uncached lookups of distinct cities from a thread pool sharing one fetcher"""
+    fetcher = make_fetcher(stub, workers, cache_ttl=0)
+    try:
+        result = timed_calls(lambda i: fetcher.get_current_weather(f"City{i}"), count, workers)
+    finally:
+        fetcher.close()
+    result["workers"] = workers
+    return result
+
+
+def bench_fetch_icon(stub: StubServer, count: int) -> Dict[str, float]:
+    """Sequential icon downloads through the fetcher's pooled session"""
+    fetcher = make_fetcher(stub, 1, cache_ttl=0)
+    icons = ("01d", "02d", "10d", "13d")
+    try:
+        return timed_calls(lambda i: fetcher.get_icon(icons[i % len(icons)]), count)
+    finally:
+        fetcher.close()
+
+
+def load_app(stub: StubServer, workers: int, cache_ttl: float):
+    """Import app.py configured against the stub (the first call's settings stick)"""
+    # app.py configures itself from the environment at import time
+    os.environ.update({
+        "OPENWEATHERMAP_API_KEY": "bench",
+        "OPENWEATHERMAP_BASE_URL": stub.base_url,
+        "OPENWEATHERMAP_ICON_URL": stub.icon_url,
+        "WEATHER_CACHE_TTL": str(cache_ttl),
+        "WEATHER_HTTP_POOL_SIZE": str(workers),
+        "WEATHER_HTTP_MAX_RETRIES": "0",
+        "WEATHER_PREFETCH_TOP_K": "0",
+        "WEATHER_QUOTA_PER_MINUTE": "0",
+    })
+    os.environ.pop("WEATHER_CACHE_DB", None)
+
+    import logging
+    import app as web_app
+
+    # Per-request logging would dominate the measurement
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    logging.getLogger(web_app.__name__).setLevel(logging.WARNING)
+    return web_app
+
+
+def bench_app_weather(stub: StubServer, count: int, workers: int, distinct_cities: int, cache_ttl: float) -> Dict[str, float]:
+    """Concurrent GET /weather requests against the Flask app served over HTTP"""
+    from werkzeug.serving import make_server
+
+    web_app = load_app(stub, workers, cache_ttl)
+    server = make_server("127.0.0.1", 0, web_app.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/weather"
+    sessions = threading.local()
+
+    def get(i: int) -> None:
+        session = getattr(sessions, "session", None)
+        if session is None:
+            session = sessions.session = requests.Session()
+        response = session.get(url, params={"city": f"City{i % distinct_cities}"}, timeout=30)
+        if response.status_code != 200 or not response.json().get("success"):
+            raise Exception(f"Unexpected response: {response.status_code}")
+
+    try:
+        result = timed_calls(get, count, workers)
+    finally:
+        server.shutdown()
+    result.update({"workers": workers, "distinct_cities": distinct_cities, "cache_ttl": cache_ttl})
+    return result
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float], float]:
+    """Import module in a fresh interpreter with -X importtime
+    
+    Returns:
+        Cumulative import time of module in ms, cumulative ms of every
+        top-level package imported along the way, and the wall time of the
+        whole process in ms
+    
+    Raises:
+        Exception: If the module could not be imported
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=REPO_ROOT
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise Exception(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed")
+    
+    total_ms = 0.0
+    packages: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        name = match.group(4)
+        if not match.group(3) and name == "site":
+            # Everything so far was interpreter startup, not the module
+            packages.clear()
+            continue
+        if name == module and not match.group(3):
+            total_ms = cumulative_ms
+        # A package's own line (printed after its submodules) covers them all
+        top = name.split(".")[0]
+        packages[top] = max(packages.get(top, 0.0), cumulative_ms)
+    return total_ms, packages, wall_ms
+
+
+def bench_startup(runs: int, top: int = 5) -> Dict[str, Any]:
+    """Measure each entry point's import time in fresh interpreters"""
+    results: Dict[str, Any] = {}
+    for module, budget_ms in STARTUP_BUDGETS_MS.items():
+        profiles = []
+        try:
+            for _ in range(runs):
+                profiles.append(import_profile(module))
+        except Exception as e:
+            # e.g. weather_app on a machine without the GUI toolkit installed
+            results[module] = {"skipped": str(e)}
+            continue
+        
+        import_ms = statistics.median(profile[0] for profile in profiles)
+        packages = profiles[-1][1]
+        slowest = sorted(
+            ((name, ms) for name, ms in packages.items() if name != module),
+            key=lambda item: item[1], reverse=True
+        )[:top]
+        results[module] = {
+            "import_p50_ms": round(import_ms, 1),
+            "process_p50_ms": round(statistics.median(profile[2] for profile in profiles), 1),
+            "budget_ms": budget_ms,
+            "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest},
+            "forbidden_imports": sorted(name for name in STARTUP_FORBIDDEN.get(module, ()) if name in packages),
+        }
+    return results
+
+
+def startup_violations(startup: Dict[str, Any]) -> List[str]:
+    """List entry points that are over budget or import forbidden packages"""
+    violations = []
+    for module, result in startup.items():
+        if "skipped" in result:
+            continue
+        if result["import_p50_ms"] > result["budget_ms"]:
+            violations.append(f"{module}: imports in {result['import_p50_ms']} ms, budget {result['budget_ms']} ms")
+        if result["forbidden_imports"]:
+            violations.append(f"{module}: imports {', '.join(result['forbidden_imports'])} at startup")
+    return violations
+
+
+def bench_compression(stub: StubServer, count: int, workers: int, cache_ttl: float) -> Dict[str, Any]:
+    """Bytes and CPU per response by Content-Encoding, through the Flask test client"""
+    from flask.json.provider import DefaultJSONProvider
+    from compression import brotli, compress
+    from json_provider import FastJSONProvider
+
+    web_app = load_app(stub, workers, cache_ttl)
+    client = web_app.app.test_client()
+    batch = {"cities": [f"City{i}" for i in range(BATCH_CITIES)]}
+    routes = {
+        "weather": lambda headers: client.get("/weather?city=London", headers=headers),
+        "batch": lambda headers: client.post("/weather/batch", json=batch, headers=headers),
+        "index": lambda headers: client.get("/", headers=headers),
+    }
+    encodings = ("identity", "gzip") + (("br",) if brotli is not None else ())
+
+    results: Dict[str, Any] = {}
+    for route, call in routes.items():
+        call({})  # warm the cache so only serving is measured
+        for encoding in encodings:
+            headers = {"Accept-Encoding": encoding}
+            started = time.process_time()
+            for _ in range(count):
+                response = call(headers)
+            cpu = time.process_time() - started
+            results[f"{route}_{encoding}_bytes"] = len(response.data)
+            results[f"{route}_{encoding}_cpu_us"] = round(cpu / count * 1e6, 1)
+
+    # Static files: precompressed once at build time, so serving costs no CPU
+    static_dir = os.path.join(REPO_ROOT, "static")
+    for name in ("css/styles.css", "js/script.js"):
+        with open(os.path.join(static_dir, name), "rb") as f:
+            data = f.read()
+        key = os.path.basename(name).replace(".", "_")
+        results[f"{key}_identity_bytes"] = len(data)
+        results[f"{key}_gzip_bytes"] = len(compress(data, "gzip", 9))
+        if brotli is not None:
+            results[f"{key}_br_bytes"] = len(compress(data, "br", 11))
+
+    # JSON encoding of a batch-sized payload: Flask's default provider vs ours
+    payload = {"success": True, "results": {
+        f"City{i}": {"success": True, **weather_payload(f"City{i}", i)} for i in range(BATCH_CITIES)
+    }}
+    default_provider = DefaultJSONProvider(web_app.app)
+    fast_provider = FastJSONProvider(web_app.app)
+    iterations = max(1, count * 5)
+    results["json_default_per_s"] = ops_per_second(lambda: default_provider.dumps(payload).encode("utf-8"), iterations)
+    results["json_fast_per_s"] = ops_per_second(lambda: fast_provider.dumps_bytes(payload), iterations)
+    results["json_backend"] = fast_provider.backend
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Return the current commit hash, if run from a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the selected scenarios and return the full result document"""
+    stub = StubServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                      rate_limit_rate=args.rate_limit_rate, seed=1).start()
+    scenarios: Dict[str, Any] = {}
+    try:
+        selected = set(args.scenarios)
+        if "parse" in selected:
+            scenarios["parse"] = bench_parse(args.parse_count)
+        if "fetch_single" in selected:
+            scenarios["fetch_single"] = bench_fetch_single(stub, args.count)
+        if "fetch_cached" in selected:
+            scenarios["fetch_cached"] = bench_fetch_cached(stub, args.count * 10)
+        if "fetch_concurrent" in selected:
+            scenarios["fetch_concurrent"] = bench_fetch_concurrent(stub, args.count * 4, args.workers)
+        if "fetch_icon" in selected:
+            scenarios["fetch_icon"] = bench_fetch_icon(stub, args.count)
+        if "app_weather" in selected:
+            scenarios["app_weather"] = bench_app_weather(stub, args.count * 4, args.workers, args.distinct_cities, args.app_cache_ttl)
+        if "compression" in selected:
+            scenarios["compression"] = bench_compression(stub, args.count, args.workers, args.app_cache_ttl)
+        if "startup" in selected:
+            scenarios["startup"] = bench_startup(args.startup_runs)
+    finally:
+        stub.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "stub": {
+                "latency": args.latency,
+                "jitter": args.jitter,
+                "error_rate": args.error_rate,
+                "rate_limit_rate": args.rate_limit_rate
+            }
+        },
+        "scenarios": scenarios,
+        "stub_requests": dict(stub.requests)
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List metrics that regressed by more than tolerance against a baseline run"""
+    regressions = []
+    for scenario, metrics in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {})
+        if scenario == "startup":
+            # One level deeper: startup results are grouped per module
+            for module, module_metrics in metrics.items():
+                regressions.extend(_compare_metrics(f"{scenario}.{module}", module_metrics, previous.get(module, {}), tolerance))
+        else:
+            regressions.extend(_compare_metrics(scenario, metrics, previous, tolerance))
+    return regressions
+
+
+def _compare_metrics(prefix: str, metrics: Dict[str, Any], previous: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for name, value in metrics.items():
+        old = previous.get(name)
+        if not name.endswith(COMPARED_SUFFIXES) or not old:
+            continue
+        change = (value - old) / old
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        if worse > tolerance:
+            regressions.append(f"{prefix}.{name}: {old} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    scenario_names = ("parse", "fetch_single", "fetch_cached", "fetch_concurrent", "fetch_icon", "app_weather", "compression", "startup")
+    parser.add_argument("--scenarios", nargs="+", choices=scenario_names, default=list(scenario_names),
+                        help="scenarios to run (default: all)")
+    parser.add_argument("--count", type=int, default=200, help="base number of calls per scenario")
+    parser.add_argument("--parse-count", type=int, default=50000, help="iterations for the parse microbenchmark")
+    parser.add_argument("--workers", type=int, default=16, help="threads for concurrent scenarios")
+    parser.add_argument("--distinct-cities", type=int, default=50, help="distinct cities requested in app_weather")
+    parser.add_argument("--app-cache-ttl", type=float, default=600, help="WEATHER_CACHE_TTL for app_weather")
+    parser.add_argument("--startup-runs", type=int, default=5, help="fresh interpreters started per entry point in startup")
+    parser.add_argument("--latency", type=float, default=0.01, help="stub response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random stub latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of stub 429 responses")
+    parser.add_argument("--output", help="write results JSON to this file instead of stdout")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression (default: 0.15)")
+    args = parser.parse_args()
+
+    results = run(args)
+    document = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(document + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(document)
+
+    failed = False
+    for line in startup_violations(results["scenarios"].get("startup", {})):
+        print(f"OVER BUDGET {line}", file=sys.stderr)
+        failed = True
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        failed = failed or bool(regressions)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+OpenWeatherMap Stub Server
+A local HTTP server that mimics the parts of api.openweathermap.org the app uses
+(/data/2.5/weather, /data/2.5/forecast and /img/wn/<icon>@2x.png) with configurable
+latency, error rate and rate limiting, so benchmarks never touch the real API.
+
+Usage:
+    python -m benchmarks.stub_server [--port 8081] [--latency 0.05] [--error-rate 0.01]
+
+Then point the app at it:
+    OPENWEATHERMAP_BASE_URL=http://127.0.0.1:8081/data/2.5 \\
+    OPENWEATHERMAP_ICON_URL=http://127.0.0.1:8081/img/wn/{icon}@2x.png flask run
+"""
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Any city whose name starts with this gets a 404, like an unknown city upstream
+UNKNOWN_CITY_PREFIX = "nowhere"
+
+# A 1x1 transparent PNG served for every icon code
+ICON_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+ICONS = ("01d", "02d", "03d", "04d", "09d", "10d", "11d", "13d", "50d")
+
+
+def weather_payload(name: str, seed: int) -> Dict[str, Any]:
+    """Build a deterministic /weather response for a city"""
+    rng = random.Random(seed)
+    return {
+        "id": seed,
+        "name": name,
+        "dt": int(time.time()),
+        "sys": {"country": "XX"},
+        "main": {
+            "temp": round(rng.uniform(-20, 40), 2),
+            "feels_like": round(rng.uniform(-25, 42), 2),
+            "humidity": rng.randint(10, 100),
+            "pressure": rng.randint(980, 1040)
+        },
+        "weather": [{"description": rng.choice(("clear sky", "few clouds", "light rain", "snow")), "icon": rng.choice(ICONS)}],
+        "wind": {"speed": round(rng.uniform(0, 20), 1)}
+    }
+
+
+def forecast_payload(name: str, seed: int, steps: int = 40) -> Dict[str, Any]:
+    """Build a deterministic 5 day / 3 hour /forecast response for a city"""
+    rng = random.Random(seed)
+    start = int(time.time()) // 10800 * 10800
+    return {
+        "city": {"id": seed, "name": name, "country": "XX", "timezone": 0},
+        "list": [
+            {
+                "dt": start + i * 10800,
+                "main": {
+                    "temp": round(rng.uniform(-20, 40), 2),
+                    "feels_like": round(rng.uniform(-25, 42), 2),
+                    "humidity": rng.randint(10, 100),
+                    "pressure": rng.randint(980, 1040)
+                },
+                "wind": {"speed": round(rng.uniform(0, 20), 1)}
+            }
+            for i in range(steps)
+        ]
+    }
+
+
+class StubServer:
+    """Class to run the stub API in a background thread
+
+    Attributes:
+        requests: Counter of served requests by endpoint and status, e.g. "weather:200"
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 0,
+        seed: Optional[int] = None
+    ):
+        """Initialize the StubServer
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Seconds added to every response
+            jitter: Extra uniformly random seconds added on top of latency
+            error_rate: Fraction of data requests answered with a 500
+            rate_limit_rate: Fraction of data requests answered with a 429
+            retry_after: Retry-After header value sent with 429s
+            seed: Seed for the error/latency randomness, for repeatable runs
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass as WeatherFetcher(base_url=...)"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/data/2.5"
+
+    @property
+    def icon_url(self) -> str:
+        """Icon URL template to pass as WeatherFetcher(icon_url=...)"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/img/wn/{{icon}}@2x.png"
+
+    def start(self) -> "StubServer":
+        """Start serving in a daemon thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="owm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted"""
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _roll(self) -> float:
+        """Return a random number in [0, 1) from the shared generator"""
+        with self._lock:
+            return self._random.random()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.requests[key] += 1
+
+    def _handler_class(self):
+        """Build the request handler bound to this server's settings"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, like the real API, so connection pooling is exercised
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let Nagle delay the body
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                if url.path.startswith("/img/wn/"):
+                    stub._count("icon:200")
+                    self._send(200, ICON_PNG, "image/png")
+                    return
+
+                endpoint = url.path.rsplit("/", 1)[-1]
+                if endpoint not in ("weather", "forecast"):
+                    self._send_json(404, {"cod": "404", "message": "Internal error"}, endpoint)
+                    return
+
+                delay = stub.latency + (stub.jitter * stub._roll() if stub.jitter else 0.0)
+                if delay:
+                    time.sleep(delay)
+
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if not params.get("appid"):
+                    self._send_json(401, {"cod": 401, "message": "Invalid API key."}, endpoint)
+                    return
+
+                roll = stub._roll()
+                if roll < stub.rate_limit_rate:
+                    self._send_json(429, {"cod": 429, "message": "Too many requests"}, endpoint,
+                                    {"Retry-After": str(stub.retry_after)})
+                    return
+                if roll < stub.rate_limit_rate + stub.error_rate:
+                    self._send_json(500, {"cod": 500, "message": "Internal server error"}, endpoint)
+                    return
+
+                name = params.get("q") or params.get("id") or f"{params.get('lat')},{params.get('lon')}"
+                name = name.split(",")[0] if "q" in params else name
+                if name.casefold().startswith(UNKNOWN_CITY_PREFIX):
+                    self._send_json(404, {"cod": "404", "message": "city not found"}, endpoint)
+                    return
+
+                seed = zlib.crc32(name.encode("utf-8"))
+                payload = weather_payload(name, seed) if endpoint == "weather" else forecast_payload(name, seed)
+                self._send_json(200, payload, endpoint)
+
+            def _send_json(self, status: int, payload: Dict[str, Any], endpoint: str,
+                           headers: Optional[Dict[str, str]] = None) -> None:
+                stub._count(f"{endpoint}:{status}")
+                self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+            def _send(self, status: int, body: bytes, content_type: str,
+                      headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--port", type=int, default=8081, help="port to bind")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with 429s")
+    args = parser.parse_args()
+
+    server = StubServer(
+        args.host, args.port, args.latency, args.jitter,
+        args.error_rate, args.rate_limit_rate, args.retry_after
+    )
+    print(f"Stub API on {server.base_url} (icons: {server.icon_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Circuit Breaker Module
+This module contains the CircuitBreaker class that stops calling a failing upstream
+for a while once its recent error rate gets too high.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Numeric value per state, for a gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """Class to fail fast while an upstream is unhealthy
+
+    Outcomes of the last window_size calls are kept. Once at least min_calls
+    of them are recorded and the share of failures reaches failure_rate, the
+    breaker opens and allow() refuses every call for open_seconds. After
+    that it goes half-open and lets up to half_open_calls probe calls
+    through: a successful probe closes it again, a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        name: str = "upstream",
+        on_state_change: Optional[Callable[[str, str], None]] = None
+    ):
+        """Initialize the CircuitBreaker
+
+        Args:
+            failure_rate: Share of failed calls in the window (0-1) that opens
+                the breaker
+            window_size: Number of most recent calls considered
+            min_calls: Calls that must be recorded before the breaker can open
+            open_seconds: Seconds to refuse calls before probing upstream again
+            half_open_calls: Probe calls allowed at once while half-open
+            name: Name used in log messages
+            on_state_change: Called with (old_state, new_state) on every change
+        """
+        self._failure_rate = failure_rate
+        self._min_calls = min(min_calls, window_size)
+        self._open_seconds = open_seconds
+        self._half_open_calls = half_open_calls
+        self._name = name
+        self._on_state_change = on_state_change
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, HALF_OPEN or OPEN"""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self._open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def retry_in(self) -> float:
+        """Return seconds until an open breaker lets a probe through (0 if not open)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a call may go upstream now
+
+        Every allowed call must be followed by record_success() or
+        record_failure().
+        """
+        changed = None
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self._open_seconds:
+                    return False
+                changed = self._transition(HALF_OPEN)
+
+            if self._state == HALF_OPEN:
+                if self._probes >= self._half_open_calls:
+                    allowed = False
+                else:
+                    self._probes += 1
+                    allowed = True
+            else:
+                allowed = True
+
+        self._notify(changed)
+        return allowed
+
+    def cancel(self) -> None:
+        """Give back a call allowed by allow() that was never made"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy upstream"""
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Record a call that failed because upstream is unhealthy"""
+        self._record(False)
+
+    def _record(self, success: bool) -> None:
+        changed = None
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                changed = self._transition(CLOSED if success else OPEN)
+            elif self._state == CLOSED:
+                self._outcomes.append(success)
+                if len(self._outcomes) >= self._min_calls:
+                    failures = self._outcomes.count(False)
+                    if failures / len(self._outcomes) >= self._failure_rate:
+                        changed = self._transition(OPEN)
+            # Calls that were already in flight when the breaker opened are ignored
+
+        self._notify(changed)
+
+    def _transition(self, state: str) -> Optional[tuple]:
+        """Switch state (lock held) and return (old, new) for _notify()"""
+        old = self._state
+        if old == state:
+            return None
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._outcomes.clear()
+        self._probes = 0
+        return old, state
+
+    def _notify(self, changed: Optional[tuple]) -> None:
+        """Log a state change and pass it to the listener, outside the lock"""
+        if changed is None:
+            return
+        old, new = changed
+        if new == OPEN:
+            logger.warning(f"Circuit breaker '{self._name}' opened ({old} -> {new}); "
+                           f"failing fast for {self._open_seconds:g}s")
+        else:
+            logger.info(f"Circuit breaker '{self._name}' {old} -> {new}")
+        if self._on_state_change is not None:
+            try:
+                self._on_state_change(old, new)
+            except Exception as e:
+                logger.warning(f"Circuit breaker listener failed: {str(e)}")
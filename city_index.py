@@ -0,0 +1,258 @@
+"""
+City Index Module
+This module contains the CityIndex class that resolves city names to OpenWeatherMap
+city IDs in-process, loaded from the OpenWeatherMap city list.
+"""
+
+import gzip
+import heapq
+import json
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from weather_cache import normalize_city
+
+# Prefixes up to this length match large ranges of the index, so their most
+# populous cities are ranked once at build time
+PRECOMPUTED_PREFIX_LENGTH = 3
+
+# Number of ranked suggestions kept per precomputed prefix
+PRECOMPUTED_SUGGESTIONS = 20
+
+
+@dataclass
+class City:
+    """Class to hold one entry of the city index
+
+    Attributes:
+        id: OpenWeatherMap city ID
+        name: City name as published in the city list
+        country: Country code
+        lat: Latitude in degrees
+        lon: Longitude in degrees
+        population: Population, or 0 if the list doesn't provide it
+    """
+    id: int
+    name: str
+    country: str
+    lat: float
+    lon: float
+    population: int = 0
+
+
+def search_key(name: str) -> str:
+    """Normalize a city name for index lookups
+
+    Same as normalize_city, with diacritics removed so "Sao Paulo" finds
+    "São Paulo".
+
+    Args:
+        name: City name
+
+    Returns:
+        Normalized search key
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return normalize_city("".join(c for c in decomposed if not unicodedata.combining(c)))
+
+
+def split_country(query: str) -> Tuple[str, Optional[str]]:
+    """Split an OpenWeatherMap style "City,CC" query into name and country
+
+    Args:
+        query: City name, optionally followed by a comma and a country code
+
+    Returns:
+        Tuple of (search key, upper-case country code or None)
+    """
+    name, _, country = query.partition(",")
+    country = country.strip().upper() or None
+    return search_key(name), country
+
+
+class CityIndex:
+    """Compact, sorted in-memory index over the OpenWeatherMap city list
+
+    Entries are kept in parallel arrays sorted by normalized name, so exact and
+    prefix lookups are binary searches and the per-city overhead is a few
+    machine words instead of a dict per record.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        """Build the index
+
+        Building also ranks the most populous cities for every short prefix,
+        so suggest() never scans a large range at request time.
+
+        Args:
+            records: City records in the OpenWeatherMap city list format
+                ({"id", "name", "country", "coord": {"lat", "lon"}}), with an
+                optional "population" field
+        """
+        rows = []
+        for record in records:
+            name = record.get("name") or ""
+            key = search_key(name)
+            if not key:
+                continue
+            coord = record.get("coord") or {}
+            rows.append((
+                key,
+                -int(record.get("population") or 0),
+                int(record["id"]),
+                name,
+                record.get("country") or "",
+                float(coord.get("lat", 0.0)),
+                float(coord.get("lon", 0.0))
+            ))
+
+        # Sorting by (key, -population) puts the most populous city first
+        # among cities sharing a name
+        rows.sort(key=lambda row: (row[0], row[1]))
+
+        interned: Dict[str, str] = {}
+        self._keys: List[str] = [row[0] for row in rows]
+        self._names: List[str] = [row[3] for row in rows]
+        self._countries: List[str] = [interned.setdefault(row[4], row[4]) for row in rows]
+        self._ids = array("q", (row[2] for row in rows))
+        self._populations = array("q", (-row[1] for row in rows))
+        self._lats = array("f", (row[5] for row in rows))
+        self._lons = array("f", (row[6] for row in rows))
+
+        # Secondary index: positions sorted by city ID for get()
+        order = sorted(range(len(rows)), key=self._ids.__getitem__)
+        self._id_order = array("q", order)
+        self._sorted_ids = array("q", (self._ids[i] for i in order))
+
+        self._top_by_prefix: Dict[str, array] = {}
+        for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1):
+            prefixes = dict.fromkeys(key[:length] for key in self._keys if len(key) >= length)
+            for prefix in prefixes:
+                self._top_by_prefix[prefix] = array("q", self._rank(prefix, PRECOMPUTED_SUGGESTIONS))
+
+    @classmethod
+    def load(cls, path: str) -> "CityIndex":
+        """Load the index from an OpenWeatherMap city list file
+
+        Args:
+            path: Path to city.list.json, optionally gzip-compressed (.gz)
+
+        Returns:
+            CityIndex built from the file
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _city_at(self, position: int) -> City:
+        """Materialize the City stored at a position"""
+        return City(
+            id=self._ids[position],
+            name=self._names[position],
+            country=self._countries[position],
+            lat=round(self._lats[position], 4),
+            lon=round(self._lons[position], 4),
+            population=self._populations[position]
+        )
+
+    def get(self, city_id: int) -> Optional[City]:
+        """Return the city with the given OpenWeatherMap ID, if indexed"""
+        i = bisect_left(self._sorted_ids, city_id)
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == city_id:
+            return self._city_at(self._id_order[i])
+        return None
+
+    def resolve(self, query: str) -> Optional[int]:
+        """Resolve a city name to an OpenWeatherMap city ID
+
+        Accepts "City" or "City,CC". When several cities share the name, the
+        most populous one (or the first listed, without population data) wins.
+
+        Args:
+            query: City name, optionally with a country code
+
+        Returns:
+            City ID, or None if the name is not in the index
+        """
+        key, country = split_country(query)
+        if not key:
+            return None
+
+        i = bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i] == key:
+            if country is None or self._countries[i] == country:
+                return self._ids[i]
+            i += 1
+        return None
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[City]:
+        """Return cities whose normalized name starts with prefix
+
+        Args:
+            prefix: Beginning of a city name
+            limit: Maximum number of cities to return
+
+        Returns:
+            Matching cities in name order
+        """
+        key = search_key(prefix)
+        if not key:
+            return []
+
+        matches = []
+        i = bisect_left(self._keys, key)
+        while i < len(self._keys) and len(matches) < limit and self._keys[i].startswith(key):
+            matches.append(self._city_at(i))
+            i += 1
+        return matches
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[City]:
+        """Return the most populous cities whose name starts with prefix
+
+        Args:
+            prefix: Beginning of a city name
+            limit: Maximum number of cities to return
+
+        Returns:
+            Matching cities, most populous first
+        """
+        key = search_key(prefix)
+        if not key or limit <= 0:
+            return []
+
+        top = self._top_by_prefix.get(key)
+        if top is not None and limit <= PRECOMPUTED_SUGGESTIONS:
+            positions = top[:limit]
+        elif len(key) <= PRECOMPUTED_PREFIX_LENGTH and top is None:
+            # Short prefix with no precomputed entry means nothing matches
+            return []
+        else:
+            positions = self._rank(key, limit)
+        return [self._city_at(i) for i in positions]
+
+    def _rank(self, key: str, limit: int) -> List[int]:
+        """Return positions of the most populous cities in key's prefix range"""
+        lo = bisect_left(self._keys, key)
+        hi = bisect_left(self._keys, key + "\U0010ffff", lo)
+        return heapq.nlargest(limit, range(lo, hi), key=self._populations.__getitem__)
+
+    def memory_footprint(self) -> int:
+        """Approximate bytes held by the index structures"""
+        size = sum(sys.getsizeof(a) for a in (
+            self._ids, self._populations, self._lats, self._lons,
+            self._id_order, self._sorted_ids
+        ))
+        size += sys.getsizeof(self._keys) + sum(sys.getsizeof(k) for k in self._keys)
+        size += sys.getsizeof(self._names) + sum(sys.getsizeof(n) for n in self._names)
+        size += sys.getsizeof(self._countries) + sum(sys.getsizeof(c) for c in set(self._countries))
+        size += sys.getsizeof(self._top_by_prefix) + sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in self._top_by_prefix.items()
+        )
+        return size
@@ -0,0 +1,123 @@
+"""
+Compression Module
+This module contains the ResponseCompressor class that gzip- or brotli-encodes Flask
+responses above a size threshold, plus helpers shared with the static asset build.
+"""
+
+import gzip
+import threading
+from typing import Optional
+
+from flask import Flask, Request, Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Types worth compressing; images and fonts are already compressed
+COMPRESSIBLE_TYPES = frozenset((
+    "application/json",
+    "application/javascript",
+    "text/javascript",
+    "text/css",
+    "text/html",
+    "text/plain",
+    "image/svg+xml",
+))
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress data for a Content-Encoding
+
+    Args:
+        data: Bytes to compress
+        encoding: "br" or "gzip"
+        level: Brotli quality (0-11) or gzip level (1-9); None picks a level
+            suited to compressing on every request
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=5 if level is None else level)
+    # mtime=0 makes the output depend on the data only, so it is reproducible
+    return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+
+
+def preferred_encoding(request: Request) -> Optional[str]:
+    """Return the best encoding the client accepts: "br", "gzip" or None"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+class ResponseCompressor:
+    """Class to compress eligible Flask responses on the way out
+
+    A response is compressed only when it is a complete 200 body of a
+    compressible type, at least min_size bytes, and not already encoded.
+    Streamed responses (such as /weather/stream), files served directly and
+    304s are left alone. The ETag of a compressed response is made weak, so
+    revalidating it against the uncompressed body still gets a 304.
+    """
+
+    def __init__(self, app: Optional[Flask] = None, min_size: int = 500, gzip_level: int = 6, brotli_quality: int = 5):
+        """Initialize the ResponseCompressor
+
+        Args:
+            app: Flask app to install the after_request hook on
+            min_size: Smallest body in bytes worth compressing
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: Brotli quality (0-11)
+        """
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Compress responses of app"""
+        app.after_request(self.after_request)
+
+    def after_request(self, response: Response) -> Response:
+        """Compress response if it is eligible and the client accepts it"""
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = preferred_encoding(request)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        level = self.brotli_quality if encoding == "br" else self.gzip_level
+        compressed = compress(data, encoding, level)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        with self._lock:
+            self.bytes_in += len(data)
+            self.bytes_out += len(compressed)
+        return response
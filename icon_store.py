@@ -0,0 +1,253 @@
+"""
+Icon Store Module
+This module contains the IconStore class that downloads each OpenWeatherMap weather icon
+once and keeps it in memory and on disk, for both the desktop app and the web app.
+"""
+
+import argparse
+import io
+import logging
+import os
+import sys
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from single_flight import SingleFlight
+from weather_fetcher import DEFAULT_ICON_URL, WeatherFetcher
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageTk
+
+logger = logging.getLogger(__name__)
+
+# Every icon code OpenWeatherMap uses: condition group plus day/night variant
+ICON_CODES = tuple(
+    f"{group}{variant}"
+    for group in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+    for variant in ("d", "n")
+)
+
+# Anything else is rejected before it can touch disk or network
+_ICON_CODE_SET = frozenset(ICON_CODES)
+
+DEFAULT_ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "icons")
+
+
+def is_icon_code(code: str) -> bool:
+    """Return True if code is one of the OpenWeatherMap icon codes (e.g. "10d")"""
+    return code in _ICON_CODE_SET
+
+
+class IconStore:
+    """Class to fetch weather icons once and serve them from memory or disk
+
+    PNG bytes are kept in memory and written to the icon directory, so an
+    icon is downloaded at most once per machine. Decoded PIL images and Tk
+    PhotoImages are created on first use and kept for the life of the store.
+    A store whose directory was seeded beforehand works fully offline.
+    """
+
+    def __init__(self, weather_fetcher: Optional[WeatherFetcher] = None, directory: Optional[str] = DEFAULT_ICON_DIR):
+        """Initialize the IconStore
+
+        Args:
+            weather_fetcher: Fetcher used to download missing icons; without
+                one, only icons already on disk are available
+            directory: Directory icons are persisted to (None keeps them in
+                memory only)
+        """
+        self._fetcher = weather_fetcher
+        self._directory = directory
+        self._png: Dict[str, bytes] = {}
+        self._images: Dict[str, "Image.Image"] = {}
+        self._photos: Dict[str, "ImageTk.PhotoImage"] = {}
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Optional[str]:
+        """Directory icons are persisted to, if any"""
+        return self._directory
+
+    def _path(self, code: str) -> Optional[str]:
+        if self._directory is None:
+            return None
+        return os.path.join(self._directory, f"{code}.png")
+
+    def get_bytes(self, code: str) -> bytes:
+        """Return the PNG bytes for an icon code
+
+        Args:
+            code: OpenWeatherMap icon code (e.g. "10d")
+
+        Returns:
+            PNG image bytes
+
+        Raises:
+            Exception: If the code is invalid or the icon is not stored and
+                could not be downloaded
+        """
+        png = self._png.get(code)
+        if png is not None:
+            return png
+
+        if not is_icon_code(code):
+            raise Exception(f"Unknown icon code '{code}'")
+
+        # Concurrent misses for the same code share one disk read or download
+        return self._single_flight.do(code, lambda: self._load(code))
+
+    def _load(self, code: str) -> bytes:
+        """Read an icon from disk, else download and persist it"""
+        png = self._read(code)
+        if png is None:
+            if self._fetcher is None:
+                raise Exception(f"Icon '{code}' is not stored and no fetcher is configured")
+            png = self._fetcher.get_icon(code)
+            self._write(code, png)
+
+        with self._lock:
+            self._png[code] = png
+        return png
+
+    def _read(self, code: str) -> Optional[bytes]:
+        path = self._path(code)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read icon {path}: {str(e)}")
+            return None
+
+    def _write(self, code: str, png: bytes) -> None:
+        """Persist an icon atomically, so readers never see a partial file"""
+        path = self._path(code)
+        if path is None:
+            return
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not store icon {path}: {str(e)}")
+
+    def get_image(self, code: str) -> "Image.Image":
+        """Return the decoded PIL image for an icon code, decoding it only once
+
+        Safe to call from worker threads.
+        """
+        image = self._images.get(code)
+        if image is not None:
+            return image
+
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(self.get_bytes(code)))
+        image.load()
+        with self._lock:
+            return self._images.setdefault(code, image)
+
+    def get_photo_image(self, code: str) -> "ImageTk.PhotoImage":
+        """Return a Tk PhotoImage for an icon code, creating it only once
+
+        Must be called from the Tk main thread after the root window exists.
+        Call get_image() from a worker thread first to keep the download and
+        decoding off the UI thread.
+        """
+        photo = self._photos.get(code)
+        if photo is None:
+            from PIL import ImageTk
+
+            photo = self._photos[code] = ImageTk.PhotoImage(self.get_image(code))
+        return photo
+
+    def seed(self, codes: Iterable[str] = ICON_CODES) -> Dict[str, str]:
+        """Download every listed icon that is not stored yet
+
+        Run this while online (or import a directory with import_directory())
+        to prepare an icon directory for offline use.
+
+        Args:
+            codes: Icon codes to make available
+
+        Returns:
+            Mapping of icon code to error message for icons that failed
+        """
+        failed = {}
+        for code in codes:
+            try:
+                self.get_bytes(code)
+            except Exception as e:
+                failed[code] = str(e)
+        return failed
+
+    def import_directory(self, source: str) -> List[str]:
+        """Copy <code>.png files from another directory into the store
+
+        Args:
+            source: Directory holding icon files named by code (e.g. 10d.png)
+
+        Returns:
+            Icon codes imported
+        """
+        imported = []
+        for name in sorted(os.listdir(source)):
+            code, extension = os.path.splitext(name)
+            if extension.lower() != ".png" or not is_icon_code(code):
+                continue
+            with open(os.path.join(source, name), "rb") as f:
+                png = f.read()
+            self._write(code, png)
+            with self._lock:
+                self._png[code] = png
+            imported.append(code)
+        return imported
+
+    def __len__(self) -> int:
+        """Return the number of icons held in memory"""
+        return len(self._png)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Seed an icon directory so the apps can show icons offline
+
+    Args:
+        argv: Command line arguments after "seed-icons"
+
+    Returns:
+        Process exit code (0 when every icon is available)
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py seed-icons",
+        description="Download (or import) every weather icon into the local icon store."
+    )
+    parser.add_argument("--dir", default=os.getenv("WEATHER_ICON_DIR", DEFAULT_ICON_DIR),
+                        help="Icon directory to fill (default: $WEATHER_ICON_DIR or data/icons)")
+    parser.add_argument("--from-dir", help="Import <code>.png files from this directory instead of downloading")
+    args = parser.parse_args(argv)
+
+    if args.from_dir:
+        imported = IconStore(None, args.dir).import_directory(args.from_dir)
+        print(f"Imported {len(imported)} icons into {args.dir}")
+        missing = [code for code in ICON_CODES if code not in imported and not os.path.exists(os.path.join(args.dir, f"{code}.png"))]
+        if missing:
+            print(f"Still missing: {', '.join(missing)}", file=sys.stderr)
+        return 1 if missing else 0
+
+    weather_fetcher = WeatherFetcher("", icon_url=os.getenv("OPENWEATHERMAP_ICON_URL", DEFAULT_ICON_URL))
+    try:
+        failed = IconStore(weather_fetcher, args.dir).seed()
+    finally:
+        weather_fetcher.close()
+
+    print(f"{len(ICON_CODES) - len(failed)} of {len(ICON_CODES)} icons available in {args.dir}")
+    for code, error in failed.items():
+        print(f"  {code}: {error}", file=sys.stderr)
+    return 1 if failed else 0
@@ -0,0 +1,65 @@
+"""
+JSON Provider Module
+This module contains the FastJSONProvider class, a Flask JSON provider that encodes
+with orjson when it is installed and falls back to a tuned stdlib encoder otherwise.
+"""
+
+import json
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Class to serialize Flask JSON responses with as little work as possible
+
+    Responses are always compact and keys are kept in insertion order (no
+    sorting), which is the cheap path for both encoders. Non-ASCII text is
+    sent as UTF-8 rather than escaped, so city names stay short on the wire.
+    Objects neither encoder understands go through Flask's usual default()
+    (dates, decimals, dataclasses, ...).
+    """
+
+    sort_keys = False
+    ensure_ascii = False
+
+    @property
+    def backend(self) -> str:
+        """Name of the encoder in use, orjson or json"""
+        return "orjson" if orjson is not None else "json"
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON bytes"""
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            obj, default=self.default, ensure_ascii=False, separators=(",", ":"), sort_keys=False
+        ).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Encode obj as a JSON string; extra json.dumps options use the stdlib encoder"""
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """Decode JSON text or bytes"""
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response (used by jsonify) without an intermediate str
+
+        Pretty-printing in debug mode is kept, as with Flask's default provider.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
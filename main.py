@@ -3,21 +3,52 @@
 Weather App - Entry Point
 A Python-based Weather App with beautiful customTkinter UI and proper OOP architecture
 that displays real-time weather information.
+
+Run without arguments to start the desktop app, or headless as
+    python main.py refresh --cities-file cities.txt --workers 32
+to refresh a list of cities (see refresh_cli.py), or as
+    python main.py seed-icons
+to download every weather icon for offline use (see icon_store.py), or as
+    python main.py build-assets
+to write hashed, precompressed CSS/JS for the web app (see static_assets.py).
 """
 
 import os
 import sys
-from weather_app import WeatherApp
 
 if __name__ == "__main__":
     # Get API key from environment variable
     api_key = os.getenv("OPENWEATHERMAP_API_KEY", "")
     
+    # Headless bulk refresh; doesn't need (or import) the UI toolkit
+    if len(sys.argv) > 1 and sys.argv[1] == "refresh":
+        if not api_key:
+            print("Error: OPENWEATHERMAP_API_KEY is not set.", file=sys.stderr)
+            sys.exit(2)
+        from refresh_cli import main as refresh_main
+        sys.exit(refresh_main(sys.argv[2:], api_key))
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "seed-icons":
+        from icon_store import main as seed_icons_main
+        sys.exit(seed_icons_main(sys.argv[2:]))
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "build-assets":
+        from static_assets import main as build_assets_main
+        sys.exit(build_assets_main(sys.argv[2:]))
+    
+    from weather_app import WeatherApp
+    
     if not api_key:
         print("Warning: OPENWEATHERMAP_API_KEY is not set.")
         print("Please set the environment variable or the app will not function correctly.")
         print("You can get a free API key from https://openweathermap.org/api")
     
     # Start the Weather App
-    app = WeatherApp(api_key)
+    app = WeatherApp(
+        api_key,
+        debug=os.getenv("WEATHER_APP_DEBUG", "") == "1",
+        workers=int(os.getenv("WEATHER_APP_WORKERS", "4")),
+        watch_list=[city.strip() for city in os.getenv("WEATHER_WATCH_LIST", "").split(",") if city.strip()],
+        watch_interval=float(os.getenv("WEATHER_WATCH_INTERVAL", "300"))
+    )
     app.run()
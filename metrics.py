@@ -0,0 +1,366 @@
+"""
+Metrics Module
+This module contains lightweight counters, gauges and histograms rendered in the
+Prometheus text exposition format, plus the FetcherMetrics hooks used by WeatherFetcher.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from circuit_breaker import STATE_VALUES
+
+# Default latency buckets in seconds, from sub-millisecond cache hits to slow upstream calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Finer buckets for in-process work such as parsing and serialization
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render {name="value",...}, or nothing when there are no labels"""
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects"""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base class for a named metric with a fixed set of label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Class to count events, optionally split by label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        """Add amount to the counter for the given label values"""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        """Return the current count for the given label values"""
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Class to track a value that goes up and down"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Class to record a distribution of observations in fixed buckets
+
+    Observing is a bisect and three additions under a lock, cheap enough to
+    leave on for every request.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._bounds = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """Record one observation for the given label values"""
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self._bounds) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, *labelvalues: str) -> "_Timer":
+        """Return a context manager that observes its elapsed time in seconds"""
+        return _Timer(self, labelvalues)
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, ([*s[0]], s[1], s[2])) for labels, s in self._series.items())
+
+        lines = self._header()
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self._bounds + (float("inf"),), counts):
+                cumulative += bucket
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a histogram"""
+
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, *self._labels)
+
+
+class _CallbackMetric(_Metric):
+    """Metric whose samples are read from a function at scrape time"""
+
+    def __init__(self, name: str, documentation: str, kind: str, fn: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.kind = kind
+        self._fn = fn
+
+    def render(self) -> List[str]:
+        return self._header() + [f"{self.name} {_format_value(float(self._fn()))}"]
+
+
+class MetricsRegistry:
+    """Class to hold metrics and render them for a /metrics endpoint"""
+
+    def __init__(self):
+        """Initialize the MetricsRegistry"""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric '{metric.name}' is already registered as a {existing.kind}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register (or return the existing) counter called name"""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register (or return the existing) gauge called name"""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Register (or return the existing) histogram called name"""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name: str, documentation: str, fn: Callable[[], float], kind: str = "gauge") -> None:
+        """Register a single-sample metric read from fn() on every scrape
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            fn: Function returning the current value
+            kind: "gauge" or "counter"
+        """
+        self._register(_CallbackMetric(name, documentation, kind, fn))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # One broken callback must not take the whole scrape down
+                continue
+        return "\n".join(lines) + "\n"
+
+
+# Content type of MetricsRegistry.render() output
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class FetcherMetrics:
+    """Class to record WeatherFetcher upstream calls, parse time and errors
+
+    Error categories match weather_fetcher.classify_error(): not_found,
+    circuit_open, quota_exhausted, rate_limited, server_error, api_error,
+    timeout, network, config and other.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        """Initialize the FetcherMetrics
+
+        Args:
+            registry: Registry the metrics are added to
+        """
+        self.upstream_latency = registry.histogram(
+            "weather_upstream_request_seconds",
+            "Latency of upstream OpenWeatherMap requests, including retries",
+            ("endpoint",)
+        )
+        self.upstream_responses = registry.counter(
+            "weather_upstream_responses_total",
+            "Upstream responses by endpoint and HTTP status",
+            ("endpoint", "status")
+        )
+        self.upstream_in_flight = registry.gauge(
+            "weather_upstream_in_flight",
+            "Upstream requests currently in flight"
+        )
+        self.parse_seconds = registry.histogram(
+            "weather_parse_seconds",
+            "Time spent decoding and parsing upstream responses",
+            ("endpoint",),
+            FAST_BUCKETS
+        )
+        self.errors = registry.counter(
+            "weather_fetch_errors_total",
+            "Failed upstream lookups by error category",
+            ("category",)
+        )
+        self.stale_served = registry.counter(
+            "weather_stale_served_total",
+            "Lookups answered with the last good reading because upstream was unavailable"
+        )
+        self.circuit_state = registry.gauge(
+            "weather_upstream_circuit_state",
+            "Upstream circuit breaker state (0 closed, 1 half-open, 2 open)"
+        )
+        self.circuit_transitions = registry.counter(
+            "weather_upstream_circuit_transitions_total",
+            "Upstream circuit breaker state changes by new state",
+            ("state",)
+        )
+
+    def upstream_started(self) -> float:
+        """Mark an upstream request as in flight and return its start time"""
+        self.upstream_in_flight.inc()
+        return time.perf_counter()
+
+    def upstream_finished(self, endpoint: str, started: float, status: Optional[int]) -> None:
+        """Record an upstream request's latency and status (None if it raised)"""
+        self.upstream_in_flight.dec()
+        self.upstream_latency.observe(time.perf_counter() - started, endpoint)
+        self.upstream_responses.inc(endpoint, str(status) if status is not None else "error")
+
+    def error(self, category: str) -> None:
+        """Count a failed lookup"""
+        self.errors.inc(category)
+
+    def circuit_changed(self, old_state: str, new_state: str) -> None:
+        """Record a circuit breaker state change; pass as CircuitBreaker(on_state_change=...)"""
+        self.circuit_state.set(STATE_VALUES.get(new_state, -1))
+        self.circuit_transitions.inc(new_state)
+
+
+def register_cache_metrics(registry: MetricsRegistry, prefix: str, stats: Callable[[], Dict[str, int]]) -> None:
+    """Expose a WeatherCache's stats() as counters, gauges and a hit ratio
+
+    Args:
+        registry: Registry the metrics are added to
+        prefix: Metric name prefix, e.g. "weather_cache"
+        stats: Function returning the cache's stats() dict
+    """
+    registry.callback(f"{prefix}_hits_total", "Cache lookups served from the cache", lambda: stats()["hits"], "counter")
+    registry.callback(f"{prefix}_misses_total", "Cache lookups that missed", lambda: stats()["misses"], "counter")
+    registry.callback(f"{prefix}_stale_hits_total", "Expired entries served while a refresh was in flight",
+                      lambda: stats()["stale_hits"], "counter")
+    registry.callback(f"{prefix}_evictions_total", "Entries evicted to stay within max_entries",
+                      lambda: stats()["evictions"], "counter")
+    registry.callback(f"{prefix}_entries", "Entries currently cached", lambda: stats()["size"])
+
+    def hit_ratio() -> float:
+        current = stats()
+        lookups = current["hits"] + current["misses"]
+        return current["hits"] / lookups if lookups else 0.0
+
+    registry.callback(f"{prefix}_hit_ratio", "Fraction of cache lookups served from the cache since start", hit_ratio)
+
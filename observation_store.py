@@ -0,0 +1,426 @@
+"""
+Observation Store Module
+This module contains the ObservationStore class, an append-only on-disk log of every
+weather observation fetched, kept as fixed-width columns per day and read back through
+memory maps for time-range queries.
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from weather_data import WeatherData
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# One file per column per day segment; string columns hold ids into a dictionary
+COLUMNS = {
+    "observed_at": np.dtype("<i8"),
+    "city": np.dtype("<u4"),
+    "country": np.dtype("<u2"),
+    "description": np.dtype("<u2"),
+    "icon": np.dtype("<u2"),
+    "temperature": np.dtype("<i2"),
+    "feels_like": np.dtype("<i2"),
+    "humidity": np.dtype("u1"),
+    "pressure": np.dtype("<i2"),
+    "wind_speed": np.dtype("<f4"),
+}
+STRING_COLUMNS = ("city", "country", "description", "icon")
+
+DICTIONARY_DIR = "dictionaries"
+LOCK_NAME = ".lock"
+SEGMENT_FORMAT = "%Y-%m-%d"
+
+
+class ObservationStore:
+    """Class to record weather observations and query them by city and time range
+
+    Observations are buffered in memory and appended in batches, by a
+    background thread, to a segment directory per UTC day of observation, with one file of
+    fixed-width values per column (29 bytes per row in all). City, country,
+    description and icon are interned: each distinct string is written once
+    to an append-only dictionary file and rows store its id.
+
+    Queries memory-map only the segments in the requested range and only
+    the pages they touch: the city and time columns are scanned, and the
+    other columns are read for matching rows only. So a day with millions
+    of rows is never loaded into memory as a whole.
+
+    Writes from several processes (e.g. gunicorn workers) sharing a
+    directory are serialized with an exclusive lock on a lock file.
+    """
+
+    def __init__(self, path: str, flush_rows: int = 1000, flush_interval: float = 5.0, retention_days: int = 0):
+        """Initialize the ObservationStore
+
+        Args:
+            path: Directory holding the store (created if missing)
+            flush_rows: Buffered observations that wake the writer early
+            flush_interval: Seconds between background writes
+            retention_days: Days of segments to keep (0 keeps everything)
+        """
+        self._path = path
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval
+        self._retention_days = retention_days
+        os.makedirs(os.path.join(path, DICTIONARY_DIR), exist_ok=True)
+
+        self._buffer: List[WeatherData] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_pruned: Optional[str] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Per string column: strings by id, id by string, ids by casefolded
+        # string, and bytes of the dictionary file consumed
+        self._dictionary_lock = threading.Lock()
+        self._strings: Dict[str, List[str]] = {name: [] for name in STRING_COLUMNS}
+        self._ids: Dict[str, Dict[str, int]] = {name: {} for name in STRING_COLUMNS}
+        self._folded: Dict[str, Dict[str, List[int]]] = {name: {} for name in STRING_COLUMNS}
+        self._dictionary_offsets: Dict[str, int] = {name: 0 for name in STRING_COLUMNS}
+
+        self.recorded = 0
+        self.written = 0
+
+    @property
+    def path(self) -> str:
+        """Directory holding the store"""
+        return self._path
+
+    def record(self, weather_data: WeatherData) -> None:
+        """Buffer an observation for the background writer
+
+        Never touches the disk, so it is cheap enough to call on request
+        threads and the event loop. Stale readings are skipped, since they
+        repeat an observation that was already recorded.
+        """
+        if weather_data.stale:
+            return
+        with self._buffer_lock:
+            self._buffer.append(weather_data)
+            self.recorded += 1
+            full = len(self._buffer) >= self._flush_rows
+            # Started on first use, so it runs in the process that records
+            # (e.g. each gunicorn worker rather than the preloading master)
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="observation-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all buffered observations
+
+        If the write fails, the observations that did not reach disk go back
+        to the front of the buffer for the next flush, and the error is raised.
+
+        Returns:
+            Number of observations written
+        """
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+
+        written: List[int] = []
+        try:
+            with self._write_lock, self._locked():
+                with self._dictionary_lock:
+                    self._load_dictionaries()
+                ids = {
+                    name: self._intern(name, [self._clean(str(getattr(row, name))) for row in rows])
+                    for name in STRING_COLUMNS
+                }
+
+                segments: Dict[str, List[int]] = {}
+                for index, weather_data in enumerate(rows):
+                    segments.setdefault(self._segment_name(weather_data.observed_at), []).append(index)
+                for segment, indexes in segments.items():
+                    self._append_segment(
+                        segment,
+                        [rows[index] for index in indexes],
+                        {name: values[indexes] for name, values in ids.items()}
+                    )
+                    written.extend(indexes)
+
+                self._prune()
+        except Exception:
+            # A segment cut short is lined up again by the next append, so
+            # retrying its rows does not store them twice
+            done = set(written)
+            with self._buffer_lock:
+                self._buffer[:0] = [row for index, row in enumerate(rows) if index not in done]
+            raise
+        finally:
+            self.written += len(written)
+        return len(rows)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the background writer and write any buffered observations"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def history(self, city: str, start: float, end: float) -> Dict[str, np.ndarray]:
+        """Return the observations of a city in a time range, oldest first
+
+        Args:
+            city: City name, optionally as "City,CC" to pick one country;
+                matched case-insensitively
+            start: Unix timestamp of the first observation to include
+            end: Unix timestamp to stop before (exclusive)
+
+        Returns:
+            Array per column: observed_at (int64 Unix timestamps), country,
+            description and icon (str), and temperature, feels_like,
+            humidity, pressure and wind_speed in their stored types. All are
+            empty if nothing matches.
+        """
+        self.flush()
+        with self._dictionary_lock:
+            self._load_dictionaries()
+        name, _, country = city.partition(",")
+        city_ids = self._matching_ids("city", name.strip())
+        country_ids = self._matching_ids("country", country.strip()) if country.strip() else None
+
+        parts: Dict[str, List[np.ndarray]] = {column: [] for column in COLUMNS if column != "city"}
+        if city_ids.size and (country_ids is None or country_ids.size) and end > start:
+            first_day = int(start // 86400)
+            last_day = int(end // 86400)
+            for day in range(first_day, last_day + 1):
+                self._read_segment(self._segment_name(day * 86400), city_ids, country_ids, start, end, parts)
+
+        result = {
+            column: np.concatenate(chunks) if chunks else np.empty(0, dtype=COLUMNS[column])
+            for column, chunks in parts.items()
+        }
+        order = np.argsort(result["observed_at"], kind="stable")
+        result = {column: values[order] for column, values in result.items()}
+
+        # Rows can only reference dictionary entries written before them
+        with self._dictionary_lock:
+            self._load_dictionaries()
+            for column in STRING_COLUMNS:
+                if column in result:
+                    strings = np.asarray(self._strings[column] or [""], dtype=str)
+                    result[column] = strings[result[column]]
+        return result
+
+    def days(self) -> List[str]:
+        """Return the UTC days (YYYY-MM-DD) that have a segment, oldest first"""
+        return sorted(name for name in os.listdir(self._path) if self._is_segment(name))
+
+    def _run(self) -> None:
+        """Background loop writing the buffer every flush_interval, or sooner when it fills"""
+        while not self._stop.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Observation store write failed: {str(e)}")
+
+    def _read_segment(
+        self,
+        segment: str,
+        city_ids: np.ndarray,
+        country_ids: Optional[np.ndarray],
+        start: float,
+        end: float,
+        parts: Dict[str, List[np.ndarray]]
+    ) -> None:
+        """Append the matching rows of one day segment to parts"""
+        directory = os.path.join(self._path, segment)
+        rows = self._segment_rows(directory)
+        if rows == 0:
+            return
+
+        cities = self._column(directory, "city", rows)
+        matches = np.flatnonzero(cities == city_ids[0]) if city_ids.size == 1 else np.flatnonzero(np.isin(cities, city_ids))
+        if matches.size == 0:
+            return
+
+        observed_at = self._column(directory, "observed_at", rows)[matches]
+        keep = (observed_at >= start) & (observed_at < end)
+        if country_ids is not None:
+            keep &= np.isin(self._column(directory, "country", rows)[matches], country_ids)
+        matches = matches[keep]
+        if matches.size == 0:
+            return
+
+        parts["observed_at"].append(observed_at[keep])
+        for column in parts:
+            if column != "observed_at":
+                parts[column].append(np.array(self._column(directory, column, rows)[matches]))
+
+    @staticmethod
+    def _column(directory: str, column: str, rows: int) -> np.ndarray:
+        """Memory-map the first rows values of a column file"""
+        return np.memmap(os.path.join(directory, column), dtype=COLUMNS[column], mode="r", shape=(rows,))
+
+    @staticmethod
+    def _segment_rows(directory: str) -> int:
+        """Return the rows present in every column of a segment
+
+        A write cut short (e.g. by a crash) can leave some columns longer
+        than others; the extra values are ignored.
+        """
+        rows = None
+        for column, dtype in COLUMNS.items():
+            try:
+                count = os.path.getsize(os.path.join(directory, column)) // dtype.itemsize
+            except OSError:
+                return 0
+            rows = count if rows is None else min(rows, count)
+        return rows or 0
+
+    def _append_segment(self, segment: str, rows: List[WeatherData], ids: Dict[str, np.ndarray]) -> None:
+        """Append rows to a day segment, with the lock file held"""
+        directory = os.path.join(self._path, segment)
+        os.makedirs(directory, exist_ok=True)
+
+        # Line the columns up again if an earlier write was cut short
+        aligned = self._segment_rows(directory)
+        for column, dtype in COLUMNS.items():
+            path = os.path.join(directory, column)
+            if os.path.exists(path) and os.path.getsize(path) != aligned * dtype.itemsize:
+                os.truncate(path, aligned * dtype.itemsize)
+
+        count = len(rows)
+        values = {
+            "observed_at": np.fromiter((row.observed_at for row in rows), dtype=np.int64, count=count),
+            "temperature": np.fromiter((row.temperature for row in rows), dtype=np.int64, count=count),
+            "feels_like": np.fromiter((row.feels_like for row in rows), dtype=np.int64, count=count),
+            "humidity": np.fromiter((row.humidity for row in rows), dtype=np.int64, count=count),
+            "pressure": np.fromiter((row.pressure for row in rows), dtype=np.int64, count=count),
+            "wind_speed": np.fromiter((row.wind_speed for row in rows), dtype=np.float64, count=count),
+            **ids,
+        }
+        for column, dtype in COLUMNS.items():
+            info = np.iinfo(dtype) if dtype.kind in "iu" else None
+            data = values[column]
+            if info is not None:
+                data = np.clip(data, info.min, info.max)
+            with open(os.path.join(directory, column), "ab") as f:
+                f.write(data.astype(dtype).tobytes())
+
+    def _intern(self, column: str, strings: List[str]) -> np.ndarray:
+        """Return dictionary ids for strings, appending new ones (lock file held)"""
+        ids = self._ids[column]
+        new = [text for text in dict.fromkeys(strings) if text not in ids]
+        if new:
+            limit = np.iinfo(COLUMNS[column]).max
+            if len(self._strings[column]) + len(new) > limit + 1:
+                raise Exception(f"Observation store dictionary '{column}' is full ({limit + 1} entries)")
+            # One write per batch, so readers never see half a line
+            encoded = "".join(f"{text}\n" for text in new).encode("utf-8")
+            with open(self._dictionary_path(column), "ab") as f:
+                f.write(encoded)
+            with self._dictionary_lock:
+                for text in new:
+                    self._add_string(column, text)
+                self._dictionary_offsets[column] += len(encoded)
+        return np.fromiter((ids[text] for text in strings), dtype=np.int64, count=len(strings))
+
+    def _load_dictionaries(self) -> None:
+        """Read dictionary entries appended (by any process) since the last call"""
+        for column in STRING_COLUMNS:
+            path = self._dictionary_path(column)
+            try:
+                with open(path, "rb") as f:
+                    f.seek(self._dictionary_offsets[column])
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            complete = data.rfind(b"\n") + 1
+            if complete == 0:
+                continue
+            for text in data[:complete].decode("utf-8").split("\n")[:-1]:
+                self._add_string(column, text)
+            self._dictionary_offsets[column] += complete
+
+    def _add_string(self, column: str, text: str) -> None:
+        """Give the next id of a column's dictionary to text (dictionary lock held)"""
+        index = len(self._strings[column])
+        self._strings[column].append(text)
+        self._ids[column].setdefault(text, index)
+        self._folded[column].setdefault(text.casefold(), []).append(index)
+
+    def _matching_ids(self, column: str, text: str) -> np.ndarray:
+        """Return the ids of dictionary entries equal to text, ignoring case"""
+        with self._dictionary_lock:
+            matches = list(self._folded[column].get(text.casefold(), ()))
+        return np.asarray(matches, dtype=COLUMNS[column])
+
+    def _prune(self) -> None:
+        """Remove segments older than retention_days, at most once per day"""
+        if self._retention_days <= 0:
+            return
+        today = self._segment_name(time.time())
+        if self._last_pruned == today:
+            return
+        self._last_pruned = today
+        cutoff = self._segment_name(time.time() - self._retention_days * 86400)
+        for segment in self.days():
+            if segment < cutoff:
+                shutil.rmtree(os.path.join(self._path, segment), ignore_errors=True)
+                logger.info(f"Observation store dropped segment {segment}")
+
+    def _dictionary_path(self, column: str) -> str:
+        return os.path.join(self._path, DICTIONARY_DIR, f"{column}.txt")
+
+    def _locked(self) -> "_FileLock":
+        return _FileLock(os.path.join(self._path, LOCK_NAME))
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        return text.replace("\n", " ").replace("\r", " ")
+
+    @staticmethod
+    def _segment_name(timestamp: float) -> str:
+        return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime(SEGMENT_FORMAT)
+
+    @staticmethod
+    def _is_segment(name: str) -> bool:
+        try:
+            datetime.datetime.strptime(name, SEGMENT_FORMAT)
+        except ValueError:
+            return False
+        return True
+
+
+class _FileLock:
+    """Exclusive lock on a file, held across processes"""
+
+    __slots__ = ("_path", "_fd")
+
+    def __init__(self, path: str):
+        self._path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "_FileLock":
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # also releases the flock
+            self._fd = None
@@ -0,0 +1,137 @@
+"""
+Persistent Cache Module
+This module contains the PersistentWeatherCache class, an on-disk SQLite cache tier
+that survives restarts and can be shared by several worker processes on one host.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from weather_data import WeatherData
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentWeatherCache:
+    """Class to persist WeatherData lookups in SQLite with TTL-based expiry
+
+    Entries are read one key at a time on lookup, never loaded in bulk. The
+    database runs in WAL mode with a busy timeout, so several processes can
+    read and write it concurrently.
+    """
+
+    def __init__(self, path: str, ttl: float = 600.0, compact_interval: float = 300.0):
+        """Initialize the PersistentWeatherCache
+
+        Args:
+            path: Path to the SQLite database file (created if missing)
+            ttl: Seconds a stored entry stays valid
+            compact_interval: Minimum seconds between purges of expired rows
+        """
+        self._path = path
+        self._ttl = ttl
+        self._compact_interval = compact_interval
+        self._local = threading.local()
+        self._last_compact = time.time()
+        self._compact_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS weather ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL"
+                ")"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS weather_expires_at ON weather (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[WeatherData, float]]:
+        """Look up an unexpired entry
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (WeatherData, seconds until expiry), or None
+        """
+        now = time.time()
+        try:
+            row = self._connect().execute(
+                "SELECT payload, expires_at FROM weather WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache read failed: {str(e)}")
+            return None
+
+        if row is None:
+            return None
+
+        payload, expires_at = row
+        try:
+            weather_data = WeatherData.from_dict(json.loads(payload))
+        except (TypeError, ValueError):
+            # Written by an incompatible version; treat as a miss
+            return None
+        return weather_data, expires_at - now
+
+    def set(self, key: str, weather_data: WeatherData) -> None:
+        """Store an entry, replacing any previous one for the key
+
+        Args:
+            key: Cache key
+            weather_data: WeatherData to persist
+        """
+        now = time.time()
+        payload = weather_data.to_json_bytes().decode("utf-8")
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO weather (key, payload, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now + self._ttl)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache write failed: {str(e)}")
+            return
+
+        if now - self._last_compact >= self._compact_interval:
+            self.compact()
+
+    def compact(self) -> int:
+        """Delete expired entries and checkpoint the write-ahead log
+
+        Returns:
+            Number of entries removed
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_compact = time.time()
+            conn = self._connect()
+            removed = conn.execute("DELETE FROM weather WHERE expires_at <= ?", (self._last_compact,)).rowcount
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            if removed:
+                logger.info(f"Persistent cache compaction removed {removed} expired entries")
+            return removed
+        except sqlite3.Error as e:
+            logger.warning(f"Persistent cache compaction failed: {str(e)}")
+            return 0
+        finally:
+            self._compact_lock.release()
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM weather").fetchone()[0]
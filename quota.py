@@ -0,0 +1,308 @@
+"""
+Quota Module
+This module contains the QuotaGovernor class that meters upstream API calls with a
+token bucket per API key, rotates across a pool of keys and can share its counters
+with the other worker processes on a host through a state file.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the state file is still used, just not locked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaGovernor:
+    """Class to keep upstream calls within each API key's per-minute and per-day limits
+
+    Every key has a token bucket holding up to one minute of calls, plus a
+    counter of calls made on the current UTC day. acquire() picks the key
+    with the most budget left, so load is spread across the pool. When no
+    key has a token, callers wait up to max_wait seconds for one and are
+    then shed with an error, rather than being sent upstream to collect a
+    429.
+
+    With a state_path, the buckets live in a small JSON file updated under
+    an exclusive lock. That way every worker process on the host (e.g. each
+    gunicorn worker) draws from the same budget. Keys are stored hashed,
+    never in clear text.
+    """
+
+    def __init__(
+        self,
+        api_keys: Iterable[str],
+        calls_per_minute: float = 60.0,
+        calls_per_day: int = 0,
+        state_path: Optional[str] = None,
+        max_wait: float = 2.0
+    ):
+        """Initialize the QuotaGovernor
+
+        Args:
+            api_keys: API keys to rotate across
+            calls_per_minute: Calls allowed per key per minute
+            calls_per_day: Calls allowed per key per UTC day (0 for no limit)
+            state_path: File shared by all processes using the same keys
+                (None keeps the counters in this process only)
+            max_wait: Seconds a caller may wait for a token before it is shed
+        """
+        self._keys = list(dict.fromkeys(key for key in api_keys if key))
+        if not self._keys:
+            raise Exception("QuotaGovernor needs at least one API key")
+        self._ids = {key: hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] for key in self._keys}
+        self._capacity = float(calls_per_minute)
+        self._refill_rate = calls_per_minute / 60.0
+        self._calls_per_day = calls_per_day
+        self._state_path = state_path
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        # key id -> {"tokens", "updated", "day", "day_calls", "blocked_until"}
+        self._state: Dict[str, Dict] = {}
+
+        self.granted = 0
+        self.waits = 0
+        self.shed = 0
+
+    @property
+    def keys(self) -> List[str]:
+        """API keys in the pool"""
+        return list(self._keys)
+
+    def acquire(self) -> str:
+        """Take one call from the budget, waiting up to max_wait for a token
+
+        Returns:
+            API key to make the call with
+
+        Raises:
+            Exception: If no key has budget left within max_wait
+        """
+        deadline = time.monotonic() + self._max_wait
+        waited = False
+        while True:
+            key, retry_in = self._try_acquire(waited)
+            if key is not None:
+                return key
+            self._shed_if_too_late(deadline, retry_in)
+            waited = True
+            time.sleep(max(retry_in, 0.005))
+
+    async def acquire_async(self) -> str:
+        """Take one call from the budget like acquire(), without holding a thread
+
+        A token that is available is taken straight away; waiting for one
+        sleeps on the event loop. Only with a state file are the (short)
+        file reads and writes moved to a worker thread.
+
+        Returns:
+            API key to make the call with
+
+        Raises:
+            Exception: If no key has budget left within max_wait
+        """
+        import asyncio
+
+        deadline = time.monotonic() + self._max_wait
+        waited = False
+        while True:
+            if self._state_path is None:
+                key, retry_in = self._try_acquire(waited)
+            else:
+                key, retry_in = await asyncio.to_thread(self._try_acquire, waited)
+            if key is not None:
+                return key
+            self._shed_if_too_late(deadline, retry_in)
+            waited = True
+            await asyncio.sleep(max(retry_in, 0.005))
+
+    def try_acquire(self) -> Tuple[Optional[str], float]:
+        """Take one call from the budget if a token is available now, never waiting
+
+        Returns:
+            The API key to use and 0, or None and the seconds until a token
+            is expected
+        """
+        return self._try_acquire()
+
+    def refund(self, key: str) -> None:
+        """Give back a call that was acquired but never sent upstream"""
+        def give_back(entry: Dict, now: float) -> None:
+            entry["tokens"] = min(self._capacity, entry["tokens"] + 1.0)
+            entry["day_calls"] = max(0, entry["day_calls"] - 1)
+
+        self._update(key, give_back)
+
+    def throttled(self, key: str, retry_after: float) -> None:
+        """Stop using a key for retry_after seconds after upstream answered 429
+
+        A 429 with no wait (Retry-After: 0) leaves the key's tokens alone; only
+        a real block window drains them.
+        """
+        def block(entry: Dict, now: float) -> None:
+            entry["tokens"] = 0.0
+            entry["blocked_until"] = max(entry["blocked_until"], now + retry_after)
+
+        if retry_after > 0:
+            self._update(key, block)
+        logger.warning(f"API key {self._ids[key][:8]} throttled upstream; resting it for {retry_after:g}s")
+
+    def available(self) -> float:
+        """Return the whole tokens left across all keys right now"""
+        total = 0.0
+        with self._locked_state() as state:
+            now = time.time()
+            for key in self._keys:
+                entry = self._refill(state, key, now)
+                if entry["blocked_until"] <= now and not self._over_daily_limit(entry):
+                    total += int(entry["tokens"])
+        return total
+
+    def _try_acquire(self, waited: bool = False) -> Tuple[Optional[str], float]:
+        """Take a token from the key with the most budget left
+
+        Args:
+            waited: Whether the caller already waited for this token
+
+        Returns:
+            The key (or None) and, if None, seconds until a token is expected
+        """
+        with self._locked_state() as state:
+            now = time.time()
+            best = None
+            retry_in = float("inf")
+            for key in self._keys:
+                entry = self._refill(state, key, now)
+                if self._over_daily_limit(entry):
+                    retry_in = min(retry_in, self._seconds_to_next_day(now))
+                    continue
+                if entry["blocked_until"] > now:
+                    retry_in = min(retry_in, entry["blocked_until"] - now)
+                    continue
+                if entry["tokens"] >= 1.0:
+                    if best is None or entry["tokens"] > state[self._ids[best]]["tokens"]:
+                        best = key
+                elif self._refill_rate > 0:
+                    retry_in = min(retry_in, (1.0 - entry["tokens"]) / self._refill_rate)
+
+            if best is None:
+                return None, retry_in
+
+            entry = state[self._ids[best]]
+            entry["tokens"] -= 1.0
+            entry["day_calls"] += 1
+            self.granted += 1
+            self.waits += waited
+            return best, 0.0
+
+    def _shed_if_too_late(self, deadline: float, retry_in: float) -> None:
+        """Refuse the call if the next token is expected after the caller's deadline"""
+        if retry_in > deadline - time.monotonic():
+            with self._lock:
+                self.shed += 1
+            raise Exception(f"Upstream quota exhausted: retry in {retry_in:.0f}s")
+
+    def _update(self, key: str, change) -> None:
+        """Apply change(entry, now) to a key's refilled state"""
+        if key not in self._ids:
+            return
+        with self._locked_state() as state:
+            now = time.time()
+            change(self._refill(state, key, now), now)
+
+    def _refill(self, state: Dict[str, Dict], key: str, now: float) -> Dict:
+        """Return a key's state entry with tokens refilled up to now"""
+        key_id = self._ids[key]
+        today = datetime.datetime.fromtimestamp(now, datetime.timezone.utc).strftime("%Y-%m-%d")
+        entry = state.get(key_id)
+        if entry is None:
+            entry = state[key_id] = {
+                "tokens": self._capacity, "updated": now, "day": today, "day_calls": 0, "blocked_until": 0.0
+            }
+        elapsed = max(0.0, now - entry["updated"])
+        entry["tokens"] = min(self._capacity, entry["tokens"] + elapsed * self._refill_rate)
+        entry["updated"] = now
+        if entry["day"] != today:
+            entry["day"] = today
+            entry["day_calls"] = 0
+        return entry
+
+    def _over_daily_limit(self, entry: Dict) -> bool:
+        return self._calls_per_day > 0 and entry["day_calls"] >= self._calls_per_day
+
+    @staticmethod
+    def _seconds_to_next_day(now: float) -> float:
+        return 86400.0 - now % 86400.0
+
+    def _locked_state(self) -> "_LockedState":
+        """Context manager yielding the state dict, shared through the file if configured"""
+        return _LockedState(self)
+
+
+class _LockedState:
+    """Holds the in-process lock and, with a state file, an exclusive file lock"""
+
+    __slots__ = ("_governor", "_fd")
+
+    def __init__(self, governor: QuotaGovernor):
+        self._governor = governor
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> Dict[str, Dict]:
+        governor = self._governor
+        governor._lock.acquire()
+        if governor._state_path is None:
+            return governor._state
+
+        try:
+            self._fd = os.open(governor._state_path, os.O_RDWR | os.O_CREAT, 0o600)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            raw = b""
+            while True:
+                chunk = os.read(self._fd, 65536)
+                if not chunk:
+                    break
+                raw += chunk
+            state = json.loads(raw) if raw else {}
+            if not isinstance(state, dict):
+                raise ValueError("not a JSON object")
+            governor._state = state
+        except ValueError as e:
+            # A corrupt or truncated file is replaced (on __exit__, still under
+            # the lock) by this process's last view, so sharing resumes
+            logger.warning(f"Quota state {governor._state_path} unreadable, resetting it: {str(e)}")
+        except OSError as e:
+            # A broken or unreadable file must not stop lookups; fall back to
+            # this process's own view until the file is usable again
+            logger.warning(f"Quota state {governor._state_path} unusable: {str(e)}")
+            self._close()
+        return governor._state
+
+    def __exit__(self, *exc_info) -> None:
+        governor = self._governor
+        try:
+            if self._fd is not None:
+                data = json.dumps(governor._state, separators=(",", ":")).encode("utf-8")
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.ftruncate(self._fd, 0)
+                os.write(self._fd, data)
+        except OSError as e:
+            logger.warning(f"Quota state {governor._state_path} not saved: {str(e)}")
+        finally:
+            self._close()
+            governor._lock.release()
+
+    def _close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)  # also releases the flock
+            self._fd = None
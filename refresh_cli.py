@@ -0,0 +1,289 @@
+"""
+Refresh CLI Module
+This module contains the headless bulk refresh command that drives a WeatherFetcher over
+a list of cities with a bounded thread pool, streaming each result as NDJSON or CSV and
+finishing with a throughput and latency summary.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO
+
+from city_index import CityIndex
+from persistent_cache import PersistentWeatherCache
+from weather_fetcher import DEFAULT_BASE_URL, DEFAULT_ICON_URL, WeatherFetcher, classify_error
+
+# Columns written in CSV mode, in order
+CSV_FIELDS = (
+    "city", "success", "latency_ms", "error_type", "error",
+    "name", "country", "temperature", "feels_like", "description",
+    "humidity", "pressure", "wind_speed", "icon", "observed_at"
+)
+
+
+class RefreshSummary:
+    """Class to collect per-city latencies and errors for the final report"""
+
+    def __init__(self):
+        """Initialize the RefreshSummary"""
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+        self.succeeded = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, latency_ms: float, error_type: Optional[str]) -> None:
+        """Record one completed city"""
+        self.latencies.append(latency_ms)
+        if error_type is None:
+            self.succeeded += 1
+        else:
+            self.errors[error_type] += 1
+
+    def finish(self) -> None:
+        """Mark the run as complete"""
+        self.finished = time.perf_counter()
+
+    @staticmethod
+    def percentile(values: List[float], pct: float) -> float:
+        """Return the nearest-rank percentile of already sorted values"""
+        if not values:
+            return 0.0
+        rank = max(1, int(round(pct / 100.0 * len(values))))
+        return values[min(rank, len(values)) - 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary as a plain dict"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        latencies = sorted(self.latencies)
+        total = len(latencies)
+        return {
+            "total": total,
+            "succeeded": self.succeeded,
+            "failed": total - self.succeeded,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": {
+                "p50": round(self.percentile(latencies, 50), 1),
+                "p95": round(self.percentile(latencies, 95), 1),
+                "p99": round(self.percentile(latencies, 99), 1),
+                "max": round(latencies[-1], 1) if latencies else 0.0
+            },
+            "errors_by_type": dict(self.errors.most_common())
+        }
+
+    def __str__(self) -> str:
+        """Return a human readable report"""
+        summary = self.to_dict()
+        latency = summary["latency_ms"]
+        lines = [
+            f"Refreshed {summary['total']} cities in {summary['elapsed_s']:.2f}s "
+            f"({summary['throughput_per_s']:.1f}/s): {summary['succeeded']} ok, {summary['failed']} failed",
+            f"Latency ms: p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  "
+            f"p99 {latency['p99']:.1f}  max {latency['max']:.1f}"
+        ]
+        for error_type, count in summary["errors_by_type"].items():
+            lines.append(f"  {error_type}: {count}")
+        return "\n".join(lines)
+
+
+class ResultWriter:
+    """Class to write one result row per city as NDJSON or CSV"""
+
+    def __init__(self, stream: TextIO, output_format: str = "ndjson"):
+        """Initialize the ResultWriter
+
+        Args:
+            stream: Text stream results are written to
+            output_format: "ndjson" or "csv"
+        """
+        self._stream = stream
+        self._format = output_format
+        self._lock = threading.Lock()
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Write a row and flush it, so consumers see results as they complete"""
+        with self._lock:
+            if self._csv is not None:
+                self._csv.writerow(row)
+            else:
+                self._stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._stream.flush()
+
+
+def read_cities(lines: Iterable[str]) -> Iterator[str]:
+    """Yield city names from lines, skipping blanks and # comments"""
+    for line in lines:
+        city = line.strip()
+        if city and not city.startswith("#"):
+            yield city
+
+
+def refresh_city(weather_fetcher: WeatherFetcher, city: str) -> Dict[str, Any]:
+    """Fetch one city from upstream and return its result row"""
+    started = time.perf_counter()
+    try:
+        weather_data = weather_fetcher.refresh(city)
+    except Exception as e:
+        return {
+            "city": city,
+            "success": False,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error_type": classify_error(e),
+            "error": str(e)
+        }
+
+    row = weather_data.to_dict()
+    row["name"] = row.pop("city")
+    row.pop("last_updated", None)
+    return {
+        "city": city,
+        "success": True,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "error_type": None,
+        "error": None,
+        **row
+    }
+
+
+def run_refresh(
+    weather_fetcher: WeatherFetcher,
+    cities: Iterable[str],
+    writer: ResultWriter,
+    workers: int = 8
+) -> RefreshSummary:
+    """Refresh every city with at most workers requests in flight
+
+    Cities are submitted lazily, keeping only a couple of tasks per worker
+    queued, so arbitrarily long lists run in constant memory.
+
+    Args:
+        weather_fetcher: Fetcher used for the upstream calls
+        cities: City names to refresh
+        writer: Destination for the result rows
+        workers: Number of worker threads
+
+    Returns:
+        RefreshSummary for the run
+    """
+    summary = RefreshSummary()
+    max_pending = workers * 2
+    pending: Set[Future] = set()
+
+    def drain(return_when: str) -> None:
+        done, still_pending = wait(pending, return_when=return_when)
+        pending.intersection_update(still_pending)
+        for future in done:
+            row = future.result()
+            writer.write(row)
+            summary.record(row["latency_ms"], row["error_type"])
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="refresh") as executor:
+        for city in cities:
+            if len(pending) >= max_pending:
+                drain(FIRST_COMPLETED)
+            pending.add(executor.submit(refresh_city, weather_fetcher, city))
+        if pending:
+            drain(ALL_COMPLETED)
+
+    summary.finish()
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the refresh command"""
+    parser = argparse.ArgumentParser(
+        prog="main.py refresh",
+        description="Fetch current weather for a list of cities without starting the UI."
+    )
+    parser.add_argument("--cities-file", required=True,
+                        help="File with one city per line (\"City\" or \"City,CC\"); - reads stdin")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent upstream requests (default: 8)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="Output format (default: ndjson)")
+    parser.add_argument("--output", default="-", help="Output file; - writes to stdout (default)")
+    parser.add_argument("--summary-json", action="store_true", help="Print the final summary as JSON")
+    parser.add_argument("--cache-db", default=os.getenv("WEATHER_CACHE_DB"),
+                        help="SQLite cache to warm (default: $WEATHER_CACHE_DB)")
+    parser.add_argument("--history-dir", default=os.getenv("WEATHER_HISTORY_DIR"),
+                        help="Observation store to record every reading in (default: $WEATHER_HISTORY_DIR)")
+    parser.add_argument("--city-list", default=os.getenv(
+        "OPENWEATHERMAP_CITY_LIST",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cities.json")
+    ), help="City index used to resolve names to IDs (default: $OPENWEATHERMAP_CITY_LIST)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, api_key: str = "") -> int:
+    """Run the refresh command
+
+    Args:
+        argv: Command line arguments after "refresh"
+        api_key: OpenWeatherMap API key
+
+    Returns:
+        Process exit code (0 when every city succeeded, 1 otherwise)
+    """
+    args = build_parser().parse_args(argv)
+    if args.workers < 1:
+        print("--workers must be at least 1", file=sys.stderr)
+        return 2
+
+    city_index = None
+    if args.city_list:
+        try:
+            city_index = CityIndex.load(args.city_list)
+        except Exception as e:
+            print(f"Warning: could not load city list {args.city_list}: {str(e)}", file=sys.stderr)
+
+    observation_store = None
+    if args.history_dir:
+        # Imported here so refreshes without history don't load numpy
+        from observation_store import ObservationStore
+        observation_store = ObservationStore(args.history_dir)
+
+    cache_ttl = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+    weather_fetcher = WeatherFetcher(
+        api_key,
+        cache_ttl=cache_ttl,
+        # One keep-alive connection per worker thread
+        pool_size=args.workers,
+        connect_timeout=float(os.getenv("WEATHER_HTTP_CONNECT_TIMEOUT", "3.05")),
+        read_timeout=float(os.getenv("WEATHER_HTTP_READ_TIMEOUT", "10")),
+        max_retries=int(os.getenv("WEATHER_HTTP_MAX_RETRIES", "2")),
+        city_index=city_index,
+        persistent_cache=PersistentWeatherCache(args.cache_db, ttl=cache_ttl) if args.cache_db else None,
+        recorder=observation_store,
+        base_url=os.getenv("OPENWEATHERMAP_BASE_URL", DEFAULT_BASE_URL),
+        icon_url=os.getenv("OPENWEATHERMAP_ICON_URL", DEFAULT_ICON_URL)
+    )
+
+    source = sys.stdin if args.cities_file == "-" else open(args.cities_file, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        summary = run_refresh(weather_fetcher, read_cities(source), ResultWriter(output, args.format), args.workers)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+        weather_fetcher.close()
+        if observation_store is not None:
+            observation_store.close()
+
+    # Keep stdout for result rows; the report goes to stderr
+    if args.summary_json:
+        print(json.dumps(summary.to_dict()), file=sys.stderr)
+    else:
+        print(summary, file=sys.stderr)
+    return 0 if summary.succeeded == len(summary.latencies) else 1
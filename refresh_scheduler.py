@@ -0,0 +1,180 @@
+"""
+Refresh Scheduler Module
+This module contains the RefreshScheduler class that keeps the most requested cities
+refreshed in the background shortly before their cache entries expire.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from weather_fetcher import WeatherFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """Class to refresh hot cities ahead of cache expiry within an upstream call budget"""
+
+    def __init__(
+        self,
+        weather_fetcher: WeatherFetcher,
+        top_k: int = 20,
+        lead_time: float = 60.0,
+        calls_per_minute: int = 30,
+        interval: float = 5.0,
+        decay_half_life: float = 600.0
+    ):
+        """Initialize the RefreshScheduler
+
+        Args:
+            weather_fetcher: Fetcher whose cache is kept warm
+            top_k: Number of most requested cities to keep refreshed
+            lead_time: Refresh a city when its cache entry expires within this
+                many seconds
+            calls_per_minute: Maximum upstream calls the scheduler may make per
+                minute; refreshes beyond it wait for the next tick
+            interval: Seconds between scheduling passes
+            decay_half_life: Seconds after which a request counts half as much,
+                so hotness follows recent traffic
+        """
+        self._fetcher = weather_fetcher
+        self._top_k = top_k
+        self._lead_time = lead_time
+        self._interval = interval
+        self._decay_half_life = decay_half_life
+
+        # Token bucket holding at most one minute of budget
+        self._capacity = float(calls_per_minute)
+        self._tokens = float(calls_per_minute)
+        self._refill_rate = calls_per_minute / 60.0
+        self._last_refill = time.monotonic()
+
+        # cache key -> [score, city name as last requested]
+        self._counts: Dict[str, list] = {}
+        self._last_decay = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.refreshes = 0
+        self.failures = 0
+        self.skipped_for_budget = 0
+
+    def record(self, city: str) -> None:
+        """Record that a city was requested
+
+        Args:
+            city: City name as requested by the user
+        """
+        key = self._fetcher.cache_key(city)
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                self._counts[key] = [1.0, city]
+            else:
+                entry[0] += 1.0
+                entry[1] = city
+
+    def hot_cities(self) -> List[str]:
+        """Return the top_k most requested cities, hottest first"""
+        with self._lock:
+            top = heapq.nlargest(self._top_k, self._counts.values(), key=lambda entry: entry[0])
+            return [city for _, city in top]
+
+    def start(self) -> None:
+        """Start the background refresh thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weather-refresh", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Refresh-ahead scheduler started (top {self._top_k} cities, "
+            f"{self._lead_time:.0f}s lead, {self._capacity:.0f} calls/min)"
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self) -> int:
+        """Run one scheduling pass
+
+        Returns:
+            Number of cities refreshed
+        """
+        self._decay()
+
+        refreshed = 0
+        for city in self.hot_cities():
+            if self._stop.is_set():
+                break
+
+            remaining = self._fetcher.expires_in(city)
+            if remaining is not None and remaining > self._lead_time:
+                continue
+
+            if not self._take_token():
+                self.skipped_for_budget += 1
+                break
+
+            try:
+                self._fetcher.refresh(city)
+                self.refreshes += 1
+                refreshed += 1
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Background refresh failed for {city}: {str(e)}")
+        return refreshed
+
+    def stats(self) -> Dict[str, int]:
+        """Return refresh counters and the number of tracked cities"""
+        with self._lock:
+            tracked = len(self._counts)
+        return {
+            "tracked": tracked,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "skipped_for_budget": self.skipped_for_budget,
+        }
+
+    def _run(self) -> None:
+        """Background loop"""
+        while not self._stop.wait(self._interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Refresh-ahead pass failed: {str(e)}")
+
+    def _take_token(self) -> bool:
+        """Spend one upstream call from the budget if any is left"""
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._refill_rate)
+        self._last_refill = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def _decay(self) -> None:
+        """Age request counts and forget cities that have gone cold"""
+        now = time.monotonic()
+        elapsed = now - self._last_decay
+        if elapsed < self._interval:
+            return
+
+        factor = 0.5 ** (elapsed / self._decay_half_life)
+        with self._lock:
+            for key in list(self._counts):
+                entry = self._counts[key]
+                entry[0] *= factor
+                if entry[0] < 0.01:
+                    del self._counts[key]
+        self._last_decay = now
@@ -0,0 +1,81 @@
+"""
+Single Flight Module
+This module contains the SingleFlight class that coalesces concurrent calls for the
+same key into one execution.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """An in-flight call and the outcome shared with everyone waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Class to ensure only one call per key is in flight at a time
+
+    The first caller for a key runs the function; callers that arrive while it
+    is running block until it finishes and receive the same result, or have the
+    same exception raised.
+    """
+
+    def __init__(self):
+        """Initialize the SingleFlight group"""
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the call already in flight
+
+        Args:
+            key: Key identifying the work (e.g. a normalized city name)
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            The value returned by fn
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self, key: str) -> bool:
+        """Return True if a call for key is currently running"""
+        with self._lock:
+            return key in self._calls
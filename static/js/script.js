@@ -7,6 +7,8 @@ const errorScreen = document.getElementById('error-screen');
 const weatherCard = document.getElementById('weather-card');
 const errorMessage = document.getElementById('error-message');
 const tryAgainButton = document.getElementById('try-again-button');
+const citySuggestions = document.getElementById('city-suggestions');
+const liveToggle = document.getElementById('live-toggle');
 
 // Weather data elements
 const locationElement = document.getElementById('location');
@@ -22,6 +24,59 @@ const lastUpdatedElement = document.getElementById('last-updated');
 // Event Listeners
 weatherForm.addEventListener('submit', handleSearch);
 tryAgainButton.addEventListener('click', showWelcomeScreen);
+cityInput.addEventListener('input', handleSuggestInput);
+liveToggle.addEventListener('change', handleLiveToggle);
+
+// Live mode state
+let currentCity = '';
+let liveSource = null;
+
+// Autocomplete state
+const SUGGEST_DELAY_MS = 150;
+let suggestTimer = null;
+let lastSuggestPrefix = '';
+
+/**
+ * Debounce typing in the search box before asking for suggestions
+ */
+function handleSuggestInput() {
+    clearTimeout(suggestTimer);
+    suggestTimer = setTimeout(() => fetchSuggestions(cityInput.value.trim()), SUGGEST_DELAY_MS);
+}
+
+/**
+ * Fetch city name suggestions for a prefix and fill the datalist
+ * @param {string} prefix - What the user has typed so far
+ */
+function fetchSuggestions(prefix) {
+    if (prefix === lastSuggestPrefix) {
+        return;
+    }
+    lastSuggestPrefix = prefix;
+    
+    if (!prefix) {
+        citySuggestions.innerHTML = '';
+        return;
+    }
+    
+    fetch(`/cities/suggest?prefix=${encodeURIComponent(prefix)}`)
+    .then(response => response.json())
+    .then(data => {
+        // Ignore responses for a prefix the user has already typed past
+        if (prefix !== lastSuggestPrefix || !data.success) {
+            return;
+        }
+        citySuggestions.innerHTML = '';
+        data.suggestions.forEach(city => {
+            const option = document.createElement('option');
+            option.value = `${city.name},${city.country}`;
+            citySuggestions.appendChild(option);
+        });
+    })
+    .catch(() => {
+        // Suggestions are best effort; searching still works without them
+    });
+}
 
 /**
  * Handle search form submission
@@ -37,8 +92,51 @@ function handleSearch(event) {
         return;
     }
     
+    currentCity = city;
     showLoadingScreen();
     fetchWeatherData(city);
+    
+    if (liveToggle.checked) {
+        startLiveUpdates(city);
+    }
+}
+
+/**
+ * Turn live mode on or off
+ */
+function handleLiveToggle() {
+    if (liveToggle.checked && currentCity) {
+        startLiveUpdates(currentCity);
+    } else {
+        stopLiveUpdates();
+    }
+}
+
+/**
+ * Subscribe to server-sent updates for a city, replacing any previous stream
+ * @param {string} city - The city name to watch
+ */
+function startLiveUpdates(city) {
+    stopLiveUpdates();
+    
+    liveSource = new EventSource(`/weather/stream?cities=${encodeURIComponent(city)}`);
+    liveSource.addEventListener('weather', event => {
+        const data = JSON.parse(event.data);
+        // Only update the card once it is showing this city
+        if (data.success && data.query === currentCity && weatherCard.style.display === 'block') {
+            displayWeatherData(data);
+        }
+    });
+}
+
+/**
+ * Close the live update stream, if any
+ */
+function stopLiveUpdates() {
+    if (liveSource) {
+        liveSource.close();
+        liveSource = null;
+    }
 }
 
 /**
@@ -46,13 +144,8 @@ function handleSearch(event) {
  * @param {string} city - The city name to search for
  */
 function fetchWeatherData(city) {
-    const formData = new FormData();
-    formData.append('city', city);
-    
-    fetch('/weather', {
-        method: 'POST',
-        body: formData
-    })
+    // GET lets the browser and any proxy in between revalidate with the ETag
+    fetch(`/weather?city=${encodeURIComponent(city)}`)
     .then(response => response.json())
     .then(data => {
         if (data.success) {
@@ -81,7 +174,7 @@ function displayWeatherData(data) {
     temperatureElement.textContent = `${data.temperature}`;
     
     // Set weather icon
-    const iconUrl = `https://openweathermap.org/img/wn/${data.icon}@2x.png`;
+    const iconUrl = `/icons/${data.icon}.png`;
     weatherIconImg.src = iconUrl;
     weatherIconImg.alt = data.description;
     
@@ -95,7 +188,7 @@ function displayWeatherData(data) {
     pressureElement.textContent = `${data.pressure} hPa`;
     
     // Set last updated
-    lastUpdatedElement.textContent = `Last updated: ${data.last_updated}`;
+    lastUpdatedElement.textContent = `Last updated: ${data.last_updated}${data.stale ? ' (offline, showing last known data)' : ''}`;
     
     // Add fade-in animation
     weatherCard.classList.add('animate__animated', 'animate__fadeIn');
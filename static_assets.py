@@ -0,0 +1,181 @@
+"""
+Static Assets Module
+This module contains the build step that writes content-hashed, precompressed copies of
+the app's CSS and JavaScript, and the StaticAssets class that serves them to browsers.
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Dict, List, Optional
+
+from flask import Flask, Response, abort, request, send_from_directory, url_for
+
+from compression import brotli, compress, preferred_encoding
+
+DEFAULT_STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+ASSET_EXTENSIONS = (".css", ".js")
+
+# Hashed file names change whenever their content does, so they can be cached forever
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+def build_assets(static_dir: str = DEFAULT_STATIC_DIR) -> Dict[str, str]:
+    """Write hashed and precompressed copies of every CSS and JS file
+
+    static/css/styles.css becomes static/dist/css/styles.<hash>.css, next to
+    .gz and (if brotli is installed) .br versions compressed at the highest
+    level, since this only runs once per release. Outputs of earlier builds
+    are removed.
+
+    Args:
+        static_dir: Flask static folder
+
+    Returns:
+        Manifest mapping each source path (relative to static_dir) to its
+        hashed path (relative to static_dir/dist)
+    """
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    manifest: Dict[str, str] = {}
+    written = {os.path.join(dist_dir, MANIFEST_NAME)}
+
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [name for name in dirs if name != DIST_DIR]
+        for name in sorted(files):
+            stem, extension = os.path.splitext(name)
+            if extension not in ASSET_EXTENSIONS:
+                continue
+
+            source = os.path.join(root, name)
+            with open(source, "rb") as f:
+                data = f.read()
+            digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+
+            relative_dir = os.path.relpath(root, static_dir)
+            hashed = os.path.normpath(os.path.join(relative_dir, f"{stem}.{digest}{extension}"))
+            target = os.path.join(dist_dir, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+            outputs = {target: data, f"{target}.gz": compress(data, "gzip", 9)}
+            if brotli is not None:
+                outputs[f"{target}.br"] = compress(data, "br", 11)
+            for path, content in outputs.items():
+                with open(path, "wb") as f:
+                    f.write(content)
+            written.update(outputs)
+
+            source_name = os.path.relpath(source, static_dir).replace(os.sep, "/")
+            manifest[source_name] = hashed.replace(os.sep, "/")
+
+    # Drop files from earlier builds
+    for root, dirs, files in os.walk(dist_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if path not in written:
+                os.remove(path)
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class StaticAssets:
+    """Class to serve built assets with immutable caching
+
+    Templates call asset_url("css/styles.css"). When a build manifest exists
+    it returns the hashed /assets/... URL, which is served with a one year
+    immutable Cache-Control and the precompressed .br or .gz file the
+    browser accepts. Without a build it falls back to the plain /static URL,
+    so development works without building first.
+    """
+
+    def __init__(self, app: Optional[Flask] = None, static_dir: str = DEFAULT_STATIC_DIR, url_prefix: str = "/assets"):
+        """Initialize the StaticAssets
+
+        Args:
+            app: Flask app to register the route and template helper on
+            static_dir: Flask static folder the build was written to
+            url_prefix: URL path the hashed assets are served under
+        """
+        self._dist_dir = os.path.join(static_dir, DIST_DIR)
+        self._url_prefix = url_prefix
+        self._manifest = self._load_manifest()
+        self._hashed = set(self._manifest.values())
+        if app is not None:
+            self.init_app(app)
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self._dist_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def built(self) -> bool:
+        """True if a build manifest was found"""
+        return bool(self._manifest)
+
+    def init_app(self, app: Flask) -> None:
+        """Register the /assets route and the asset_url template helper"""
+        app.add_url_rule(f"{self._url_prefix}/<path:filename>", "assets", self.serve)
+        app.context_processor(lambda: {"asset_url": self.url})
+
+    def url(self, name: str) -> str:
+        """Return the URL for a static file, hashed if it was built"""
+        hashed = self._manifest.get(name)
+        if hashed is None:
+            return url_for("static", filename=name)
+        return url_for("assets", filename=hashed)
+
+    def serve(self, filename: str) -> Response:
+        """Serve a hashed asset, precompressed if the browser accepts it"""
+        if filename not in self._hashed:
+            abort(404)
+
+        encoding = preferred_encoding(request)
+        suffix = {"br": ".br", "gzip": ".gz"}.get(encoding, "")
+        if suffix and not os.path.exists(os.path.join(self._dist_dir, filename + suffix)):
+            encoding, suffix = None, ""
+
+        response = send_from_directory(
+            self._dist_dir, filename + suffix,
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=ASSET_MAX_AGE
+        )
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Build hashed, precompressed static assets
+
+    Args:
+        argv: Command line arguments after "build-assets"
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py build-assets",
+        description="Write content-hashed, precompressed copies of the CSS and JavaScript for production."
+    )
+    parser.add_argument("--static-dir", default=DEFAULT_STATIC_DIR, help="Flask static folder (default: static)")
+    args = parser.parse_args(argv)
+
+    manifest = build_assets(args.static_dir)
+    dist_dir = os.path.join(args.static_dir, DIST_DIR)
+    for source, hashed in sorted(manifest.items()):
+        sizes = [os.path.getsize(os.path.join(dist_dir, hashed + suffix))
+                 for suffix in ("", ".gz", ".br") if os.path.exists(os.path.join(dist_dir, hashed + suffix))]
+        print(f"{source} -> {DIST_DIR}/{hashed} ({' / '.join(str(size) for size in sizes)} bytes)")
+    return 0
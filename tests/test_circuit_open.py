@@ -0,0 +1,49 @@
+"""
+Circuit Open Tests
+This module contains tests for how both fetchers report an open circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+
+from async_weather_fetcher import AsyncWeatherFetcher
+from benchmarks.stub_server import StubServer
+from circuit_breaker import CircuitBreaker
+from weather_fetcher import WeatherFetcher
+
+
+@pytest.fixture
+def failing_stub():
+    with StubServer(error_rate=1.0) as stub:
+        yield stub
+
+
+def open_breaker() -> CircuitBreaker:
+    return CircuitBreaker(min_calls=1, window_size=1, open_seconds=0.5)
+
+
+def test_sync_fetcher_reports_sub_second_retry(failing_stub):
+    fetcher = WeatherFetcher(api_key="key", base_url=failing_stub.base_url, max_retries=0,
+                             circuit_breaker=open_breaker())
+
+    with pytest.raises(Exception, match="API Error: 500"):
+        fetcher.get_current_weather("London")
+    with pytest.raises(Exception, match=r"circuit open, retrying in 0\.[1-5]s"):
+        fetcher.get_current_weather("Paris")
+
+
+def test_async_fetcher_reports_sub_second_retry(failing_stub):
+    fetcher = AsyncWeatherFetcher(api_key="key", base_url=failing_stub.base_url, max_retries=0,
+                                  circuit_breaker=open_breaker())
+
+    async def fetch_twice():
+        try:
+            with pytest.raises(Exception, match="API Error: 500"):
+                await fetcher.get_current_weather("London")
+            with pytest.raises(Exception, match=r"circuit open, retrying in 0\.[1-5]s"):
+                await fetcher.get_current_weather("Paris")
+        finally:
+            await fetcher.aclose()
+
+    asyncio.run(fetch_twice())
@@ -0,0 +1,56 @@
+"""
+Observation Store Tests
+This module contains tests for the ObservationStore write path.
+"""
+
+import builtins
+
+import pytest
+
+import observation_store
+from observation_store import ObservationStore
+from weather_data import WeatherData
+
+DAY = 86400
+T = 1792300000 - 1792300000 % DAY
+
+
+def observation(city: str, observed_at: int, temperature: int) -> WeatherData:
+    return WeatherData(city, "GB", temperature, temperature - 2, "Clear sky", 50, 1012, 3.25, "01d", "x", observed_at)
+
+
+@pytest.fixture
+def store(tmp_path):
+    # Long interval: only the test flushes
+    store = ObservationStore(str(tmp_path), flush_rows=1000, flush_interval=3600)
+    yield store
+    store.close()
+
+
+def test_failed_flush_keeps_unwritten_rows(store, monkeypatch):
+    store.record(observation("London", T + 60, 1))
+    store.record(observation("London", T + DAY + 60, 2))
+
+    # The second day's segment fails part way, after two of its columns
+    second_day = ObservationStore._segment_name(T + DAY)
+    opened = []
+
+    def failing_open(path, mode="r", *args, **kwargs):
+        if mode == "ab" and second_day in path:
+            opened.append(path)
+            if len(opened) == 3:
+                raise OSError("No space left on device")
+        return builtins.open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(observation_store, "open", failing_open, raising=False)
+    with pytest.raises(OSError):
+        store.flush()
+    monkeypatch.undo()
+
+    assert store.written == 1
+    store.record(observation("London", T + DAY + 120, 3))
+    assert store.flush() == 2
+
+    history = store.history("London", T, T + 2 * DAY)
+    assert history["observed_at"].tolist() == [T + 60, T + DAY + 60, T + DAY + 120]
+    assert history["temperature"].tolist() == [1, 2, 3]
@@ -0,0 +1,26 @@
+"""
+Quota Tests
+This module contains tests for the QuotaGovernor.
+"""
+
+from quota import QuotaGovernor
+
+
+def test_throttled_with_wait_blocks_key():
+    quota = QuotaGovernor(["key"], calls_per_minute=60)
+
+    quota.throttled("key", 30.0)
+
+    key, retry_in = quota.try_acquire()
+    assert key is None
+    assert 29.0 < retry_in <= 30.0
+
+
+def test_throttled_without_wait_keeps_tokens():
+    quota = QuotaGovernor(["key"], calls_per_minute=60)
+    quota.try_acquire()
+
+    quota.throttled("key", 0.0)
+
+    assert quota.available() == 59
+    assert quota.try_acquire()[0] == "key"
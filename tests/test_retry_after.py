@@ -0,0 +1,76 @@
+"""
+Retry-After Tests
+This module contains tests for the Retry-After handling shared by both fetchers.
+"""
+
+import asyncio
+
+import pytest
+
+from async_weather_fetcher import AsyncWeatherFetcher
+from benchmarks.stub_server import StubServer
+from quota import QuotaGovernor
+from weather_fetcher import DEFAULT_RETRY_AFTER, WeatherFetcher, retry_after
+
+
+class RecordingQuota(QuotaGovernor):
+    """Class to record the rest periods a fetcher asks for"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rests = []
+
+    def throttled(self, key: str, retry_after: float) -> None:
+        self.rests.append(retry_after)
+        super().throttled(key, retry_after)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0", 0.0),
+    ("7", 7.0),
+    ("1.5", 1.5),
+    ("-3", 0.0),
+    ("", DEFAULT_RETRY_AFTER),
+    ("soon", DEFAULT_RETRY_AFTER),
+    ("inf", DEFAULT_RETRY_AFTER),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", DEFAULT_RETRY_AFTER),
+])
+def test_retry_after_parses_delay_seconds(value, expected):
+    assert retry_after({"Retry-After": value}) == expected
+
+
+def test_retry_after_default_when_absent():
+    assert retry_after({}) == DEFAULT_RETRY_AFTER
+    assert retry_after({}, 0.25) == 0.25
+
+
+@pytest.fixture
+def throttling_stub():
+    with StubServer(rate_limit_rate=1.0, retry_after=0) as stub:
+        yield stub
+
+
+def test_sync_fetcher_rests_key_for_retry_after_zero(throttling_stub):
+    quota = RecordingQuota(["key"])
+    fetcher = WeatherFetcher(api_key="key", base_url=throttling_stub.base_url, max_retries=0, quota=quota)
+
+    with pytest.raises(Exception, match="429"):
+        fetcher.get_current_weather("London")
+
+    assert quota.rests == [0.0]
+
+
+def test_async_fetcher_rests_key_for_retry_after_zero(throttling_stub):
+    quota = RecordingQuota(["key"])
+    fetcher = AsyncWeatherFetcher(api_key="key", base_url=throttling_stub.base_url, max_retries=0, quota=quota)
+
+    async def fetch():
+        try:
+            await fetcher.get_current_weather("London")
+        finally:
+            await fetcher.aclose()
+
+    with pytest.raises(Exception, match="429"):
+        asyncio.run(fetch())
+
+    assert quota.rests == [0.0]
@@ -7,14 +7,15 @@ import os
 import tkinter as tk
 from tkinter import messagebox
 import customtkinter as ctk
-import threading
-from PIL import Image, ImageTk
-import io
-import requests
-from typing import Optional, Dict, Any, Tuple
+import time
+from typing import Optional, Dict, Tuple, Callable, Iterable, TYPE_CHECKING
 
 from weather_fetcher import WeatherFetcher
+from weather_cache import normalize_city
+from background_fetcher import BackgroundFetcher, FetchResult
 from weather_data import WeatherData
+from icon_store import DEFAULT_ICON_DIR, IconStore
+from weather_card import WeatherCard
 from assets.app_styles import (
     APP_TITLE, 
     COLOR_PRIMARY, 
@@ -23,38 +24,76 @@ from assets.app_styles import (
     COLOR_TEXT_SECONDARY,
     COLOR_BACKGROUND,
     FONT_FAMILY,
-    PADDING,
-    CORNER_RADIUS
+    PADDING
 )
 
-# Set appearance mode and default color theme
-ctk.set_appearance_mode("System")  # Use system setting for light/dark mode
-ctk.set_default_color_theme("blue")
+if TYPE_CHECKING:
+    from PIL import ImageTk
+
+# Results from the worker pool are applied on this fixed tick, a bounded
+# number at a time, instead of one after(0, ...) callback per result
+RESULT_TICK_MS = 100
+RESULTS_PER_TICK = 50
+
+# Background lookup slots: one for the search box, one per watched city
+SEARCH_KEY = "search"
+WATCH_KEY_PREFIX = "watch:"
+
+DASHBOARD_COLUMNS = 3
 
 class WeatherApp:
     """Main Weather Application class"""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        debug: bool = False,
+        workers: int = 4,
+        watch_list: Optional[Iterable[str]] = None,
+        watch_interval: float = 300.0
+    ):
         """Initialize the Weather App
         
         Args:
             api_key: OpenWeatherMap API key
+            debug: Show an overlay with the time each screen update takes
+            workers: Maximum lookups running in the background at once
+            watch_list: Cities shown on the dashboard at startup
+            watch_interval: Seconds between refreshes of the watch list
         """
         self._api_key = api_key
-        self._weather_fetcher = WeatherFetcher(api_key)
+        self._debug = debug
+        self._watch_interval = watch_interval
+        self._weather_fetcher = WeatherFetcher(api_key, pool_size=workers)
+        self._background = BackgroundFetcher(self._fetch_weather_data, max_workers=workers)
+        self._watch_cards: Dict[str, WeatherCard] = {}
+        self._watch_cities: Dict[str, str] = {}
+        self._icon_store = IconStore(self._weather_fetcher, os.getenv("WEATHER_ICON_DIR", DEFAULT_ICON_DIR))
         self._setup_root()
         self._create_widgets()
         self._setup_layout()
         
         # Variable to store current weather data
         self._current_weather: Optional[WeatherData] = None
-        self._weather_icon: Optional[ImageTk.PhotoImage] = None
+        self._weather_icon: Optional["ImageTk.PhotoImage"] = None
         
         # Set up initial state
         self._show_welcome_screen()
+        for city in watch_list or ():
+            self._add_to_watch_list(city)
+        
+        # Start draining background results and refreshing the watch list
+        self.root.after(RESULT_TICK_MS, self._drain_results)
+        self.root.after(int(self._watch_interval * 1000), self._refresh_watch_list)
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
     
     def _setup_root(self) -> None:
         """Set up the root window"""
+        # Set appearance mode and default color theme here rather than at
+        # import, so importing this module stays free of side effects
+        ctk.set_appearance_mode("System")  # Use system setting for light/dark mode
+        ctk.set_default_color_theme("blue")
+        
         self.root = ctk.CTk()
         self.root.title(APP_TITLE)
         self.root.geometry("700x550")
@@ -95,6 +134,34 @@ class WeatherApp:
         )
         self.search_button.grid(row=0, column=1, padx=PADDING, pady=PADDING)
         
+        # Create watch list buttons
+        self.watch_button = ctk.CTkButton(
+            self.search_frame,
+            text="Watch",
+            command=self._handle_watch,
+            width=80,
+            height=40,
+            font=(FONT_FAMILY, 14),
+            fg_color=COLOR_PRIMARY,
+            hover_color=COLOR_SECONDARY
+        )
+        self.watch_button.grid(row=0, column=2, padx=(0, PADDING), pady=PADDING)
+        
+        self.dashboard_button = ctk.CTkButton(
+            self.search_frame,
+            text="Watch list",
+            command=self._toggle_dashboard,
+            width=100,
+            height=40,
+            font=(FONT_FAMILY, 14),
+            fg_color="transparent",
+            border_width=1,
+            border_color=COLOR_PRIMARY,
+            text_color=COLOR_PRIMARY,
+            hover_color=COLOR_BACKGROUND
+        )
+        self.dashboard_button.grid(row=0, column=3, padx=(0, PADDING), pady=PADDING)
+        
         # Create content frame
         self.content_frame = ctk.CTkFrame(
             self.root,
@@ -109,25 +176,12 @@ class WeatherApp:
         self.search_entry.bind("<Return>", lambda event: self._handle_search())
     
     def _setup_layout(self) -> None:
-        """Set up the initial layout"""
-        # Will be populated when searching for weather
-        pass
-    
-    def _show_welcome_screen(self) -> None:
-        """Display the welcome screen"""
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
-        # Add welcome message
-        welcome_frame = ctk.CTkFrame(
-            self.content_frame, 
-            fg_color="transparent"
-        )
-        welcome_frame.grid(row=0, column=0, sticky="", padx=PADDING, pady=PADDING)
+        """Build every screen once; showing a screen only toggles visibility"""
+        # Welcome screen
+        self._welcome_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         
         welcome_label = ctk.CTkLabel(
-            welcome_frame,
+            self._welcome_frame,
             text="Welcome to Weather App",
             font=(FONT_FAMILY, 24, "bold"),
             text_color=COLOR_TEXT_PRIMARY
@@ -135,119 +189,47 @@ class WeatherApp:
         welcome_label.grid(row=0, column=0, pady=(0, 10))
         
         instruction_label = ctk.CTkLabel(
-            welcome_frame,
+            self._welcome_frame,
             text="Enter a city name in the search box above to get started",
             font=(FONT_FAMILY, 16),
             text_color=COLOR_TEXT_SECONDARY
         )
         instruction_label.grid(row=1, column=0, pady=(0, 20))
-    
-    def _show_loading_screen(self) -> None:
-        """Display loading screen while fetching data"""
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
-        # Add loading message
-        loading_frame = ctk.CTkFrame(
-            self.content_frame, 
-            fg_color="transparent"
-        )
-        loading_frame.grid(row=0, column=0, sticky="", padx=PADDING, pady=PADDING)
+        
+        # Loading screen
+        self._loading_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         
         loading_label = ctk.CTkLabel(
-            loading_frame,
+            self._loading_frame,
             text="Loading weather data...",
             font=(FONT_FAMILY, 18),
             text_color=COLOR_TEXT_PRIMARY
         )
         loading_label.grid(row=0, column=0, pady=10)
         
-        # Force update to show loading screen
-        self.root.update()
-    
-    def _handle_search(self) -> None:
-        """Handle search button click"""
-        city = self.search_var.get().strip()
-        
-        if not city:
-            messagebox.showwarning("Empty Search", "Please enter a city name")
-            return
-        
-        # Show loading screen
-        self._show_loading_screen()
-        
-        # Create a thread to fetch weather data
-        thread = threading.Thread(
-            target=self._fetch_weather_data,
-            args=(city,)
-        )
-        thread.daemon = True
-        thread.start()
-    
-    def _fetch_weather_data(self, city: str) -> None:
-        """Fetch weather data in a separate thread
-        
-        Args:
-            city: City name to search for
-        """
-        try:
-            weather_data = self._weather_fetcher.get_current_weather(city)
-            self._current_weather = weather_data
-            
-            # Fetch weather icon
-            icon_url = f"https://openweathermap.org/img/wn/{weather_data.icon}@2x.png"
-            response = requests.get(icon_url)
-            
-            if response.status_code == 200:
-                img_data = io.BytesIO(response.content)
-                img = Image.open(img_data)
-                self._weather_icon = ImageTk.PhotoImage(img)
-            
-            # Update UI in the main thread
-            self.root.after(0, self._display_weather_data)
-            
-        except Exception as e:
-            # Update UI in the main thread
-            self.root.after(0, lambda: self._show_error(str(e)))
-    
-    def _show_error(self, message: str) -> None:
-        """Display error message
-        
-        Args:
-            message: Error message to display
-        """
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-        
-        # Add error message
-        error_frame = ctk.CTkFrame(
-            self.content_frame, 
-            fg_color="transparent"
-        )
-        error_frame.grid(row=0, column=0, sticky="", padx=PADDING, pady=PADDING)
+        # Error screen
+        self._error_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
         
         error_label = ctk.CTkLabel(
-            error_frame,
+            self._error_frame,
             text="Error",
             font=(FONT_FAMILY, 24, "bold"),
             text_color="#E53935"  # Red color for error
         )
         error_label.grid(row=0, column=0, pady=(0, 10))
         
-        error_message = ctk.CTkLabel(
-            error_frame,
-            text=message,
+        self._error_message = ctk.CTkLabel(
+            self._error_frame,
+            text="",
             font=(FONT_FAMILY, 16),
             text_color=COLOR_TEXT_SECONDARY,
             wraplength=400
         )
-        error_message.grid(row=1, column=0, pady=(0, 20))
+        self._error_message.grid(row=1, column=0, pady=(0, 20))
         
         # Add try again button
         try_again_button = ctk.CTkButton(
-            error_frame,
+            self._error_frame,
             text="Try Again",
             command=self._show_welcome_screen,
             height=40,
@@ -256,168 +238,253 @@ class WeatherApp:
             hover_color=COLOR_SECONDARY
         )
         try_again_button.grid(row=2, column=0, pady=10)
-    
-    def _display_weather_data(self) -> None:
-        """Display weather data in the UI"""
-        if not self._current_weather:
-            return
         
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Weather screen
+        self._weather_card = WeatherCard(self.content_frame)
         
-        # Create weather card
-        weather_card = ctk.CTkFrame(
-            self.content_frame,
-            corner_radius=CORNER_RADIUS,
-            fg_color="#FFFFFF" if ctk.get_appearance_mode() == "Light" else "#2B2B2B"
-        )
-        weather_card.grid(row=0, column=0, padx=PADDING*2, pady=PADDING*2, sticky="")
+        # Watch list dashboard: a scrollable grid of compact cards
+        self._dashboard_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color="transparent")
+        for column in range(DASHBOARD_COLUMNS):
+            self._dashboard_frame.grid_columnconfigure(column, weight=1)
         
-        # Location info
-        location_frame = ctk.CTkFrame(
-            weather_card,
-            fg_color="transparent"
+        self._dashboard_empty_label = ctk.CTkLabel(
+            self._dashboard_frame,
+            text="Search for a city and press Watch to add it here",
+            font=(FONT_FAMILY, 16),
+            text_color=COLOR_TEXT_SECONDARY
         )
-        location_frame.grid(row=0, column=0, columnspan=2, padx=PADDING*2, pady=(PADDING*2, PADDING), sticky="ew")
+        self._dashboard_empty_label.grid(row=0, column=0, columnspan=DASHBOARD_COLUMNS, pady=PADDING*2)
+        
+        self._screens = (self._welcome_frame, self._loading_frame, self._error_frame, self._weather_card, self._dashboard_frame)
+        for screen in self._screens:
+            screen.grid(row=0, column=0, sticky="", padx=PADDING, pady=PADDING)
+            screen.grid_remove()
+        self._weather_card.grid_configure(padx=PADDING*2, pady=PADDING*2)
+        self._dashboard_frame.grid_configure(sticky="nsew")
+        self._current_screen: Optional[ctk.CTkFrame] = None
+        
+        # Render timing overlay, shown in debug mode only
+        self._render_count = 0
+        self._render_total_ms = 0.0
+        self._debug_label: Optional[ctk.CTkLabel] = None
+        if self._debug:
+            self._debug_label = ctk.CTkLabel(
+                self.root,
+                text="render: -",
+                font=(FONT_FAMILY, 11),
+                text_color=COLOR_TEXT_SECONDARY,
+                fg_color="transparent"
+            )
+            self._debug_label.place(relx=1.0, rely=1.0, x=-PADDING, y=-PADDING, anchor="se")
+    
+    def _show_screen(self, screen: ctk.CTkFrame, update: Optional[Callable[[], None]] = None) -> None:
+        """Show one of the prebuilt screens, hiding the current one
         
-        city_label = ctk.CTkLabel(
-            location_frame,
-            text=f"{self._current_weather.city}, {self._current_weather.country}",
-            font=(FONT_FAMILY, 24, "bold"),
-            text_color=COLOR_TEXT_PRIMARY
+        Args:
+            screen: Screen to show
+            update: Optional function that updates the screen's widgets in place
+        """
+        started = time.perf_counter()
+        if update is not None:
+            update()
+        if screen is not self._current_screen:
+            if self._current_screen is not None:
+                self._current_screen.grid_remove()
+            screen.grid()
+            self._current_screen = screen
+        
+        if self._debug_label is not None:
+            # Idle callbacks run in order, so this fires after Tk has redrawn
+            self.root.after_idle(lambda: self._record_render(started))
+    
+    def _record_render(self, started: float) -> None:
+        """Show how long the last screen update took to reach the display"""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._render_count += 1
+        self._render_total_ms += elapsed_ms
+        self._debug_label.configure(
+            text=f"render: {elapsed_ms:.1f} ms (avg {self._render_total_ms / self._render_count:.1f} ms, n={self._render_count})"
         )
-        city_label.grid(row=0, column=0, sticky="w")
+        self._debug_label.lift()
+    
+    def _show_welcome_screen(self) -> None:
+        """Display the welcome screen"""
+        self._show_screen(self._welcome_frame)
+    
+    def _show_loading_screen(self) -> None:
+        """Display loading screen while fetching data"""
+        self._show_screen(self._loading_frame)
+    
+    def _handle_search(self) -> None:
+        """Handle search button click"""
+        city = self.search_var.get().strip()
         
-        # Temperature and icon
-        temp_frame = ctk.CTkFrame(
-            weather_card,
-            fg_color="transparent"
-        )
-        temp_frame.grid(row=1, column=0, padx=PADDING*2, pady=PADDING, sticky="w")
+        if not city:
+            messagebox.showwarning("Empty Search", "Please enter a city name")
+            return
         
-        temp_label = ctk.CTkLabel(
-            temp_frame,
-            text=f"{self._current_weather.temperature}°C",
-            font=(FONT_FAMILY, 40, "bold"),
-            text_color=COLOR_PRIMARY
-        )
-        temp_label.grid(row=0, column=0, sticky="w")
+        # Show loading screen
+        self._show_loading_screen()
         
-        # Weather icon and description
-        icon_frame = ctk.CTkFrame(
-            weather_card,
-            fg_color="transparent"
-        )
-        icon_frame.grid(row=1, column=1, padx=PADDING*2, pady=PADDING, sticky="e")
+        # A newer search supersedes any search still in flight
+        self._background.submit(SEARCH_KEY, city)
+    
+    def _fetch_weather_data(self, city: str) -> Tuple[WeatherData, Optional[str]]:
+        """Fetch weather data on a worker thread
         
-        if self._weather_icon:
-            icon_label = tk.Label(
-                icon_frame,
-                image=self._weather_icon,
-                bg=weather_card.cget("fg_color")
-            )
-            icon_label.grid(row=0, column=0)
+        Args:
+            city: City name to search for
+            
+        Returns:
+            Tuple of the weather data and its icon code (None if the icon
+            could not be loaded)
+        """
+        weather_data = self._weather_fetcher.get_current_weather(city)
         
-        description_label = ctk.CTkLabel(
-            icon_frame,
-            text=self._current_weather.description.capitalize(),
-            font=(FONT_FAMILY, 18),
-            text_color=COLOR_TEXT_SECONDARY
-        )
-        description_label.grid(row=1, column=0)
+        # Download and decode the icon here, off the UI thread; the store
+        # keeps it, so each icon code is fetched and decoded only once
+        try:
+            self._icon_store.get_image(weather_data.icon)
+            icon_code = weather_data.icon
+        except Exception:
+            icon_code = None
+        return weather_data, icon_code
+    
+    def _drain_results(self) -> None:
+        """Apply finished lookups to the UI, then schedule the next tick
         
-        # Details frame
-        details_frame = ctk.CTkFrame(
-            weather_card,
-            fg_color="transparent"
-        )
-        details_frame.grid(row=2, column=0, columnspan=2, padx=PADDING*2, pady=PADDING*2, sticky="ew")
-        details_frame.grid_columnconfigure(0, weight=1)
-        details_frame.grid_columnconfigure(1, weight=1)
-        
-        # Feels like temperature
-        feels_like_label = ctk.CTkLabel(
-            details_frame,
-            text="Feels like:",
-            font=(FONT_FAMILY, 14),
-            text_color=COLOR_TEXT_SECONDARY
-        )
-        feels_like_label.grid(row=0, column=0, pady=(PADDING, 0), sticky="w")
+        Runs on the Tk main thread every RESULT_TICK_MS. At most
+        RESULTS_PER_TICK results are applied per tick so a burst of watch list
+        refreshes can't stall the event loop.
+        """
+        results = self._background.drain(RESULTS_PER_TICK)
+        if results:
+            started = time.perf_counter()
+            for result in results:
+                if result.key == SEARCH_KEY:
+                    self._apply_search_result(result)
+                else:
+                    self._apply_watch_result(result)
+            if self._debug_label is not None:
+                self.root.after_idle(lambda: self._record_render(started))
+        
+        self.root.after(RESULT_TICK_MS, self._drain_results)
+    
+    def _apply_search_result(self, result: FetchResult) -> None:
+        """Show the outcome of the latest search"""
+        if result.error is not None:
+            self._show_error(result.error)
+            return
         
-        feels_like_value = ctk.CTkLabel(
-            details_frame,
-            text=f"{self._current_weather.feels_like}°C",
-            font=(FONT_FAMILY, 16, "bold"),
-            text_color=COLOR_TEXT_PRIMARY
-        )
-        feels_like_value.grid(row=0, column=1, pady=(PADDING, 0), sticky="e")
+        self._current_weather, icon_code = result.value
+        self._display_weather_data(icon_code)
+    
+    def _apply_watch_result(self, result: FetchResult) -> None:
+        """Update a watch list card in place"""
+        card = self._watch_cards.get(result.key)
+        if card is None:
+            return
         
-        # Humidity
-        humidity_label = ctk.CTkLabel(
-            details_frame,
-            text="Humidity:",
-            font=(FONT_FAMILY, 14),
-            text_color=COLOR_TEXT_SECONDARY
-        )
-        humidity_label.grid(row=1, column=0, pady=PADDING, sticky="w")
+        if result.error is not None:
+            card.show_message(result.city, result.error)
+            return
         
-        humidity_value = ctk.CTkLabel(
-            details_frame,
-            text=f"{self._current_weather.humidity}%",
-            font=(FONT_FAMILY, 16, "bold"),
-            text_color=COLOR_TEXT_PRIMARY
-        )
-        humidity_value.grid(row=1, column=1, pady=PADDING, sticky="e")
+        weather_data, icon_code = result.value
+        card.update_weather(weather_data, self._icon_store.get_photo_image(icon_code) if icon_code else None)
+    
+    def _handle_watch(self) -> None:
+        """Add the searched city to the watch list and show the dashboard"""
+        city = self.search_var.get().strip()
+        if not city:
+            messagebox.showwarning("Empty Search", "Please enter a city name")
+            return
         
-        # Wind speed
-        wind_label = ctk.CTkLabel(
-            details_frame,
-            text="Wind speed:",
-            font=(FONT_FAMILY, 14),
-            text_color=COLOR_TEXT_SECONDARY
-        )
-        wind_label.grid(row=2, column=0, pady=PADDING, sticky="w")
+        self._add_to_watch_list(city)
+        self._show_dashboard()
+    
+    def _add_to_watch_list(self, city: str) -> None:
+        """Create a card for a city and start loading it
         
-        wind_value = ctk.CTkLabel(
-            details_frame,
-            text=f"{self._current_weather.wind_speed} m/s",
-            font=(FONT_FAMILY, 16, "bold"),
-            text_color=COLOR_TEXT_PRIMARY
-        )
-        wind_value.grid(row=2, column=1, pady=PADDING, sticky="e")
+        Args:
+            city: City name to watch
+        """
+        key = f"{WATCH_KEY_PREFIX}{normalize_city(city)}"
+        if key in self._watch_cards:
+            return
         
-        # Pressure
-        pressure_label = ctk.CTkLabel(
-            details_frame,
-            text="Pressure:",
-            font=(FONT_FAMILY, 14),
-            text_color=COLOR_TEXT_SECONDARY
-        )
-        pressure_label.grid(row=3, column=0, pady=PADDING, sticky="w")
+        card = WeatherCard(self._dashboard_frame, compact=True, on_remove=lambda: self._remove_from_watch_list(key))
+        card.show_message(city, "Loading...")
+        self._watch_cards[key] = card
+        self._watch_cities[key] = city
+        self._layout_watch_cards()
+        self._background.submit(key, city)
+    
+    def _remove_from_watch_list(self, key: str) -> None:
+        """Stop watching a city and drop its card"""
+        self._background.cancel(key)
+        self._watch_cities.pop(key, None)
+        card = self._watch_cards.pop(key, None)
+        if card is not None:
+            card.destroy()
+        self._layout_watch_cards()
+    
+    def _layout_watch_cards(self) -> None:
+        """Place watch list cards in a grid, or the empty message if there are none"""
+        if not self._watch_cards:
+            self._dashboard_empty_label.grid()
+            return
         
-        pressure_value = ctk.CTkLabel(
-            details_frame,
-            text=f"{self._current_weather.pressure} hPa",
-            font=(FONT_FAMILY, 16, "bold"),
-            text_color=COLOR_TEXT_PRIMARY
-        )
-        pressure_value.grid(row=3, column=1, pady=PADDING, sticky="e")
+        self._dashboard_empty_label.grid_remove()
+        for index, card in enumerate(self._watch_cards.values()):
+            card.grid(row=index // DASHBOARD_COLUMNS, column=index % DASHBOARD_COLUMNS, padx=PADDING, pady=PADDING, sticky="nsew")
+    
+    def _refresh_watch_list(self) -> None:
+        """Refresh every watched city through the worker pool, then reschedule"""
+        for key, city in self._watch_cities.items():
+            self._background.submit(key, city)
+        self.root.after(int(self._watch_interval * 1000), self._refresh_watch_list)
+    
+    def _toggle_dashboard(self) -> None:
+        """Switch between the watch list dashboard and the single-city view"""
+        if self._current_screen is self._dashboard_frame:
+            if self._current_weather is not None:
+                self._show_screen(self._weather_card)
+            else:
+                self._show_welcome_screen()
+        else:
+            self._show_dashboard()
+    
+    def _show_dashboard(self) -> None:
+        """Display the watch list dashboard"""
+        self._show_screen(self._dashboard_frame)
+    
+    def _show_error(self, message: str) -> None:
+        """Display error message
         
-        # Last updated
-        updated_frame = ctk.CTkFrame(
-            weather_card,
-            fg_color="transparent"
-        )
-        updated_frame.grid(row=3, column=0, columnspan=2, padx=PADDING*2, pady=PADDING, sticky="ew")
+        Args:
+            message: Error message to display
+        """
+        self._show_screen(self._error_frame, lambda: self._error_message.configure(text=message))
+    
+    def _display_weather_data(self, icon_code: Optional[str] = None) -> None:
+        """Display weather data in the UI
         
-        updated_label = ctk.CTkLabel(
-            updated_frame,
-            text=f"Last updated: {self._current_weather.last_updated}",
-            font=(FONT_FAMILY, 12),
-            text_color=COLOR_TEXT_SECONDARY
-        )
-        updated_label.grid(row=0, column=0)
+        Args:
+            icon_code: Icon to show, if it was loaded successfully
+        """
+        if not self._current_weather:
+            return
+        
+        # Tk images must be created on the main thread; the store reuses them
+        self._weather_icon = self._icon_store.get_photo_image(icon_code) if icon_code else None
+        
+        weather_data = self._current_weather
+        self._show_screen(self._weather_card, lambda: self._weather_card.update_weather(weather_data, self._weather_icon))
+    
+    def _close(self) -> None:
+        """Cancel background work and close the window"""
+        self._background.shutdown()
+        self.root.destroy()
     
     def run(self) -> None:
         """Run the application"""
@@ -0,0 +1,156 @@
+"""
+Weather Cache Module
+This module contains the WeatherCache class, a bounded in-process TTL + LRU cache
+for weather lookups.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def normalize_city(city: str) -> str:
+    """Normalize a city name for use as a cache key
+
+    Folds case and collapses runs of whitespace so that "  new   York" and
+    "New York" share one entry.
+
+    Args:
+        city: City name as entered by the user
+
+    Returns:
+        Normalized city key
+    """
+    return " ".join(city.split()).casefold()
+
+
+class WeatherCache:
+    """Thread-safe TTL cache with least-recently-used eviction"""
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024, max_stale: float = 0.0):
+        """Initialize the WeatherCache
+
+        Args:
+            ttl: Seconds an entry stays fresh after it is stored
+            max_entries: Maximum number of entries kept before the least
+                recently used one is evicted
+            max_stale: Seconds an expired entry is kept around so it can still
+                be served by get_stale() while a refresh is in flight
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_stale = max_stale
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    @property
+    def ttl(self) -> float:
+        """Seconds an entry stays fresh"""
+        return self._ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired
+
+        Args:
+            key: Normalized cache key
+
+        Returns:
+            Cached value or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= now:
+                if expires_at + self._max_stale <= now:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Return an expired value still within the max_stale window
+
+        Args:
+            key: Normalized cache key
+
+        Returns:
+            Stale value, or None if there is none (fresh entries return None too)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= now < expires_at + self._max_stale:
+                self.stale_hits += 1
+                return value
+            return None
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Return seconds until key expires (negative once stale), or None if absent
+
+        Does not count as a hit or refresh the entry's LRU position.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            return entry[1] - time.monotonic()
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry if full
+
+        Args:
+            key: Normalized cache key
+            value: Value to store
+            ttl: Seconds the entry stays fresh, capped at the cache TTL
+                (defaults to the cache TTL)
+        """
+        if self._max_entries <= 0 or self._ttl <= 0:
+            return
+
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+            }
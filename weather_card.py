@@ -0,0 +1,167 @@
+"""
+Weather Card Module
+This module contains the WeatherCard widget that shows one city's weather and is built
+once, then updated in place for every new reading.
+"""
+
+import tkinter as tk
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+import customtkinter as ctk
+
+from weather_data import WeatherData
+from assets.app_styles import (
+    COLOR_PRIMARY,
+    COLOR_TEXT_PRIMARY,
+    COLOR_TEXT_SECONDARY,
+    FONT_FAMILY,
+    PADDING,
+    CORNER_RADIUS
+)
+
+if TYPE_CHECKING:
+    from PIL import ImageTk
+
+
+class WeatherCard(ctk.CTkFrame):
+    """Card widget displaying one city's weather
+
+    All child widgets are created in the constructor. update_weather() only
+    reconfigures the labels whose text or image actually changed, so
+    refreshing a card is cheap and creates no Tk objects.
+    """
+
+    def __init__(
+        self,
+        master: Any,
+        compact: bool = False,
+        on_remove: Optional[Callable[[], None]] = None,
+        **kwargs: Any
+    ):
+        """Initialize the WeatherCard
+
+        Args:
+            master: Parent widget
+            compact: Use smaller fonts and padding, for grids of many cards
+            on_remove: If given, a remove button calling it is shown
+            **kwargs: Passed on to CTkFrame
+        """
+        background = "#FFFFFF" if ctk.get_appearance_mode() == "Light" else "#2B2B2B"
+        super().__init__(master, corner_radius=CORNER_RADIUS, fg_color=background, **kwargs)
+
+        scale = 0.6 if compact else 1.0
+        pad = PADDING if compact else PADDING * 2
+
+        def font(size: int, *style: str) -> tuple:
+            return (FONT_FAMILY, max(10, int(size * scale)), *style)
+
+        # Last value shown per field, to skip reconfiguring unchanged labels
+        self._shown: Dict[str, Any] = {}
+        self._photo: Optional["ImageTk.PhotoImage"] = None
+
+        # Location info
+        self._city_label = ctk.CTkLabel(self, text="", font=font(24, "bold"), text_color=COLOR_TEXT_PRIMARY)
+        self._city_label.grid(row=0, column=0, columnspan=1 if on_remove else 2, padx=pad, pady=(pad, PADDING), sticky="w")
+
+        if on_remove is not None:
+            remove_button = ctk.CTkButton(
+                self,
+                text="×",
+                command=on_remove,
+                width=28,
+                height=28,
+                font=font(16, "bold"),
+                fg_color="transparent",
+                text_color=COLOR_TEXT_SECONDARY,
+                hover_color=background
+            )
+            remove_button.grid(row=0, column=1, padx=(0, PADDING), pady=(PADDING, 0), sticky="ne")
+
+        # Temperature
+        self._temp_label = ctk.CTkLabel(self, text="", font=font(40, "bold"), text_color=COLOR_PRIMARY)
+        self._temp_label.grid(row=1, column=0, padx=pad, pady=PADDING, sticky="w")
+
+        # Weather icon and description
+        icon_frame = ctk.CTkFrame(self, fg_color="transparent")
+        icon_frame.grid(row=1, column=1, padx=pad, pady=PADDING, sticky="e")
+
+        self._icon_label = tk.Label(icon_frame, bg=background, borderwidth=0)
+        self._icon_label.grid(row=0, column=0)
+        self._icon_label.grid_remove()
+
+        self._description_label = ctk.CTkLabel(
+            icon_frame, text="", font=font(18), text_color=COLOR_TEXT_SECONDARY, wraplength=int(300 * scale)
+        )
+        self._description_label.grid(row=1, column=0)
+
+        # Details
+        details_frame = ctk.CTkFrame(self, fg_color="transparent")
+        details_frame.grid(row=2, column=0, columnspan=2, padx=pad, pady=pad, sticky="ew")
+        details_frame.grid_columnconfigure(0, weight=1)
+        details_frame.grid_columnconfigure(1, weight=1)
+
+        self._details: Dict[str, ctk.CTkLabel] = {}
+        for row, (field, caption) in enumerate((
+            ("feels_like", "Feels like:"),
+            ("humidity", "Humidity:"),
+            ("wind_speed", "Wind speed:"),
+            ("pressure", "Pressure:")
+        )):
+            ctk.CTkLabel(
+                details_frame, text=caption, font=font(14), text_color=COLOR_TEXT_SECONDARY
+            ).grid(row=row, column=0, pady=(PADDING, 0) if row == 0 else PADDING, sticky="w")
+            value = ctk.CTkLabel(details_frame, text="", font=font(16, "bold"), text_color=COLOR_TEXT_PRIMARY)
+            value.grid(row=row, column=1, pady=(PADDING, 0) if row == 0 else PADDING, sticky="e")
+            self._details[field] = value
+
+        # Last updated
+        self._updated_label = ctk.CTkLabel(self, text="", font=font(12), text_color=COLOR_TEXT_SECONDARY)
+        self._updated_label.grid(row=3, column=0, columnspan=2, padx=pad, pady=PADDING)
+
+    def _set_text(self, key: str, label: ctk.CTkLabel, text: str) -> None:
+        """Update a label's text only if it changed"""
+        if self._shown.get(key) != text:
+            self._shown[key] = text
+            label.configure(text=text)
+
+    def update_weather(self, weather_data: WeatherData, photo: Optional["ImageTk.PhotoImage"] = None) -> None:
+        """Show a new reading, reusing the existing widgets
+
+        Args:
+            weather_data: Weather to display
+            photo: Icon image to show (None hides the icon)
+        """
+        self._set_text("city", self._city_label, f"{weather_data.city}, {weather_data.country}")
+        self._set_text("temperature", self._temp_label, f"{weather_data.temperature}°C")
+        self._set_text("description", self._description_label, weather_data.description)
+        self._set_text("feels_like", self._details["feels_like"], f"{weather_data.feels_like}°C")
+        self._set_text("humidity", self._details["humidity"], f"{weather_data.humidity}%")
+        self._set_text("wind_speed", self._details["wind_speed"], f"{weather_data.wind_speed} m/s")
+        self._set_text("pressure", self._details["pressure"], f"{weather_data.pressure} hPa")
+        stale = " (offline, showing last known data)" if weather_data.stale else ""
+        self._set_text("updated", self._updated_label, f"Last updated: {weather_data.last_updated}{stale}")
+
+        self._set_photo(photo)
+
+    def show_message(self, title: str, message: str) -> None:
+        """Show a title and message in place of a reading (e.g. loading or an error)
+
+        The last reading's details are cleared so stale values aren't shown.
+        """
+        self._set_text("city", self._city_label, title)
+        self._set_text("temperature", self._temp_label, "--")
+        self._set_text("description", self._description_label, message)
+        for field, label in self._details.items():
+            self._set_text(field, label, "-")
+        self._set_text("updated", self._updated_label, "")
+        self._set_photo(None)
+
+    def _set_photo(self, photo: Optional["ImageTk.PhotoImage"]) -> None:
+        """Show an icon, or hide the icon label when photo is None"""
+        if photo is not self._photo:
+            self._photo = photo
+            if photo is None:
+                self._icon_label.grid_remove()
+            else:
+                self._icon_label.configure(image=photo)
+                self._icon_label.grid()
@@ -3,12 +3,19 @@ Weather Data Module
 This module contains the WeatherData class that structures and holds weather details.
 """
 
-from dataclasses import dataclass
+import datetime
+import json
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WeatherData:
     """Class to structure and hold weather details
-    
+
+    Instances are immutable and hashable, use __slots__ to keep per-instance
+    memory low, and memoize their JSON encoding so caches can emit it without
+    rebuilding a dict per request.
+
     Attributes:
         city: Name of the city
         country: Country code
@@ -20,6 +27,9 @@ class WeatherData:
         wind_speed: Wind speed in m/s
         icon: Weather icon code from OpenWeatherMap
         last_updated: Time when data was last updated
+        observed_at: Unix timestamp of the upstream observation
+        stale: True if this is the last known reading, served because
+            upstream could not be reached
     """
     city: str
     country: str
@@ -31,7 +41,74 @@ class WeatherData:
     wind_speed: float
     icon: str
     last_updated: str
-    
+    observed_at: int = 0
+    stale: bool = False
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False, hash=False)
+
+    @classmethod
+    def from_api_payload(cls, data: Dict[str, Any]) -> "WeatherData":
+        """Create a WeatherData object from an OpenWeatherMap /weather response
+
+        Args:
+            data: JSON data from API response
+
+        Returns:
+            WeatherData object containing weather information
+        """
+        # Extract needed data from response
+        main = data.get("main", {})
+        weather = (data.get("weather") or [{}])[0]
+
+        # Observation time reported by upstream (falls back to now)
+        observed_at = int(data.get("dt") or datetime.datetime.now().timestamp())
+
+        return cls(
+            city=data.get("name", "Unknown"),
+            country=data.get("sys", {}).get("country", "Unknown"),
+            temperature=round(main.get("temp", 0)),
+            feels_like=round(main.get("feels_like", 0)),
+            description=weather.get("description", "Unknown").capitalize(),
+            humidity=main.get("humidity", 0),
+            pressure=main.get("pressure", 0),
+            wind_speed=data.get("wind", {}).get("speed", 0),
+            icon=weather.get("icon", "01d"),
+            last_updated=datetime.datetime.fromtimestamp(observed_at).strftime("%H:%M:%S"),
+            observed_at=observed_at
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WeatherData":
+        """Create a WeatherData object from the output of to_dict()
+
+        Unknown keys are ignored so older or newer payloads still load.
+        """
+        return cls(**{name: data[name] for name in _FIELD_NAMES if name in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the weather details as a plain dict"""
+        return {
+            "city": self.city,
+            "country": self.country,
+            "temperature": self.temperature,
+            "feels_like": self.feels_like,
+            "description": self.description,
+            "humidity": self.humidity,
+            "pressure": self.pressure,
+            "wind_speed": self.wind_speed,
+            "icon": self.icon,
+            "last_updated": self.last_updated,
+            "observed_at": self.observed_at,
+            "stale": self.stale
+        }
+
+    def to_json_bytes(self) -> bytes:
+        """Return the weather details as compact UTF-8 JSON, encoded once per instance"""
+        encoded = self._json
+        if encoded is None:
+            encoded = json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            object.__setattr__(self, "_json", encoded)
+        return encoded
+
     def __str__(self) -> str:
         """Return string representation of weather data"""
         return (
@@ -43,3 +120,5 @@ class WeatherData:
             f"Pressure: {self.pressure} hPa\n"
             f"Last Updated: {self.last_updated}"
         )
+
+_FIELD_NAMES = tuple(f.name for f in fields(WeatherData) if f.init)
@@ -3,64 +3,716 @@ Weather Fetcher Module
 This module contains the WeatherFetcher class that handles API calls to fetch weather data.
 """
 
-import requests
-import datetime
-from typing import Dict, Any
+import dataclasses
+import math
+import threading
+import time
+from typing import Dict, Any, Mapping, Optional, Tuple, Type, TYPE_CHECKING
 
 from weather_data import WeatherData
+from weather_cache import WeatherCache, normalize_city
+from single_flight import SingleFlight
+from city_index import CityIndex
+
+if TYPE_CHECKING:
+    import requests
+    from persistent_cache import PersistentWeatherCache
+    from metrics import FetcherMetrics
+    from circuit_breaker import CircuitBreaker
+    from quota import QuotaGovernor
+    from weather_forecast import ForecastSeries
+    from observation_store import ObservationStore
+
+# Error categories that say upstream is unhealthy rather than that the lookup was bad;
+# they count against the circuit breaker and may be answered with stale data
+TRANSIENT_ERRORS = ("circuit_open", "quota_exhausted", "rate_limited", "server_error", "timeout", "network")
+
+# Upstream statuses worth retrying, and the longest a retry waits for one: a server
+# asking for more (Retry-After) is answered with the error instead of a stalled worker
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRY_DELAY = 2.0
+
+# How long an API key rests after a 429 that does not say (no usable Retry-After)
+DEFAULT_RETRY_AFTER = 60.0
+
+# Upstream endpoints; override them to point at a proxy or a local stub server
+DEFAULT_BASE_URL = "https://api.openweathermap.org/data/2.5"
+DEFAULT_ICON_URL = "https://openweathermap.org/img/wn/{icon}@2x.png"
+
+
+def _network_errors() -> Type[Exception]:
+    """Return the base class of errors raised by requests for network failures
+    
+    Only evaluated when an exception is being handled, by which time the
+    session (and so requests) has already been imported.
+    """
+    from requests.exceptions import RequestException
+    return RequestException
+
+
+def classify_error(error: Exception) -> str:
+    """Map an error raised by WeatherFetcher to a short category
+    
+    Args:
+        error: Exception raised by a fetcher lookup
+        
+    Returns:
+        One of "not_found", "circuit_open", "quota_exhausted", "rate_limited",
+        "server_error", "api_error", "timeout", "network", "config" or "other"
+    """
+    message = str(error)
+    if "Upstream unavailable:" in message:
+        return "circuit_open"
+    if "Upstream quota exhausted:" in message:
+        return "quota_exhausted"
+    if "not found" in message:
+        return "not_found"
+    if "API Error: 429" in message:
+        return "rate_limited"
+    if "API Error: 5" in message:
+        return "server_error"
+    if "API Error:" in message:
+        return "api_error"
+    if "Network error:" in message:
+        return "timeout" if "timed out" in message.lower() or "timeout" in message.lower() else "network"
+    if "API key is not set" in message:
+        return "config"
+    return "other"
+
+
+def retry_after(headers: Mapping[str, str], default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Read the Retry-After delay from upstream response headers
+    
+    Shared by the sync and async fetchers. Only the delay-seconds form is
+    understood; an absent, unparsable or non-finite value gives default.
+    
+    Args:
+        headers: Case-insensitive response headers (requests or httpx)
+        default: Seconds to return when the header gives no usable delay
+        
+    Returns:
+        Delay in seconds, never negative; "Retry-After: 0" gives 0.0
+    """
+    value = headers.get("Retry-After")
+    if value is None or not value.strip():
+        return default
+    try:
+        delay = float(value)
+    except ValueError:
+        return default
+    if not math.isfinite(delay):
+        return default
+    return max(delay, 0.0)
 
 class WeatherFetcher:
     """Class to handle API calls to fetch weather data"""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache_ttl: float = 600.0,
+        cache_max_entries: int = 1024,
+        cache_max_stale: float = 0.0,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        city_index: Optional[CityIndex] = None,
+        persistent_cache: Optional["PersistentWeatherCache"] = None,
+        forecast_ttl: float = 1800.0,
+        base_url: str = DEFAULT_BASE_URL,
+        icon_url: str = DEFAULT_ICON_URL,
+        metrics: Optional["FetcherMetrics"] = None,
+        not_found_ttl: float = 300.0,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        stale_if_error: float = 0.0,
+        quota: Optional["QuotaGovernor"] = None,
+        recorder: Optional["ObservationStore"] = None
+    ):
         """Initialize the WeatherFetcher
         
+        Args:
+            api_key: OpenWeatherMap API key
+            cache_ttl: Seconds a cached lookup stays fresh (0 disables caching)
+            cache_max_entries: Maximum number of cities kept in the cache
+            cache_max_stale: Seconds an expired entry may still be served while
+                a refresh for it is in flight
+            pool_size: Keep-alive connections kept per host; match this to the
+                number of worker threads sharing the fetcher
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send a response
+            max_retries: Retries on 429/5xx responses and connection errors
+                (0 disables retrying)
+            backoff_factor: Exponential backoff factor between retries; a
+                Retry-After header from the server takes precedence, and no
+                single wait exceeds MAX_RETRY_DELAY seconds
+            city_index: Optional local city index used to resolve names to
+                OpenWeatherMap city IDs
+            persistent_cache: Optional on-disk cache tier consulted on
+                in-memory misses and written on every upstream fetch
+            forecast_ttl: Seconds a cached forecast stays fresh (0 disables
+                forecast caching); upstream updates forecasts every 3 hours
+            base_url: Root of the OpenWeatherMap data API
+            icon_url: Icon URL template with an {icon} placeholder
+            metrics: Optional hooks recording upstream latency, parse time
+                and errors by category
+            not_found_ttl: Seconds a "city not found" answer is remembered,
+                so repeated bad names don't reach upstream (0 disables it)
+            circuit_breaker: Optional breaker that makes data lookups fail
+                fast while upstream keeps failing
+            stale_if_error: Seconds the last good reading of a location is
+                kept to answer lookups (marked stale) when upstream is
+                unreachable or the breaker is open (0 disables it)
+            quota: Optional governor metering data lookups per API key; when
+                given, each call uses the key it hands out instead of api_key
+            recorder: Optional observation store every reading fetched from
+                upstream is appended to
         """
         
         self._api_key = api_key
-        self._base_url = "https://api.openweathermap.org/data/2.5"
+        self._base_url = base_url.rstrip("/")
+        self._icon_url = icon_url
+        self._timeout = (connect_timeout, read_timeout)
+        # requests and urllib3 take a noticeable share of startup, so the
+        # session is only built on the first upstream call
+        self._session_options = (pool_size, max_retries, backoff_factor)
+        self._session: Optional["requests.Session"] = None
+        self._session_lock = threading.Lock()
+        self._cache = WeatherCache(ttl=cache_ttl, max_entries=cache_max_entries, max_stale=cache_max_stale)
+        self._single_flight = SingleFlight()
+        self._city_index = city_index
+        self._persistent_cache = persistent_cache
+        self._forecast_cache = WeatherCache(ttl=forecast_ttl, max_entries=cache_max_entries)
+        self._not_found = WeatherCache(ttl=not_found_ttl, max_entries=cache_max_entries)
+        self._last_good = WeatherCache(ttl=stale_if_error, max_entries=cache_max_entries)
+        self._metrics = metrics
+        self._circuit_breaker = circuit_breaker
+        self._quota = quota
+        self._recorder = recorder
+    
+    @staticmethod
+    def _create_session(
+        pool_size: int,
+        max_retries: int,
+        backoff_factor: float,
+        retry_statuses: Tuple[int, ...] = RETRY_STATUSES
+    ) -> "requests.Session":
+        """Create a pooled keep-alive session with retry on throttling and server errors
+        
+        Args:
+            pool_size: Connections kept per host
+            max_retries: Number of retries for idempotent requests
+            backoff_factor: Exponential backoff factor between retries
+            retry_statuses: Response statuses the session retries by itself
+                (connection errors are always retried)
+            
+        Returns:
+            Configured requests.Session
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        class CappedRetry(Retry):
+            """Retry that never sleeps longer than MAX_RETRY_DELAY, whatever Retry-After says"""
+            
+            def get_backoff_time(self):
+                return min(super().get_backoff_time(), MAX_RETRY_DELAY)
+            
+            def get_retry_after(self, response):
+                retry_after = super().get_retry_after(response)
+                return None if retry_after is None else min(retry_after, MAX_RETRY_DELAY)
+        
+        retry = CappedRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=retry_statuses,
+            allowed_methods=frozenset(["GET"]),
+            # Otherwise a 429 or 503 with Retry-After is retried even when
+            # its status isn't in retry_statuses
+            respect_retry_after_header=bool(retry_statuses),
+            # Hand the final response back so callers see the real status code
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    @property
+    def cache(self) -> WeatherCache:
+        """Response cache shared by all lookups on this fetcher"""
+        return self._cache
+    
+    @property
+    def forecast_cache(self) -> WeatherCache:
+        """Cache of forecast series, separate from current weather"""
+        return self._forecast_cache
+    
+    @property
+    def not_found_cache(self) -> WeatherCache:
+        """Cache of recent "city not found" errors by location key"""
+        return self._not_found
+    
+    @property
+    def last_good_cache(self) -> WeatherCache:
+        """Last good reading per location, kept for stale_if_error seconds"""
+        return self._last_good
+    
+    @property
+    def metrics(self) -> Optional["FetcherMetrics"]:
+        """Hooks recording upstream latency, parse time and errors, if configured"""
+        return self._metrics
+    
+    @property
+    def circuit_breaker(self) -> Optional["CircuitBreaker"]:
+        """Breaker guarding upstream data lookups, if configured"""
+        return self._circuit_breaker
+    
+    @property
+    def quota(self) -> Optional["QuotaGovernor"]:
+        """Governor metering upstream data lookups, if configured"""
+        return self._quota
+    
+    @property
+    def recorder(self) -> Optional["ObservationStore"]:
+        """Observation store readings fetched from upstream are appended to, if configured"""
+        return self._recorder
+    
+    @property
+    def single_flight(self) -> SingleFlight:
+        """Request coalescer shared by all upstream lookups"""
+        return self._single_flight
+    
+    @property
+    def city_index(self) -> Optional[CityIndex]:
+        """Local city index used to resolve names, if configured"""
+        return self._city_index
+    
+    @property
+    def session(self) -> "requests.Session":
+        """Pooled HTTP session used for all upstream calls, created on first use"""
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    # With a quota, _upstream_get retries responses itself so
+                    # every attempt is metered against its own token
+                    retry_statuses = () if self._quota is not None else RETRY_STATUSES
+                    self._session = self._create_session(*self._session_options, retry_statuses)
+                session = self._session
+        return session
+    
+    def get_icon(self, icon: str) -> bytes:
+        """Download a weather icon through the pooled session
+        
+        Args:
+            icon: Weather icon code from OpenWeatherMap (e.g. "10d")
+            
+        Returns:
+            PNG image bytes
+            
+        Raises:
+            Exception: If the icon could not be downloaded
+        """
+        try:
+            response = self._upstream_get("icon", self._icon_url.format(icon=icon))
+        except _network_errors() as e:
+            raise self._failed(f"Network error: {str(e)}")
+        
+        if response.status_code != 200:
+            raise self._failed(f"Icon Error: {response.status_code} - {response.reason}")
+        return response.content
+    
+    def close(self) -> None:
+        """Close pooled connections"""
+        if self._session is not None:
+            self._session.close()
     
     def get_current_weather(self, city: str) -> WeatherData:
         """Get current weather data for a city
         
+        If a city index is configured and knows the name, the lookup is made by
+        city ID, which gives a stable cache key and skips upstream name matching.
+        
         Args:
-            city: City name to search for
+            city: City name to search for, optionally as "City,CC"
             
         Returns:
             WeatherData object containing weather information
             
+        Raises:
+            Exception: If city not found or API error occurs
+        """
+        return self._get_weather(*self._locate(city))
+    
+    def cache_key(self, city: str) -> str:
+        """Return the cache key a city name is stored under
+        
+        Args:
+            city: City name, optionally as "City,CC"
+            
+        Returns:
+            Cache key ("id:<n>" for indexed cities, else the normalized name)
+        """
+        return self._locate(city)[0]
+    
+    def expires_in(self, city: str) -> Optional[float]:
+        """Return seconds until the cached entry for a city expires
+        
+        Args:
+            city: City name, optionally as "City,CC"
+            
+        Returns:
+            Seconds until expiry (negative once stale), or None if not cached
+        """
+        return self._cache.expires_in(self.cache_key(city))
+    
+    def refresh(self, city: str) -> WeatherData:
+        """Fetch a city from upstream and replace its cache entry
+        
+        Callers arriving while the refresh is in flight are served the stale
+        entry, if the cache still holds one.
+        
+        Args:
+            city: City name, optionally as "City,CC"
+            
+        Returns:
+            Freshly fetched WeatherData
+            
         Raises:
             Exception: If city not found or API error occurs
         """
         if not self._api_key:
             raise Exception("API key is not set. Please set the OPENWEATHERMAP_API_KEY environment variable.")
         
+        cache_key, query, label = self._locate(city)
+        return self._single_flight.do(cache_key, lambda: self._fetch_and_store(cache_key, query, label))
+    
+    def _locate(self, city: str) -> Tuple[str, Dict[str, Any], str]:
+        """Map a city name to its cache key, upstream query and error label"""
+        city_id = self._city_index.resolve(city) if self._city_index is not None else None
+        if city_id is not None:
+            return f"id:{city_id}", {"id": city_id}, city
+        return normalize_city(city), {"q": city}, city
+    
+    def get_weather_by_id(self, city_id: int) -> WeatherData:
+        """Get current weather data for an OpenWeatherMap city ID
+        
+        Args:
+            city_id: OpenWeatherMap city ID
+            
+        Returns:
+            WeatherData object containing weather information
+            
+        Raises:
+            Exception: If city not found or API error occurs
+        """
+        return self._get_weather(f"id:{city_id}", {"id": city_id}, str(city_id))
+    
+    def get_weather_by_coordinates(self, lat: float, lon: float) -> WeatherData:
+        """Get current weather data for a geographic location
+        
+        Coordinates are rounded to two decimals (about 1 km), so nearby
+        lookups share a cache entry.
+        
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            
+        Returns:
+            WeatherData object containing weather information
+            
+        Raises:
+            Exception: If the coordinates are invalid or an API error occurs
+        """
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise Exception(f"Invalid coordinates: {lat}, {lon}")
+        
+        lat, lon = round(lat, 2), round(lon, 2)
+        return self._get_weather(f"coord:{lat:.2f},{lon:.2f}", {"lat": lat, "lon": lon}, f"{lat}, {lon}")
+    
+    def get_forecast(self, city: str) -> "ForecastSeries":
+        """Get the 5 day / 3 hour forecast for a city as a columnar series
+        
+        The response is parsed straight into NumPy arrays, one per field,
+        rather than into an object per time step.
+        
+        Args:
+            city: City name to search for, optionally as "City,CC"
+            
+        Returns:
+            ForecastSeries with one row per 3 hour step
+            
+        Raises:
+            Exception: If city not found or API error occurs
+        """
+        if not self._api_key:
+            raise Exception("API key is not set. Please set the OPENWEATHERMAP_API_KEY environment variable.")
+        
+        cache_key, query, label = self._locate(city)
+        cached = self._forecast_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        def fetch() -> "ForecastSeries":
+            series = self._fetch_forecast(query, label)
+            self._forecast_cache.set(cache_key, series)
+            return series
+        
+        return self._single_flight.do(f"forecast:{cache_key}", fetch)
+    
+    def _get_weather(self, cache_key: str, query: Dict[str, Any], label: str) -> WeatherData:
+        """Serve a lookup from the cache, or fetch it once for all concurrent callers
+        
+        Args:
+            cache_key: Key identifying the location in the cache
+            query: Location query parameters (q, id or lat/lon)
+            label: Human readable location used in error messages
+            
+        Returns:
+            WeatherData object containing weather information
+        """
+        if not self._api_key:
+            raise Exception("API key is not set. Please set the OPENWEATHERMAP_API_KEY environment variable.")
+        
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Stale-while-revalidate: don't wait on a refresh that is already running
+        if self._single_flight.in_flight(cache_key):
+            stale = self._cache.get_stale(cache_key)
+            if stale is not None:
+                return stale
+        
+        # Names upstream just said don't exist are answered locally
+        not_found = self._not_found.get(cache_key)
+        if not_found is not None:
+            raise Exception(not_found)
+        
+        # Concurrent lookups of the same location share one upstream request
+        try:
+            return self._single_flight.do(cache_key, lambda: self._load_or_fetch(cache_key, query, label))
+        except Exception as e:
+            stale = self._last_good_for(cache_key, e)
+            if stale is None:
+                raise
+            return stale
+    
+    def _last_good_for(self, cache_key: str, error: Exception) -> Optional[WeatherData]:
+        """Return the last good reading, marked stale, if error means upstream is down"""
+        if classify_error(error) not in TRANSIENT_ERRORS:
+            return None
+        last_good = self._last_good.get(cache_key)
+        if last_good is None:
+            return None
+        if self._metrics is not None:
+            self._metrics.stale_served.inc()
+        return dataclasses.replace(last_good, stale=True)
+    
+    def _load_or_fetch(self, cache_key: str, query: Dict[str, Any], label: str) -> WeatherData:
+        """Serve an in-memory miss from the persistent tier, else fetch upstream"""
+        if self._persistent_cache is not None:
+            stored = self._persistent_cache.get(cache_key)
+            if stored is not None:
+                weather_data, remaining_ttl = stored
+                self._cache.set(cache_key, weather_data, ttl=remaining_ttl)
+                return weather_data
+        
+        return self._fetch_and_store(cache_key, query, label)
+    
+    def _fetch_and_store(self, cache_key: str, query: Dict[str, Any], label: str) -> WeatherData:
+        """Fetch current weather and store it in every cache tier under cache_key"""
+        try:
+            weather_data = self._fetch_current_weather(query, label)
+        except Exception as e:
+            if classify_error(e) == "not_found":
+                self._not_found.set(cache_key, str(e))
+            raise
+        
+        self._cache.set(cache_key, weather_data)
+        self._last_good.set(cache_key, weather_data)
+        if self._persistent_cache is not None:
+            self._persistent_cache.set(cache_key, weather_data)
+        if self._recorder is not None:
+            self._recorder.record(weather_data)
+        return weather_data
+    
+    def _fetch_current_weather(self, query: Dict[str, Any], label: str) -> WeatherData:
+        """Fetch and parse current weather for a location, bypassing the cache
+        
+        Args:
+            query: Location query parameters (q, id or lat/lon)
+            label: Human readable location used in error messages
+            
+        Returns:
+            WeatherData object containing weather information
+        """
         try:
             # Make API request
             url = f"{self._base_url}/weather"
-            params = {
-                "q": city,
-                "appid": self._api_key,
-                "units": "metric"  # Use metric units (Celsius)
-            }
-            
-            response = requests.get(url, params=params)
+            response = self._upstream_get("weather", url, self._weather_params(query))
             
             # Check if request was successful
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_weather_data(data)
-            elif response.status_code == 404:
-                raise Exception(f"City '{city}' not found. Please check the spelling and try again.")
-            else:
-                raise Exception(f"API Error: {response.status_code} - {response.reason}")
+            self._check_status(response.status_code, response.reason, label)
+            
+            started = time.perf_counter()
+            weather_data = self._parse_weather_data(response.json())
+            if self._metrics is not None:
+                self._metrics.parse_seconds.observe(time.perf_counter() - started, "weather")
+            return weather_data
+                
+        except _network_errors() as e:
+            raise self._failed(f"Network error: {str(e)}")
+        except Exception as e:
+            raise self._failed(f"Error fetching weather data: {str(e)}")
+    
+    def _fetch_forecast(self, query: Dict[str, Any], label: str) -> "ForecastSeries":
+        """Fetch and parse the forecast for a location, bypassing the cache
+        
+        Args:
+            query: Location query parameters (q, id or lat/lon)
+            label: Human readable location used in error messages
+            
+        Returns:
+            ForecastSeries with one row per forecast step
+        """
+        # NumPy is only needed by forecast lookups, so import it on first use
+        from weather_forecast import ForecastSeries
+        
+        try:
+            url = f"{self._base_url}/forecast"
+            response = self._upstream_get("forecast", url, self._weather_params(query))
+            
+            self._check_status(response.status_code, response.reason, label)
+            
+            started = time.perf_counter()
+            series = ForecastSeries.from_api_payload(response.json())
+            if self._metrics is not None:
+                self._metrics.parse_seconds.observe(time.perf_counter() - started, "forecast")
+            return series
                 
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error: {str(e)}")
+        except _network_errors() as e:
+            raise self._failed(f"Network error: {str(e)}")
         except Exception as e:
-            raise Exception(f"Error fetching weather data: {str(e)}")
+            raise self._failed(f"Error fetching forecast data: {str(e)}")
     
-    def _parse_weather_data(self, data: Dict[str, Any]) -> WeatherData:
+    def _upstream_get(self, endpoint: str, url: str, params: Optional[Dict[str, Any]] = None) -> "requests.Response":
+        """GET an upstream URL through the pooled session, recording metrics if enabled
+        
+        With a quota, throttled and failed responses are retried here rather
+        than by the session: each attempt takes its own token, and after a
+        429 the next attempt goes out on another key if one has budget.
+        
+        Args:
+            endpoint: Short endpoint name used as the metrics label
+            url: URL to request
+            params: Query parameters
+            
+        Returns:
+            The upstream response
+        """
+        # Icons come from a different host, need no API key and don't trip the breaker
+        data_call = endpoint != "icon"
+        breaker = self._circuit_breaker if data_call else None
+        quota = self._quota if data_call else None
+        attempts = self._session_options[1] + 1 if self._quota is not None else 1
+        
+        response = None
+        for attempt in range(attempts):
+            # Check the breaker first, so an open one fails fast instead of
+            # waiting for a token it would hand back
+            if breaker is not None and not breaker.allow():
+                if response is not None:
+                    return response
+                raise Exception(f"Upstream unavailable: circuit open, retrying in {breaker.retry_in():.1f}s")
+            
+            api_key = None
+            if quota is not None:
+                try:
+                    api_key = quota.acquire()
+                except Exception:
+                    if breaker is not None:
+                        breaker.cancel()
+                    if response is not None:
+                        return response
+                    raise
+                params = {**(params or {}), "appid": api_key}
+            
+            response = self._send(endpoint, url, params, breaker)
+            if api_key is not None and response.status_code == 429:
+                quota.throttled(api_key, retry_after(response.headers))
+            if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                return response
+            if response.status_code != 429 or quota is None:
+                time.sleep(self._retry_delay(response, attempt))
+        return response
+    
+    def _send(self, endpoint: str, url: str, params: Optional[Dict[str, Any]], breaker: Optional["CircuitBreaker"]) -> "requests.Response":
+        """Make one upstream request, recording its outcome in the metrics and the breaker"""
+        metrics = self._metrics
+        started = metrics.upstream_started() if metrics is not None else 0.0
+        status = None
+        try:
+            response = self.session.get(url, params=params, timeout=self._timeout)
+            status = response.status_code
+            return response
+        finally:
+            if metrics is not None:
+                metrics.upstream_finished(endpoint, started, status)
+            if breaker is not None:
+                # Network errors, throttling and 5xx mean upstream is unhealthy;
+                # any other answer (including 404) means it is up
+                if status is None or status == 429 or status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+    
+    def _retry_delay(self, response: "requests.Response", attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After or exponential backoff, capped"""
+        _, _, backoff_factor = self._session_options
+        return min(retry_after(response.headers, backoff_factor * (2 ** attempt)), MAX_RETRY_DELAY)
+    
+    def _failed(self, message: str) -> Exception:
+        """Build the exception for a failed lookup, counting it by category"""
+        error = Exception(message)
+        if self._metrics is not None:
+            self._metrics.error(classify_error(error))
+        return error
+    
+    def _weather_params(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Build query parameters for a current weather or forecast lookup"""
+        return {
+            **query,
+            "appid": self._api_key,
+            "units": "metric"  # Use metric units (Celsius)
+        }
+    
+    @staticmethod
+    def _check_status(status_code: int, reason: str, city: str) -> None:
+        """Raise the error matching a non-200 upstream status
+        
+        Args:
+            status_code: HTTP status code from the API
+            reason: HTTP reason phrase from the API
+            city: City name that was searched for
+            
+        Raises:
+            Exception: If the status is not 200
+        """
+        if status_code == 200:
+            return
+        elif status_code == 404:
+            raise Exception(f"City '{city}' not found. Please check the spelling and try again.")
+        else:
+            raise Exception(f"API Error: {status_code} - {reason}")
+    
+    @staticmethod
+    def _parse_weather_data(data: Dict[str, Any]) -> WeatherData:
         """Parse API response and create a WeatherData object
         
         Args:
@@ -69,35 +721,4 @@ class WeatherFetcher:
         Returns:
             WeatherData object containing weather information
         """
-        # Extract needed data from response
-        city = data.get("name", "Unknown")
-        country = data.get("sys", {}).get("country", "Unknown")
-        temperature = round(data.get("main", {}).get("temp", 0))
-        feels_like = round(data.get("main", {}).get("feels_like", 0))
-        humidity = data.get("main", {}).get("humidity", 0)
-        pressure = data.get("main", {}).get("pressure", 0)
-        
-        # Weather description and icon
-        weather = data.get("weather", [{}])[0]
-        description = weather.get("description", "Unknown")
-        icon = weather.get("icon", "01d")
-        
-        # Wind speed
-        wind_speed = data.get("wind", {}).get("speed", 0)
-        
-        # Get current time
-        current_time = datetime.datetime.now().strftime("%H:%M:%S")
-        
-        # Create and return WeatherData object
-        return WeatherData(
-            city=city,
-            country=country,
-            temperature=temperature,
-            feels_like=feels_like,
-            description=description,
-            humidity=humidity,
-            pressure=pressure,
-            wind_speed=wind_speed,
-            icon=icon,
-            last_updated=current_time
-        )
+        return WeatherData.from_api_payload(data)
@@ -0,0 +1,220 @@
+"""
+Weather Forecast Module
+This module contains the ForecastSeries class that holds a forecast as columnar NumPy
+arrays indexed by timestamp, with vectorized daily aggregation and resampling.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+# Numeric columns every series carries, in addition to the timestamps
+FORECAST_FIELDS = ("temperature", "feels_like", "humidity", "pressure", "wind_speed")
+
+
+class DailyStats(NamedTuple):
+    """Per-day aggregates of one forecast column
+
+    Attributes:
+        days: Calendar days (numpy datetime64[D]) in the city's local time
+        min: Daily minimum
+        max: Daily maximum
+        mean: Daily mean
+    """
+    days: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    mean: np.ndarray
+
+
+class ForecastSeries:
+    """Class to hold a weather forecast as columnar arrays
+
+    Attributes:
+        city: Name of the city
+        country: Country code
+        timezone_offset: Seconds the city's local time is ahead of UTC
+        timestamps: Unix timestamps (int64, ascending)
+        temperature: Temperature in Celsius (float32)
+        feels_like: How temperature feels like in Celsius (float32)
+        humidity: Humidity percentage (float32)
+        pressure: Atmospheric pressure in hPa (float32)
+        wind_speed: Wind speed in m/s (float32)
+    """
+
+    def __init__(
+        self,
+        city: str,
+        country: str,
+        timestamps: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        timezone_offset: int = 0
+    ):
+        """Initialize the ForecastSeries
+
+        Args:
+            city: Name of the city
+            country: Country code
+            timestamps: Unix timestamps, one per row
+            columns: Array per name in FORECAST_FIELDS, each as long as timestamps
+            timezone_offset: Seconds the city's local time is ahead of UTC
+        """
+        self.city = city
+        self.country = country
+        self.timezone_offset = timezone_offset
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        for name in FORECAST_FIELDS:
+            column = np.asarray(columns[name], dtype=np.float32)
+            if column.shape != self.timestamps.shape:
+                raise ValueError(f"Column '{name}' has {column.size} rows, expected {self.timestamps.size}")
+            setattr(self, name, column)
+
+    @classmethod
+    def from_api_payload(cls, data: Dict[str, Any]) -> "ForecastSeries":
+        """Create a ForecastSeries from an OpenWeatherMap /forecast response
+
+        Each column is filled in a single pass straight into a preallocated
+        array, without building an intermediate object per time step.
+
+        Args:
+            data: JSON data from API response
+
+        Returns:
+            ForecastSeries with one row per forecast step
+        """
+        steps = data.get("list") or []
+        count = len(steps)
+
+        timestamps = np.fromiter((step.get("dt", 0) for step in steps), dtype=np.int64, count=count)
+        columns = {
+            "temperature": np.fromiter((step.get("main", {}).get("temp", np.nan) for step in steps), dtype=np.float32, count=count),
+            "feels_like": np.fromiter((step.get("main", {}).get("feels_like", np.nan) for step in steps), dtype=np.float32, count=count),
+            "humidity": np.fromiter((step.get("main", {}).get("humidity", np.nan) for step in steps), dtype=np.float32, count=count),
+            "pressure": np.fromiter((step.get("main", {}).get("pressure", np.nan) for step in steps), dtype=np.float32, count=count),
+            "wind_speed": np.fromiter((step.get("wind", {}).get("speed", np.nan) for step in steps), dtype=np.float32, count=count),
+        }
+
+        # Upstream returns steps in time order, but don't rely on it
+        if count > 1 and np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+            columns = {name: column[order] for name, column in columns.items()}
+
+        city = data.get("city", {})
+        return cls(
+            city=city.get("name", "Unknown"),
+            country=city.get("country", "Unknown"),
+            timestamps=timestamps,
+            columns=columns,
+            timezone_offset=int(city.get("timezone", 0))
+        )
+
+    def __len__(self) -> int:
+        return int(self.timestamps.size)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the array for one of FORECAST_FIELDS"""
+        if name not in FORECAST_FIELDS:
+            raise ValueError(f"Unknown forecast field '{name}'")
+        return getattr(self, name)
+
+    def times(self) -> np.ndarray:
+        """Return the timestamps as numpy datetime64[s] in UTC"""
+        return self.timestamps.astype("datetime64[s]")
+
+    def daily(self, name: str = "temperature") -> DailyStats:
+        """Aggregate a column per local calendar day
+
+        Args:
+            name: One of FORECAST_FIELDS
+
+        Returns:
+            DailyStats with min, max and mean per day (NaNs ignored)
+        """
+        values = self.column(name)
+        if values.size == 0:
+            empty = np.empty(0, dtype=np.float32)
+            return DailyStats(np.empty(0, dtype="datetime64[D]"), empty, empty, empty)
+
+        day_index = (self.timestamps + self.timezone_offset) // 86400
+        days, starts, counts = np.unique(day_index, return_index=True, return_counts=True)
+
+        valid = ~np.isnan(values)
+        filled_low = np.where(valid, values, np.inf)
+        filled_high = np.where(valid, values, -np.inf)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        valid_counts = np.add.reduceat(valid.astype(np.int64), starts)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (sums / valid_counts).astype(np.float32)
+        low = np.minimum.reduceat(filled_low, starts)
+        high = np.maximum.reduceat(filled_high, starts)
+        low[valid_counts == 0] = np.nan
+        high[valid_counts == 0] = np.nan
+
+        return DailyStats(days.astype("datetime64[D]"), low, high, mean)
+
+    def resample(self, step: int) -> "ForecastSeries":
+        """Resample every column onto a regular grid of step seconds
+
+        Steps coarser than the source spacing average the rows falling into
+        each bin; finer steps interpolate linearly between source rows.
+
+        Args:
+            step: Grid spacing in seconds
+
+        Returns:
+            New ForecastSeries on the resampled grid
+        """
+        if step <= 0:
+            raise ValueError("Resample step must be a positive number of seconds")
+        if self.timestamps.size == 0:
+            return self._with(self.timestamps, {name: self.column(name) for name in FORECAST_FIELDS})
+
+        source_step = int(np.min(np.diff(self.timestamps))) if self.timestamps.size > 1 else step
+        start = self.timestamps[0] - self.timestamps[0] % step
+
+        if step >= source_step:
+            bins = (self.timestamps - start) // step
+            unique_bins, starts = np.unique(bins, return_index=True)
+            timestamps = start + unique_bins * step
+            columns = {}
+            for name in FORECAST_FIELDS:
+                values = self.column(name)
+                valid = ~np.isnan(values)
+                sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+                counts = np.add.reduceat(valid.astype(np.int64), starts)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    columns[name] = sums / counts
+        else:
+            timestamps = np.arange(start, self.timestamps[-1] + 1, step, dtype=np.int64)
+            timestamps = timestamps[timestamps >= self.timestamps[0]]
+            columns = {
+                name: np.interp(timestamps, self.timestamps, self.column(name))
+                for name in FORECAST_FIELDS
+            }
+
+        return self._with(timestamps, columns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the series as plain lists, suitable for JSON"""
+        result: Dict[str, Any] = {
+            "city": self.city,
+            "country": self.country,
+            "timezone_offset": self.timezone_offset,
+            "timestamps": self.timestamps.tolist(),
+        }
+        for name in FORECAST_FIELDS:
+            result[name] = [None if np.isnan(v) else round(float(v), 2) for v in self.column(name)]
+        return result
+
+    def _with(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> "ForecastSeries":
+        """Return a new series for the same city with different rows"""
+        return ForecastSeries(self.city, self.country, timestamps, columns, self.timezone_offset)
+
+    def __repr__(self) -> str:
+        span: Optional[str] = None
+        if self.timestamps.size:
+            times = self.times()
+            span = f"{times[0]} to {times[-1]}"
+        return f"ForecastSeries({self.city}, {self.country}, {len(self)} rows, {span})"
@@ -0,0 +1,171 @@
+"""
+Weather Stream Module
+This module contains the WeatherBroadcaster class that fans weather updates out to
+live subscribers (e.g. Server-Sent Events clients).
+"""
+
+import json
+import logging
+import queue
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from weather_fetcher import WeatherFetcher
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A subscriber's queue of pending updates
+
+    Each update is a (city, payload) tuple where city is the name as the
+    subscriber asked for it and payload is a JSON object encoded as bytes.
+    """
+
+    def __init__(self, cities: Dict[str, str], max_pending: int):
+        """Initialize the Subscription
+
+        Args:
+            cities: Mapping of cache key to the city name the subscriber used
+            max_pending: Maximum queued updates before new ones are dropped
+        """
+        self.cities = cities
+        self.updates: "queue.Queue[Tuple[str, bytes]]" = queue.Queue(maxsize=max_pending)
+
+    def push(self, key: str, payload: bytes) -> None:
+        """Queue an update, dropping it if the subscriber has fallen behind"""
+        try:
+            self.updates.put_nowait((self.cities[key], payload))
+        except queue.Full:
+            pass
+
+    def get(self, timeout: float) -> Optional[Tuple[str, bytes]]:
+        """Wait up to timeout seconds for the next update"""
+        try:
+            return self.updates.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class WeatherBroadcaster:
+    """Class to poll subscribed cities once and push changes to every subscriber
+
+    However many clients watch a city, it is polled once per interval through
+    the fetcher (and so through its cache), and an update is sent only when
+    the encoded weather data actually changes.
+    """
+
+    def __init__(self, weather_fetcher: WeatherFetcher, poll_interval: float = 30.0, max_pending: int = 100):
+        """Initialize the WeatherBroadcaster
+
+        Args:
+            weather_fetcher: Fetcher used to look up subscribed cities
+            poll_interval: Seconds between polls of each subscribed city
+            max_pending: Maximum queued updates per subscriber
+        """
+        self._fetcher = weather_fetcher
+        self._poll_interval = poll_interval
+        self._max_pending = max_pending
+
+        # cache key -> subscribers, and the latest payload sent for it
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._latest: Dict[str, bytes] = {}
+        self._queries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, cities: Iterable[str]) -> Subscription:
+        """Subscribe to updates for cities
+
+        The latest known data for each city is queued straight away.
+
+        Args:
+            cities: City names to watch
+
+        Returns:
+            Subscription to read updates from; pass it to unsubscribe() when done
+        """
+        keys = {self._fetcher.cache_key(city): city for city in cities}
+        subscription = Subscription(keys, self._max_pending)
+
+        new_city = False
+        with self._lock:
+            for key, city in keys.items():
+                if key not in self._subscribers:
+                    self._subscribers[key] = set()
+                    self._queries[key] = city
+                    new_city = True
+                self._subscribers[key].add(subscription)
+                if key in self._latest:
+                    subscription.push(key, self._latest[key])
+            self._ensure_running()
+
+        if new_city:
+            self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering updates to a subscription"""
+        with self._lock:
+            for key in subscription.cities:
+                subscribers = self._subscribers.get(key)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[key]
+                    self._latest.pop(key, None)
+                    self._queries.pop(key, None)
+
+    def subscriber_count(self) -> int:
+        """Return the number of distinct subscriptions"""
+        with self._lock:
+            return len({sub for subs in self._subscribers.values() for sub in subs})
+
+    def _ensure_running(self) -> None:
+        """Start the polling thread if needed (caller holds the lock)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="weather-stream", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Background loop: poll every watched city, then sleep until the next round"""
+        while True:
+            self._wake.clear()
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Weather stream poll failed: {str(e)}")
+            self._wake.wait(self._poll_interval)
+
+    def poll_once(self) -> int:
+        """Poll every watched city once and push changed data
+
+        Returns:
+            Number of cities whose data changed
+        """
+        with self._lock:
+            watched: List[Tuple[str, str]] = list(self._queries.items())
+
+        changed = 0
+        for key, city in watched:
+            try:
+                payload = b'{"success":true,' + self._fetcher.get_current_weather(city).to_json_bytes()[1:]
+            except Exception as e:
+                payload = json.dumps({
+                    'success': False,
+                    'error': f"Could not retrieve weather data: {str(e)}"
+                }).encode("utf-8")
+
+            with self._lock:
+                if key not in self._subscribers or self._latest.get(key) == payload:
+                    continue
+                self._latest[key] = payload
+                subscribers = list(self._subscribers[key])
+
+            changed += 1
+            for subscription in subscribers:
+                subscription.push(key, payload)
+        return changed